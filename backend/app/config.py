@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Tuple
 from pydantic import field_validator
 import json
 
@@ -8,6 +8,30 @@ class Settings(BaseSettings):
     # MongoDB
     MONGODB_URI: str = "mongodb://localhost:27017"
     DATABASE_NAME: str = "unipulse"
+    ENSURE_INDEXES_ON_STARTUP: bool = True  # Otherwise run create_indexes.py
+    # Connection pool of each worker process (total = workers x this)
+    MONGO_MAX_POOL_SIZE: int = 50
+    MONGO_MIN_POOL_SIZE: int = 0
+    
+    # Multi-process serving (gunicorn.conf.py); 0 workers = one per available CPU
+    WEB_WORKERS: int = 0
+    STARTUP_LOCK_FILE: str = ".startup.lock"  # Serializes one-time startup work across workers
+    
+    # Mongo command monitoring (per-route DB time, slow-query log)
+    DB_MONITORING_ENABLED: bool = False
+    SLOW_QUERY_MS: float = 100
+    
+    # Prometheus /metrics (request latency, Mongo pool, event-loop lag)
+    METRICS_ENABLED: bool = True
+    READINESS_TIMEOUT_SECONDS: float = 2.0
+    
+    # Sampling profiler (admin X-Profile: 1 header, or 1-in-N background sampling)
+    PROFILING_ENABLED: bool = False
+    PROFILE_DIR: str = "profiles"
+    PROFILE_KEEP: int = 50  # Newest profiles kept on disk
+    PROFILE_INTERVAL_MS: float = 2
+    PROFILE_SAMPLE_EVERY_N: int = 0  # 0 disables background sampling
+    PROFILE_MIN_INTERVAL_SECONDS: float = 60
     
     # JWT
     JWT_SECRET: str = "your-secret-key-change-in-production"
@@ -23,6 +47,57 @@ class Settings(BaseSettings):
     # File Upload
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
     UPLOAD_DIR: str = "uploads"
+    BULK_IMPORT_WORKERS: int = 8  # Concurrent file uploads during bulk PYQ import
+    DELETE_BATCH_WINDOW_SECONDS: float = 0.5  # How long deletes are collected into one batch
+    DELETE_MAX_RETRIES: int = 5
+    ORPHAN_GRACE_SECONDS: int = 3600  # Unreferenced files younger than this are kept
+    
+    # PYQ search
+    TEXT_EXTRACTION_WORKERS: int = 2  # Processes extracting text from uploaded papers
+    MAX_INDEXED_TEXT_CHARS: int = 100_000
+    
+    # Results - (min_marks, grade, grade_points), used when publishing from marks sheets
+    GRADE_SCALE: List[Tuple[float, str, float]] = [
+        (90, "O", 10), (80, "A+", 9), (70, "A", 8), (60, "B+", 7),
+        (50, "B", 6), (45, "C", 5), (40, "P", 4), (0, "F", 0)
+    ]
+    
+    # Pre-rendered per-student result/CGPA payloads for publish-day reads
+    SNAPSHOT_DIR: str = "snapshots"
+    
+    # Conditional GETs: how often each worker picks up version bumps made by the others
+    VERSION_SYNC_SECONDS: float = 2.0
+    
+    # Admission control: per-user token bucket (from the JWT subject; 0 disables it)
+    RATE_LIMIT_PER_SECOND: float = 5.0
+    RATE_LIMIT_BURST: int = 20
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per worker) or "mongo" (shared by all workers)
+    # Requests running at once per worker, by route class; extra requests queue until the timeout
+    MAX_CONCURRENT_READS: int = 64
+    MAX_CONCURRENT_WRITES: int = 16
+    MAX_CONCURRENT_UPLOADS: int = 4
+    ADMISSION_MAX_QUEUE: int = 256  # Waiting requests per class before shedding immediately
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    ADMISSION_RETRY_AFTER_SECONDS: float = 1.0
+    
+    # Server-sent events (/api/events/stream)
+    EVENTS_CHANGE_STREAMS: bool = True  # Tail a Mongo change stream when connected to a replica set
+    EVENTS_FEED: bool = True  # Otherwise share events between workers through a capped collection
+    EVENTS_FEED_SIZE_BYTES: int = 4 * 1024 * 1024
+    EVENTS_MAX_CONNECTIONS: int = 5000  # Open streams per worker
+    EVENTS_MAX_CONNECTIONS_PER_USER: int = 5  # Open streams of one user per worker
+    EVENTS_TICKET_TTL_SECONDS: int = 30  # Stream tickets must be redeemed within this
+    EVENTS_HEARTBEAT_SECONDS: float = 25
+    EVENTS_RETRY_MS: int = 5000  # Client reconnect delay
+    
+    # Write-behind buffer for single attendance inserts: bursts are written as one
+    # unordered insert_many per batch (duplicates are caught by the unique index)
+    ATTENDANCE_WRITE_BEHIND: bool = False
+    ATTENDANCE_BATCH_SIZE: int = 500
+    ATTENDANCE_BATCH_WINDOW_MS: float = 5
+    
+    # /api/dashboard: a section slower than this is returned as an error
+    DASHBOARD_SECTION_TIMEOUT_SECONDS: float = 5.0
     
     # CORS - can be JSON string or comma-separated string or list
     CORS_ORIGINS: Union[str, List[str]] = "*"  # Default to "*"
@@ -1,5 +1,7 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.config import settings
+from app.utils.db_monitor import command_monitor
+from app.utils.metrics import pool_metrics
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,7 +15,17 @@ db = Database()
 async def connect_to_mongo():
     """Create database connection"""
     try:
-        db.client = AsyncIOMotorClient(settings.MONGODB_URI)
+        event_listeners = []
+        if settings.DB_MONITORING_ENABLED:
+            event_listeners.append(command_monitor)
+        if settings.METRICS_ENABLED:
+            event_listeners.append(pool_metrics)
+        db.client = AsyncIOMotorClient(
+            settings.MONGODB_URI,
+            maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+            event_listeners=event_listeners
+        )
         await db.client.admin.command('ping')
         logger.info("Connected to MongoDB")
     except Exception as e:
@@ -0,0 +1,105 @@
+# Index registry: every query shape the routes issue, declared per collection.
+# Unique indexes mirror the uniqueness the code already assumes (the find_one
+# existence checks before inserts).
+import logging
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+INDEXES = {
+    "users": [
+        # Login, registration check and every authenticated request
+        IndexModel([("student_id", ASCENDING)], unique=True),
+    ],
+    "attendance": [
+        # Existence checks before insert; also serves student/subject filters
+        IndexModel([("student_id", ASCENDING), ("subject", ASCENDING), ("date", ASCENDING)], unique=True),
+        # Student listings sorted by newest date
+        IndexModel([("student_id", ASCENDING), ("date", DESCENDING)]),
+    ],
+    "results": [
+        # create_result upsert lookups and per-student listings
+        IndexModel([("student_id", ASCENDING), ("semester", ASCENDING), ("academic_year", ASCENDING)], unique=True),
+        # Semester analytics
+        IndexModel([("semester", ASCENDING), ("academic_year", ASCENDING)]),
+    ],
+    "timetable": [
+        # One timetable per (student or common, day); serves the student_id $or branches
+        IndexModel([("student_id", ASCENDING), ("day", ASCENDING)], unique=True),
+    ],
+    "pyq": [
+        IndexModel(
+            [("subject", TEXT), ("file_name", TEXT), ("exam_type", TEXT), ("content_text", TEXT)],
+            weights={"subject": 10, "file_name": 5, "exam_type": 2, "content_text": 1},
+            name="pyq_text_search"
+        ),
+        # Filtered listings sorted by year/semester
+        IndexModel([("subject", ASCENDING), ("year", ASCENDING), ("semester", ASCENDING)]),
+        # Unfiltered listings sorted by year/semester
+        IndexModel([("year", DESCENDING), ("semester", DESCENDING)]),
+    ],
+    "academic_summaries": [
+        IndexModel([("student_id", ASCENDING)], unique=True),
+    ],
+    "collection_versions": [
+        # Incremental version sync in every worker
+        IndexModel([("updated_at", ASCENDING)]),
+    ],
+    "event_tickets": [
+        # Unredeemed event stream tickets expire on their own
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "rate_limits": [
+        # Shared rate limit windows (RATE_LIMIT_BACKEND=mongo) expire on their own
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+}
+
+
+def registry_fingerprint() -> str:
+    """Stable digest of the registry, so startup re-runs index creation when it changes"""
+    return repr(sorted((name, [index.document for index in indexes]) for name, indexes in INDEXES.items()))
+
+
+async def ensure_indexes(db) -> dict:
+    """
+    Create every registered index (idempotent).
+
+    A collection whose indexes cannot be built (e.g. existing duplicates break a
+    unique index) is logged and reported without stopping the others.
+    """
+    report = {}
+    for collection, indexes in INDEXES.items():
+        try:
+            names = await db[collection].create_indexes(indexes)
+            report[collection] = {"status": "ok", "indexes": names}
+        except OperationFailure as e:
+            logger.error(f"Error creating indexes on {collection}: {e}")
+            report[collection] = {"status": "error", "detail": str(e)}
+    return report
+
+
+async def index_usage(db) -> dict:
+    """Report $indexStats usage per collection and registered indexes that are missing"""
+    usage = {}
+    for collection, indexes in INDEXES.items():
+        stats = await db[collection].aggregate([{"$indexStats": {}}]).to_list(length=None)
+        existing = {s["name"] for s in stats}
+        usage[collection] = {
+            "indexes": [
+                {
+                    "name": s["name"],
+                    "key": dict(s["key"]),
+                    "ops": s["accesses"]["ops"],
+                    "since": s["accesses"]["since"],
+                    "unused": s["accesses"]["ops"] == 0 and s["name"] != "_id_"
+                }
+                for s in stats
+            ],
+            "missing": [
+                index.document["name"] for index in indexes
+                if index.document["name"] not in existing
+            ]
+        }
+    return usage
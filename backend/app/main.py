@@ -1,19 +1,78 @@
 import os
+import time
+import asyncio
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from app.config import settings
-from app.database import connect_to_mongo, close_mongo_connection
-from app.routes import auth, attendance, timetable, pyq, result
+from app.database import connect_to_mongo, close_mongo_connection, get_database, db
+from app.indexes import ensure_indexes, registry_fingerprint
+from app.routes import auth, attendance, timetable, pyq, result, admin, events, dashboard
+from app.utils.text_extract import shutdown_executor
+from app.utils.delete_queue import start_delete_worker, stop_delete_worker
+from app.utils.attendance_writer import start_attendance_writer, stop_attendance_writer, render_attendance_writer
+from app.utils.request_context import RequestContextMiddleware
+from app.utils.versions import versions
+from app.utils.admission import AdmissionMiddleware, admission
+from app.utils.events import broker
+from app.utils.db_monitor import command_monitor
+from app.utils.profiler import ProfilerMiddleware
+from app.utils.singleflight import render_singleflight
+from app.utils.startup_lock import run_once
+from app.utils.metrics import (
+    MetricsMiddleware,
+    request_metrics,
+    pool_metrics,
+    event_loop_lag,
+    render_db_time
+)
+
+
+async def bootstrap():
+    """One-time startup work shared by all workers"""
+    os.makedirs(os.path.join(settings.UPLOAD_DIR, "pyq"), exist_ok=True)
+    os.makedirs(os.path.join(settings.UPLOAD_DIR, "results"), exist_ok=True)
+    if settings.ENSURE_INDEXES_ON_STARTUP:
+        await ensure_indexes(get_database())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Per-worker startup and shutdown (each worker process has its own Mongo client)"""
+    await connect_to_mongo()
+    await run_once("bootstrap", f"{settings.UPLOAD_DIR}|{settings.DATABASE_NAME}|{registry_fingerprint()}", bootstrap)
+    await versions.start(get_database())
+    await broker.start(get_database())
+    start_delete_worker()
+    await start_attendance_writer(get_database())
+    if settings.METRICS_ENABLED:
+        event_loop_lag.start()
+    
+    yield
+    
+    shutdown_executor()
+    versions.stop()
+    broker.stop()
+    event_loop_lag.stop()
+    await stop_delete_worker()
+    await stop_attendance_writer()
+    await close_mongo_connection()
+
 
 app = FastAPI(
     title="UniPulse API",
     description="Smart Campus Platform API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Rate limits and per-class concurrency limits (inside CORS, so browsers can read 429/503s)
+app.add_middleware(AdmissionMiddleware)
+
 # CORS middleware
 cors_origins = settings.CORS_ORIGINS
 if isinstance(cors_origins, str):
@@ -25,34 +84,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Paginated lists report their total in a header the frontend reads
+    expose_headers=["X-Total-Count"],
 )
 
+# Makes the current route available to DB command monitoring
+app.add_middleware(RequestContextMiddleware)
+
+# Request counts and latency histograms for /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Per-request sampling profiler (not installed at all unless enabled)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(attendance.router)
 app.include_router(timetable.router)
 app.include_router(pyq.router)
 app.include_router(result.router)
+app.include_router(admin.router)
+app.include_router(events.router)
+app.include_router(dashboard.router)
 
-# Create uploads directory
-os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-os.makedirs(os.path.join(settings.UPLOAD_DIR, "pyq"), exist_ok=True)
-os.makedirs(os.path.join(settings.UPLOAD_DIR, "results"), exist_ok=True)
-
-# Serve uploaded files
-app.mount("/files", StaticFiles(directory=settings.UPLOAD_DIR), name="files")
-
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database connection on startup"""
-    await connect_to_mongo()
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Close database connection on shutdown"""
-    await close_mongo_connection()
+# Serve uploaded files (the directory is created at startup)
+app.mount("/files", StaticFiles(directory=settings.UPLOAD_DIR, check_dir=False), name="files")
 
 
 @app.get("/")
@@ -69,3 +127,35 @@ async def root():
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: checks the MongoDB round trip"""
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(db.client.admin.command("ping"), settings.READINESS_TIMEOUT_SECONDS)
+    except Exception as e:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "detail": str(e)})
+    
+    return {"status": "ready", "mongo_rtt_ms": round((time.perf_counter() - start) * 1000, 2)}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint"""
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("", status_code=404)
+    
+    lines = []
+    request_metrics.render(lines)
+    pool_metrics.render(lines)
+    event_loop_lag.render(lines)
+    render_singleflight(lines)
+    admission.render(lines)
+    broker.render(lines)
+    render_attendance_writer(lines)
+    if settings.DB_MONITORING_ENABLED:
+        render_db_time(command_monitor.snapshot(), lines)
+    
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
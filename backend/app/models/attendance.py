@@ -35,6 +35,13 @@ class AttendanceBulkUpload(BaseModel):
     records: List[AttendanceCreate]
 
 
+class AttendanceClassMark(BaseModel):
+    subject: str
+    date: date
+    roster: List[str] = Field(..., min_length=1)  # Every student enrolled in the lecture
+    absentees: List[str] = []  # Everyone else on the roster is marked present
+
+
 class AttendanceStats(BaseModel):
     student_id: str
     subject: Optional[str] = None
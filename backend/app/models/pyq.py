@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 from bson import ObjectId
 from pydantic import BaseModel, Field
@@ -40,3 +40,15 @@ class PYQFilter(BaseModel):
     year: Optional[int] = None
     exam_type: Optional[str] = None
 
+
+
+class PYQSearchResult(PYQResponse):
+    score: float
+
+
+class PYQSearchResponse(BaseModel):
+    query: str
+    total: int
+    page: int
+    page_size: int
+    results: List[PYQSearchResult]
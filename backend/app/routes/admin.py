@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from app.models.user import User
+from app.auth.jwt import get_current_admin_user
+from app.database import get_database
+from app.indexes import index_usage
+from app.config import settings
+from app.utils.db_monitor import command_monitor
+from app.utils.profiler import list_profiles, read_profile
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"])
+
+
+@router.get("/indexes")
+async def get_index_usage(current_user: User = Depends(get_current_admin_user)):
+    """Get index usage ($indexStats) per collection, flagging unused and missing indexes (admin only)"""
+    return await index_usage(get_database())
+
+
+@router.get("/db-stats")
+async def get_db_stats(current_user: User = Depends(get_current_admin_user)):
+    """Get per-route Mongo time histograms, per-command totals and recent slow queries (admin only)"""
+    if not settings.DB_MONITORING_ENABLED:
+        return {"enabled": False}
+    
+    return {"enabled": True, **command_monitor.snapshot()}
+
+
+@router.delete("/db-stats", status_code=204)
+async def reset_db_stats(current_user: User = Depends(get_current_admin_user)):
+    """Reset collected Mongo command statistics (admin only)"""
+    command_monitor.reset()
+    return None
+
+
+@router.get("/profiles")
+async def get_profiles(current_user: User = Depends(get_current_admin_user)):
+    """List stored request profiles, newest first (admin only)"""
+    return {"enabled": settings.PROFILING_ENABLED, "profiles": list_profiles()}
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str, current_user: User = Depends(get_current_admin_user)):
+    """Get a request profile as folded stacks, for flamegraph.pl or speedscope (admin only)"""
+    profile = read_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    return PlainTextResponse(profile)
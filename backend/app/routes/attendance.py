@@ -3,6 +3,7 @@ from typing import Optional, List
 from datetime import date, datetime
 from app.models.attendance import (
     AttendanceCreate,
+    AttendanceClassMark,
     AttendanceResponse,
     AttendanceStats
 )
@@ -10,7 +11,17 @@ from app.models.user import User
 from app.auth.jwt import get_current_user, get_current_admin_user
 from app.database import get_database
 from app.utils.csv_parser import parse_attendance_csv
+from app.utils.attendance_stats import compute_subject_stats
+from app.utils.serialization import MongoJSONResponse, encode_documents
+from app.utils.projection import parse_fields, projected_fields
+from app.utils import events
+from app.utils.attendance_writer import insert_attendance, write_behind_active
 from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/attendance", tags=["Attendance"])
 
@@ -23,16 +34,6 @@ async def create_attendance_record(
     """Create a single attendance record (admin only)"""
     db = get_database()
     
-    # Check if record already exists
-    existing = await db.attendance.find_one({
-        "student_id": record.student_id,
-        "subject": record.subject,
-        "date": record.date.isoformat()
-    })
-    
-    if existing:
-        raise HTTPException(status_code=400, detail="Attendance record already exists")
-    
     # Create record
     record_doc = {
         "student_id": record.student_id,
@@ -42,8 +43,30 @@ async def create_attendance_record(
         "created_at": datetime.utcnow()
     }
     
-    result = await db.attendance.insert_one(record_doc)
-    record_doc["_id"] = result.inserted_id
+    if write_behind_active():
+        # Batched with concurrent inserts; the unique index reports duplicates
+        try:
+            record_doc["_id"] = await insert_attendance(record_doc)
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="Attendance record already exists")
+    else:
+        # Check if record already exists
+        existing = await db.attendance.find_one({
+            "student_id": record.student_id,
+            "subject": record.subject,
+            "date": record.date.isoformat()
+        })
+        
+        if existing:
+            raise HTTPException(status_code=400, detail="Attendance record already exists")
+        
+        try:
+            result = await db.attendance.insert_one(record_doc)
+        except DuplicateKeyError:
+            # A concurrent request inserted it after the check
+            raise HTTPException(status_code=400, detail="Attendance record already exists")
+        record_doc["_id"] = result.inserted_id
+    events.broker.publish(events.ATTENDANCE, [record.student_id])
     
     return AttendanceResponse(**record_doc, id=record_doc["_id"])
 
@@ -67,6 +90,7 @@ async def bulk_upload_attendance(
     db = get_database()
     inserted_count = 0
     skipped_count = 0
+    changed_students = set()
     
     for record in records:
         # Check if record exists
@@ -84,11 +108,19 @@ async def bulk_upload_attendance(
                 "status": record.status,
                 "created_at": datetime.utcnow()
             }
-            await db.attendance.insert_one(record_doc)
+            try:
+                await db.attendance.insert_one(record_doc)
+            except DuplicateKeyError:
+                # Inserted concurrently since the check
+                skipped_count += 1
+                continue
             inserted_count += 1
+            changed_students.add(record.student_id)
         else:
             skipped_count += 1
     
+    events.broker.publish(events.ATTENDANCE, changed_students)
+    
     return {
         "message": "Attendance records uploaded",
         "inserted": inserted_count,
@@ -97,15 +129,71 @@ async def bulk_upload_attendance(
     }
 
 
+@router.post("/mark-class")
+async def mark_class_attendance(
+    lecture: AttendanceClassMark,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Mark a whole lecture at once: absentees absent, the rest of the roster present (admin only)"""
+    roster = list(dict.fromkeys(lecture.roster))
+    absentees = set(lecture.absentees)
+    unknown = absentees.difference(roster)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Absentees not on the roster: {', '.join(sorted(unknown))}")
+    
+    # Upserts keyed like the unique index, so re-submitting a corrected list only flips statuses
+    now = datetime.utcnow()
+    day = lecture.date.isoformat()
+    operations = [
+        UpdateOne(
+            {"student_id": student_id, "subject": lecture.subject, "date": day},
+            {
+                "$set": {"status": "absent" if student_id in absentees else "present"},
+                "$setOnInsert": {"created_at": now}
+            },
+            upsert=True
+        )
+        for student_id in roster
+    ]
+    
+    db = get_database()
+    failed = 0
+    try:
+        write_result = await db.attendance.bulk_write(operations, ordered=False)
+        details = write_result.bulk_api_result
+    except BulkWriteError as e:
+        # Unordered: every other student was still written
+        details = e.details
+        failed = len(details["writeErrors"])
+        logger.error(f"Marking {lecture.subject} on {day}: {failed} of {len(roster)} writes failed")
+    
+    events.broker.publish(events.ATTENDANCE, roster)
+    
+    return {
+        "message": "Class attendance saved",
+        "subject": lecture.subject,
+        "date": day,
+        "students": len(roster),
+        "present": len(roster) - len(absentees),
+        "absent": len(absentees),
+        "inserted": details["nUpserted"],
+        "updated": details["nModified"],
+        "unchanged": details["nMatched"] - details["nModified"],
+        "failed": failed
+    }
+
+
 @router.get("/", response_model=List[AttendanceResponse])
 async def get_attendance_records(
     student_id: Optional[str] = Query(None),
     subject: Optional[str] = Query(None),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
     current_user: User = Depends(get_current_user)
 ):
     """Get attendance records (students can only see their own)"""
+    projection = parse_fields(fields, AttendanceResponse)
     db = get_database()
     
     # Build query
@@ -128,10 +216,10 @@ async def get_attendance_records(
             query["date"]["$lte"] = end_date
     
     # Fetch records
-    cursor = db.attendance.find(query).sort("date", -1).limit(100)
+    cursor = db.attendance.find(query, projection).sort("date", -1).limit(100)
     records = await cursor.to_list(length=100)
     
-    return [AttendanceResponse(**r, id=r["_id"]) for r in records]
+    return MongoJSONResponse(encode_documents(records, AttendanceResponse, projected_fields(projection)))
 
 
 @router.get("/stats", response_model=AttendanceStats)
@@ -174,6 +262,15 @@ async def get_attendance_stats(
     )
 
 
+async def subject_wise_stats(db, student_id: Optional[str]) -> dict:
+    """Attendance statistics of one student grouped by subject"""
+    records = await db.attendance.find(
+        {"student_id": student_id},
+        {"_id": 0, "subject": 1, "status": 1}
+    ).to_list(length=None)
+    return {"student_id": student_id, "subjects": compute_subject_stats(records)}
+
+
 @router.get("/stats/subject-wise")
 async def get_subject_wise_stats(
     student_id: Optional[str] = Query(None),
@@ -188,34 +285,5 @@ async def get_subject_wise_stats(
     if current_user.role == "student" and student_id and student_id != current_user.student_id:
         raise HTTPException(status_code=403, detail="Cannot view other students' stats")
     
-    # Fetch all records
-    cursor = db.attendance.find({"student_id": target_student_id})
-    records = await cursor.to_list(length=None)
-    
-    # Group by subject
-    subject_stats = {}
-    for record in records:
-        subject = record["subject"]
-        if subject not in subject_stats:
-            subject_stats[subject] = {"total": 0, "present": 0, "absent": 0}
-        
-        subject_stats[subject]["total"] += 1
-        if record["status"] == "present":
-            subject_stats[subject]["present"] += 1
-        else:
-            subject_stats[subject]["absent"] += 1
-    
-    # Calculate percentages
-    result = []
-    for subject, stats in subject_stats.items():
-        percentage = (stats["present"] / stats["total"] * 100) if stats["total"] > 0 else 0.0
-        result.append({
-            "subject": subject,
-            "total_classes": stats["total"],
-            "present": stats["present"],
-            "absent": stats["absent"],
-            "percentage": round(percentage, 2)
-        })
-    
-    return {"student_id": target_student_id, "subjects": result}
+    return await subject_wise_stats(db, target_student_id)
 
@@ -11,6 +11,7 @@ from app.database import get_database
 from app.config import settings
 from app.models.user import User
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
@@ -45,7 +46,14 @@ async def register(user_data: UserCreate):
     }
     
     # Insert user
-    result = await db.users.insert_one(user_doc)
+    try:
+        result = await db.users.insert_one(user_doc)
+    except DuplicateKeyError:
+        # Registered concurrently since the check (hashing the password takes a while)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Student ID already registered"
+        )
     user_doc["_id"] = result.inserted_id
     
     # Return user (without password)
@@ -101,16 +109,21 @@ async def login(credentials: UserLogin):
     }
 
 
+def user_info(user: User) -> UserResponse:
+    """Public view of a user (no password hash)"""
+    return UserResponse(
+        id=str(user.id),
+        student_id=user.student_id,
+        name=user.name,
+        email=user.email,
+        role=user.role,
+        created_at=user.created_at,
+        updated_at=user.updated_at
+    )
+
+
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Get current authenticated user info"""
-    return UserResponse(
-        id=str(current_user.id),
-        student_id=current_user.student_id,
-        name=current_user.name,
-        email=current_user.email,
-        role=current_user.role,
-        created_at=current_user.created_at,
-        updated_at=current_user.updated_at
-    )
+    return user_info(current_user)
 
@@ -0,0 +1,91 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Optional
+from app.models.user import User
+from app.auth.jwt import get_current_user
+from app.database import get_database
+from app.config import settings
+from app.routes.auth import user_info
+from app.routes.attendance import subject_wise_stats
+from app.routes.timetable import weekly_timetable
+from app.routes.result import cgpa_summary
+from app.routes.pyq import pyq_facets
+from app.utils import snapshots
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
+
+
+async def _attendance(db, student_id: Optional[str]) -> dict:
+    stats = await subject_wise_stats(db, student_id)
+    total = sum(s["total_classes"] for s in stats["subjects"])
+    present = sum(s["present"] for s in stats["subjects"])
+    stats["overall"] = {
+        "total_classes": total,
+        "present": present,
+        "absent": total - present,
+        "percentage": round(present / total * 100, 2) if total > 0 else 0.0
+    }
+    return stats
+
+
+async def _cgpa(db, student_id: str) -> dict:
+    # A published snapshot is the same payload without the database round trip
+    snapshot = await asyncio.to_thread(snapshots.read_snapshot, student_id, snapshots.CGPA)
+    if snapshot:
+        return json.loads(snapshot[0])
+    return await cgpa_summary(db, student_id)
+
+
+async def _pyq(db) -> dict:
+    facets = await pyq_facets(db)
+    return {"total": facets["total"], "subjects": [s["value"] for s in facets["subjects"]]}
+
+
+@router.get("")
+async def get_dashboard(
+    student_id: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Everything the student dashboard shows, in one request.
+
+    Sections are loaded concurrently; one that fails or times out is returned as
+    null with its error under "errors" instead of failing the whole page.
+    """
+    if current_user.role == "student" and student_id and student_id != current_user.student_id:
+        raise HTTPException(status_code=403, detail="Cannot view other students' dashboard")
+    if current_user.role == "admin" and not student_id:
+        raise HTTPException(status_code=400, detail="student_id is required for admins")
+    target_student_id = student_id if current_user.role == "admin" else current_user.student_id
+
+    db = get_database()
+    sections = {
+        "attendance": _attendance(db, target_student_id),
+        "timetable": weekly_timetable(db, target_student_id),
+        "cgpa": _cgpa(db, target_student_id),
+        "pyq": _pyq(db),
+    }
+    timeout = settings.DASHBOARD_SECTION_TIMEOUT_SECONDS
+    outcomes = await asyncio.gather(
+        *(asyncio.wait_for(section, timeout) for section in sections.values()),
+        return_exceptions=True
+    )
+
+    payload = {"user": user_info(current_user), "errors": {}}
+    for name, outcome in zip(sections, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            logger.error(f"Dashboard section {name} timed out after {timeout}s")
+            payload[name] = None
+            payload["errors"][name] = "Timed out"
+        elif isinstance(outcome, Exception):
+            logger.error(f"Dashboard section {name} failed", exc_info=outcome)
+            payload[name] = None
+            payload["errors"][name] = outcome.detail if isinstance(outcome, HTTPException) else "Unavailable"
+        else:
+            payload[name] = outcome
+
+    return payload
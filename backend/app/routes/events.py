@@ -0,0 +1,86 @@
+import json
+import secrets
+from datetime import datetime, timedelta
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from jose import jwt
+from app.auth.jwt import get_current_user, oauth2_scheme
+from app.config import settings
+from app.database import get_database
+from app.utils.events import broker
+
+router = APIRouter(prefix="/api/events", tags=["Events"])
+
+
+@router.post("/ticket")
+async def create_stream_ticket(token: str = Depends(oauth2_scheme)):
+    """
+    Exchange the access token for a short-lived, single-use event stream ticket.
+
+    EventSource cannot send headers, so the stream is opened with the ticket in
+    its URL instead of the token itself; it ends when the token expires.
+    """
+    user = await get_current_user(token)
+    token_expires_at = datetime.utcfromtimestamp(jwt.get_unverified_claims(token)["exp"])
+
+    ticket = secrets.token_urlsafe(32)
+    await get_database().event_tickets.insert_one({
+        "_id": ticket,
+        "student_id": user.student_id,
+        "role": user.role,
+        "token_expires_at": token_expires_at,
+        "expires_at": datetime.utcnow() + timedelta(seconds=settings.EVENTS_TICKET_TTL_SECONDS)
+    })
+
+    return {"ticket": ticket, "expires_in": settings.EVENTS_TICKET_TTL_SECONDS}
+
+
+@router.get("/stream")
+async def stream_events(ticket: str = Query(...)):
+    """
+    Server-sent events announcing new results, attendance and timetables.
+
+    Open with a ticket from POST /api/events/ticket. Students receive their own
+    events; admins receive everyone's. Each event names what changed; clients
+    re-fetch it from the list endpoints. An "expired" event ends the stream when
+    the access token behind the ticket expires.
+    """
+    # Redeeming deletes the ticket, so it cannot be replayed
+    grant = await get_database().event_tickets.find_one_and_delete(
+        {"_id": ticket, "expires_at": {"$gt": datetime.utcnow()}}
+    )
+    if grant is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired stream ticket")
+    if broker.connections >= settings.EVENTS_MAX_CONNECTIONS:
+        raise HTTPException(status_code=503, detail="Too many event streams", headers={"Retry-After": "30"})
+    if broker.connections_of(grant["student_id"]) >= settings.EVENTS_MAX_CONNECTIONS_PER_USER:
+        raise HTTPException(status_code=429, detail="Too many event streams for this user", headers={"Retry-After": "30"})
+
+    token_expires_at = grant["token_expires_at"]
+
+    async def events():
+        # Subscribed only once the response is being sent: a client gone before that never runs the finally
+        subscription = broker.subscribe(None if grant["role"] == "admin" else grant["student_id"], grant["student_id"])
+        try:
+            # Tell EventSource how long to wait before reconnecting
+            yield f"retry: {settings.EVENTS_RETRY_MS}\n\n"
+            while True:
+                remaining = (token_expires_at - datetime.utcnow()).total_seconds()
+                if remaining <= 0:
+                    yield "event: expired\ndata: {}\n\n"
+                    return
+                pending = await subscription.next(min(settings.EVENTS_HEARTBEAT_SECONDS, remaining))
+                if not pending:
+                    # Comment line keeps proxies from closing the idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                for event_type, student_id in pending:
+                    yield f"event: {event_type}\ndata: {json.dumps({'student_id': student_id})}\n\n"
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
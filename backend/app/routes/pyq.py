@@ -1,14 +1,30 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Query
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Query, Request, Response
 from typing import Optional, List
-from app.models.pyq import PYQCreate, PYQResponse, PYQFilter
+from app.models.pyq import PYQCreate, PYQResponse, PYQFilter, PYQSearchResponse, PYQSearchResult
 from app.models.user import User
 from app.auth.jwt import get_current_user, get_current_admin_user
 from app.database import get_database
 from app.utils.file_upload import upload_file
+from app.utils.delete_queue import delete_file
+from app.utils.pyq_import import parse_manifest, find_manifest, import_pyq_archive
+from app.utils.text_extract import schedule_pyq_indexing
+from app.utils.cache import InvalidatingCache
+from app.utils.projection import parse_fields, projected_fields
+from app.utils.serialization import MongoJSONResponse, encode_documents
+from app.utils.versions import versions, version_etag, not_modified, cache_headers, PYQ
+from app.utils.singleflight import SingleFlight
 from datetime import datetime
+import asyncio
+import zipfile
 
 router = APIRouter(prefix="/api/pyq", tags=["PYQ (Previous Year Questions)"])
 
+# Facet counts only change on upload/delete
+facets_cache = InvalidatingCache()
+
+# Identical concurrent reads share one query
+pyq_reads = SingleFlight("pyq")
+
 
 @router.post("/upload", response_model=PYQResponse, status_code=201)
 async def upload_pyq(
@@ -42,19 +58,95 @@ async def upload_pyq(
     
     result = await db.pyq.insert_one(pyq_doc)
     pyq_doc["_id"] = result.inserted_id
+    facets_cache.invalidate()
+    await versions.bump(db, [PYQ])
+    
+    # Index paper contents for search in the background
+    await file.seek(0)
+    schedule_pyq_indexing(result.inserted_id, await file.read(), file.filename)
     
     return PYQResponse(**pyq_doc, id=pyq_doc["_id"])
 
 
+@router.post("/bulk-upload", status_code=201)
+async def bulk_upload_pyqs(
+    archive: UploadFile = File(...),
+    manifest: Optional[UploadFile] = File(None),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Import many PYQs from a ZIP archive (admin only)
+
+    The manifest (CSV or JSON with file, subject, semester, year, exam_type) can be
+    uploaded alongside the archive or bundled in it as manifest.csv / manifest.json.
+    """
+    if not archive.filename.endswith(".zip"):
+        raise HTTPException(status_code=400, detail="Archive must be a ZIP file")
+    
+    # Load manifest
+    if manifest:
+        manifest_rows = parse_manifest(await manifest.read(), manifest.filename)
+    else:
+        try:
+            with zipfile.ZipFile(archive.file) as zf:
+                bundled = find_manifest(zf)
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail="Archive must be a valid ZIP file")
+        if not bundled:
+            raise HTTPException(status_code=400, detail="Manifest file is required")
+        manifest_rows = parse_manifest(*bundled)
+    
+    # Extract and store files concurrently
+    documents, report = await import_pyq_archive(
+        archive.file,
+        manifest_rows,
+        uploaded_by=current_user.student_id
+    )
+    
+    # Insert all metadata in one round trip
+    pending = [(i, doc) for i, doc in enumerate(documents) if doc]
+    if pending:
+        db = get_database()
+        try:
+            insert_result = await db.pyq.insert_many([doc for _, doc in pending])
+        except Exception:
+            for _, doc in pending:
+                await delete_file(doc["file_url"])
+            raise HTTPException(status_code=500, detail="Error saving PYQ metadata")
+        
+        for (i, _), inserted_id in zip(pending, insert_result.inserted_ids):
+            report[i]["id"] = str(inserted_id)
+        facets_cache.invalidate()
+        await versions.bump(db, [PYQ])
+    
+    imported_count = len(pending)
+    return {
+        "message": "PYQ archive imported",
+        "imported": imported_count,
+        "failed": len(report) - imported_count,
+        "total": len(report),
+        "files": report
+    }
+
+
 @router.get("/", response_model=List[PYQResponse])
 async def get_pyqs(
+    request: Request,
     subject: Optional[str] = Query(None),
     semester: Optional[int] = Query(None),
     year: Optional[int] = Query(None),
     exam_type: Optional[str] = Query(None),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
     current_user: User = Depends(get_current_user)
 ):
-    """Get PYQ documents with optional filters"""
+    """Get PYQ documents with optional filters (paginated, total in X-Total-Count)"""
+    etag = version_etag(request, current_user, PYQ)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
     db = get_database()
     
     # Build query
@@ -68,20 +160,139 @@ async def get_pyqs(
     if exam_type:
         query["exam_type"] = exam_type.lower()
     
+    # Extracted text is only used for search
+    selection = parse_fields(fields, PYQResponse)
+    projection = selection or {"content_text": 0}
+    
     # Fetch PYQs
-    cursor = db.pyq.find(query).sort([("year", -1), ("semester", -1)])
-    pyqs = await cursor.to_list(length=None)
+    cursor = (
+        db.pyq.find(query, projection)
+        .sort([("year", -1), ("semester", -1)])
+        .skip((page - 1) * page_size)
+        .limit(page_size)
+    )
+    pyqs, total = await asyncio.gather(
+        cursor.to_list(length=page_size),
+        db.pyq.count_documents(query)
+    )
+    headers = {"X-Total-Count": str(total), **cache_headers(etag)}
     
-    return [PYQResponse(**p, id=p["_id"]) for p in pyqs]
+    return MongoJSONResponse(encode_documents(pyqs, PYQResponse, projected_fields(selection)), headers=headers)
+
+
+async def pyq_facets(db) -> dict:
+    """PYQ counts per subject, year, semester and exam type, cached until the next PYQ write"""
+    # Keyed by version so writes made by other workers are picked up too
+    version = versions.get(PYQ)
+    facets = facets_cache.get(version)
+    if facets is not None:
+        return facets
+    
+    def count_by(field: str) -> list:
+        return [
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$sort": {"_id": 1}}
+        ]
+    
+    pipeline = [{
+        "$facet": {
+            "subjects": count_by("subject"),
+            "years": count_by("year"),
+            "semesters": count_by("semester"),
+            "exam_types": count_by("exam_type"),
+            "total": [{"$count": "count"}]
+        }
+    }]
+    # The query must not be shared with one started before the write that made this version
+    facets = (await pyq_reads.do(("facets", version), lambda: db.pyq.aggregate(pipeline).to_list(length=1)))[0]
+    
+    def as_counts(buckets: list) -> list:
+        return [{"value": b["_id"], "count": b["count"]} for b in buckets]
+    
+    # Entries of older versions are never read again
+    facets_cache.invalidate()
+    return facets_cache.set(version, {
+        "total": facets["total"][0]["count"] if facets["total"] else 0,
+        "subjects": as_counts(facets["subjects"]),
+        "years": as_counts(facets["years"]),
+        "semesters": as_counts(facets["semesters"]),
+        "exam_types": as_counts(facets["exam_types"])
+    })
+
+
+@router.get("/facets")
+async def get_pyq_facets(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+):
+    """Get PYQ counts per subject, year, semester and exam type"""
+    etag = version_etag(request, current_user, PYQ)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers.update(cache_headers(etag))
+    
+    return await pyq_facets(get_database())
+
+
+@router.get("/search", response_model=PYQSearchResponse)
+async def search_pyqs(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user)
+):
+    """Search PYQs by subject, file name and paper contents, best matches first"""
+    etag = version_etag(request, current_user, PYQ)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers.update(cache_headers(etag))
+    
+    db = get_database()
+    
+    query = {"$text": {"$search": q}}
+    projection = {"score": {"$meta": "textScore"}, "content_text": 0}
+    cursor = (
+        db.pyq.find(query, projection)
+        .sort([("score", {"$meta": "textScore"})])
+        .skip((page - 1) * page_size)
+        .limit(page_size)
+    )
+    pyqs, total = await asyncio.gather(
+        cursor.to_list(length=page_size),
+        db.pyq.count_documents(query)
+    )
+    
+    return PYQSearchResponse(
+        query=q,
+        total=total,
+        page=page,
+        page_size=page_size,
+        results=[PYQSearchResult(**{**p, "_id": str(p["_id"])}) for p in pyqs]
+    )
 
 
 @router.get("/subjects")
-async def get_pyq_subjects(current_user: User = Depends(get_current_user)):
+async def get_pyq_subjects(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+):
     """Get list of all subjects with PYQs"""
+    etag = version_etag(request, current_user, PYQ)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers.update(cache_headers(etag))
+    
     db = get_database()
     
-    # Get distinct subjects
-    subjects = await db.pyq.distinct("subject")
+    # Get distinct subjects (keyed by version, so a read after a write never joins an older one)
+    subjects = await pyq_reads.do(("distinct:subject", versions.get(PYQ)), lambda: db.pyq.distinct("subject"))
     
     return {"subjects": sorted(subjects)}
 
@@ -93,7 +304,6 @@ async def delete_pyq(
 ):
     """Delete a PYQ document (admin only)"""
     from bson import ObjectId
-    from app.utils.file_upload import delete_file
     
     db = get_database()
     
@@ -107,6 +317,8 @@ async def delete_pyq(
     
     # Delete document
     await db.pyq.delete_one({"_id": ObjectId(pyq_id)})
+    facets_cache.invalidate()
+    await versions.bump(db, [PYQ])
     
     return None
 
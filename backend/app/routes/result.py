@@ -1,14 +1,31 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Query
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Query, Request, Response
 from typing import Optional, List
 from app.models.result import ResultCreate, ResultResponse
 from app.models.user import User
 from app.auth.jwt import get_current_user, get_current_admin_user
 from app.database import get_database
 from app.utils.file_upload import upload_file
+from app.utils.delete_queue import delete_file
+from app.utils.academics import update_academic_summaries, ensure_academic_summary, summary_response
+from app.utils.grading import parse_grade_scale, parse_marks_sheet, compute_cohort_results
+from app.utils.result_analytics import analytics_pipeline, compute_semester_analytics, student_percentile
+from app.utils.cache import InvalidatingCache
+from app.utils import snapshots, events
+from app.utils.serialization import MongoJSONResponse, encode_documents
+from app.utils.projection import parse_fields, projected_fields
+from app.utils.versions import versions, version_etag, not_modified, cache_headers, results_scope, semester_scope
+from app.config import settings
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from datetime import datetime
+import asyncio
 
 router = APIRouter(prefix="/api/results", tags=["Results"])
 
+# Semester analytics keyed by (semester, academic_year), stored with the semester's version
+# so writes made by other workers are picked up too
+analytics_cache = InvalidatingCache()
+
 
 @router.post("/", response_model=ResultResponse, status_code=201)
 async def create_result(
@@ -63,27 +80,140 @@ async def create_result(
     })
     
     if existing:
-        # Update existing
+        # Update existing; without a new file the stored PDF is kept
+        if not file_url:
+            result_doc.pop("file_url")
         await db.results.update_one(
             {"_id": existing["_id"]},
             {"$set": result_doc}
         )
         result_doc["_id"] = existing["_id"]
+        
+        if file_url:
+            # Remove the replaced result PDF
+            if existing.get("file_url") and existing["file_url"] != file_url:
+                await delete_file(existing["file_url"])
+        else:
+            result_doc["file_url"] = existing.get("file_url")
     else:
         # Create new
-        result_obj = await db.results.insert_one(result_doc)
+        try:
+            result_obj = await db.results.insert_one(result_doc)
+        except DuplicateKeyError:
+            # A concurrent request created it after the check
+            if file_url:
+                await delete_file(file_url)
+            raise HTTPException(status_code=400, detail="Result already exists")
         result_doc["_id"] = result_obj.inserted_id
     
+    # Keep the student's CGPA summary and semester analytics current
+    await update_academic_summaries(db, [result_doc])
+    analytics_cache.invalidate((semester, academic_year))
+    await asyncio.to_thread(snapshots.invalidate_snapshots, [student_id])
+    await versions.bump(db, [results_scope(student_id), semester_scope(semester, academic_year)])
+    events.broker.publish(events.RESULTS, [student_id])
+    
     return ResultResponse(**result_doc, id=result_doc["_id"])
 
 
+@router.post("/bulk-publish", status_code=201)
+async def bulk_publish_results(
+    file: UploadFile = File(...),
+    semester: int = Query(...),
+    academic_year: str = Query(...),
+    grade_scale: Optional[str] = Query(None),  # JSON: [[min_marks, grade, grade_points], ...]
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Publish a whole cohort's results from a marks sheet (admin only)"""
+    if not file.filename.endswith((".csv", ".xlsx")):
+        raise HTTPException(status_code=400, detail="File must be a CSV or XLSX sheet")
+    
+    scale = parse_grade_scale(grade_scale)
+    content = await file.read()
+    
+    # Grade and compute SGPAs off the event loop
+    df = await asyncio.to_thread(parse_marks_sheet, content, file.filename)
+    cohort, skipped = await asyncio.to_thread(compute_cohort_results, df, scale)
+    if not cohort:
+        raise HTTPException(status_code=400, detail="No valid marks found in sheet")
+    
+    # Upsert every student's result in one bulk write
+    now = datetime.utcnow()
+    result_docs = []
+    operations = []
+    for entry in cohort:
+        result_doc = {
+            "student_id": entry["student_id"],
+            "semester": semester,
+            "academic_year": academic_year,
+            "subjects": entry["subjects"],
+            "sgpa": entry["sgpa"],
+            "uploaded_by": current_user.student_id,
+            "uploaded_at": now,
+            "published_at": now
+        }
+        result_docs.append(result_doc)
+        operations.append(UpdateOne(
+            {"student_id": entry["student_id"], "semester": semester, "academic_year": academic_year},
+            {"$set": result_doc, "$setOnInsert": {"cgpa": None, "file_url": None}},
+            upsert=True
+        ))
+    
+    db = get_database()
+    failed = []
+    try:
+        write_result = await db.results.bulk_write(operations, ordered=False)
+        inserted, updated = write_result.upserted_count, write_result.matched_count
+    except BulkWriteError as e:
+        # Unordered: every other operation was still applied
+        inserted, updated = e.details.get("nUpserted", 0), e.details.get("nMatched", 0)
+        errors = {error["index"]: error.get("errmsg", "Write failed") for error in e.details.get("writeErrors", [])}
+        failed = [{"student_id": result_docs[i]["student_id"], "detail": detail} for i, detail in sorted(errors.items())]
+        result_docs = [doc for i, doc in enumerate(result_docs) if i not in errors]
+        if not result_docs:
+            raise HTTPException(status_code=500, detail="Error publishing results")
+    
+    # Follow-up steps only for the results that were written
+    written_ids = [doc["student_id"] for doc in result_docs]
+    await update_academic_summaries(db, result_docs)
+    analytics_cache.invalidate((semester, academic_year))
+    await asyncio.to_thread(snapshots.invalidate_snapshots, written_ids)
+    await versions.bump(db, [
+        semester_scope(semester, academic_year),
+        *(results_scope(student_id) for student_id in written_ids)
+    ])
+    events.broker.publish(events.RESULTS, written_ids)
+    
+    return {
+        "message": "Results published" if not failed else "Results partially published",
+        "students": len(result_docs),
+        "inserted": inserted,
+        "updated": updated,
+        "failed": failed,
+        # Rows left out ({row, student_id, reason}); their students are published without an SGPA
+        "skipped_rows": skipped,
+        "students_without_sgpa": [entry["student_id"] for entry in cohort if entry["sgpa"] is None]
+    }
+
+
+@router.post("/publish")
+async def publish_result_snapshots(current_user: User = Depends(get_current_admin_user)):
+    """Pre-render every student's results and CGPA so publish-day reads skip the database (admin only)"""
+    counts = await snapshots.publish_snapshots(get_database())
+    
+    return {"message": "Result snapshots published", **counts}
+
+
 @router.get("/", response_model=List[ResultResponse])
 async def get_results(
+    request: Request,
     student_id: Optional[str] = Query(None),
     semester: Optional[int] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
     current_user: User = Depends(get_current_user)
 ):
     """Get results (students can only see their own)"""
+    projection = parse_fields(fields, ResultResponse)
     db = get_database()
     
     # Build query
@@ -96,12 +226,76 @@ async def get_results(
     
     if semester:
         query["semester"] = semester
+    elif projection is None:
+        # Serve the published snapshot when there is one (it holds the full documents)
+        snapshot = await asyncio.to_thread(snapshots.read_snapshot, query["student_id"], snapshots.RESULTS)
+        if snapshot:
+            return snapshots.snapshot_response(request, snapshot)
+    
+    etag = version_etag(request, current_user, results_scope(query["student_id"]))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
     
     # Fetch results
-    cursor = db.results.find(query).sort([("academic_year", -1), ("semester", -1)])
+    cursor = db.results.find(query, projection).sort([("academic_year", -1), ("semester", -1)])
     results = await cursor.to_list(length=None)
     
-    return [ResultResponse(**r, id=r["_id"]) for r in results]
+    return MongoJSONResponse(
+        encode_documents(results, ResultResponse, projected_fields(projection)),
+        headers=cache_headers(etag)
+    )
+
+
+async def get_semester_distribution(semester: int, academic_year: str) -> dict:
+    """Get (and cache) the analytics of one semester"""
+    key = (semester, academic_year)
+    version = versions.get(semester_scope(semester, academic_year))
+    cached = analytics_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    db = get_database()
+    rows = await db.results.aggregate(analytics_pipeline(semester, academic_year)).to_list(length=None)
+    distribution = await asyncio.to_thread(compute_semester_analytics, rows, settings.GRADE_SCALE)
+    return analytics_cache.set(key, (version, distribution))[1]
+
+
+@router.get("/analytics")
+async def get_semester_analytics(
+    semester: int = Query(...),
+    academic_year: str = Query(...),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Get class rank, toppers, grade distributions and pass rates for a semester (admin only)"""
+    distribution = await get_semester_distribution(semester, academic_year)
+    
+    return {
+        "semester": semester,
+        "academic_year": academic_year,
+        **distribution["analytics"]
+    }
+
+
+@router.get("/analytics/percentile")
+async def get_semester_percentile(
+    semester: int = Query(...),
+    academic_year: str = Query(...),
+    student_id: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a student's rank and percentile for a semester"""
+    target_student_id = student_id if current_user.role == "admin" else current_user.student_id
+    
+    if current_user.role == "student" and student_id and student_id != current_user.student_id:
+        raise HTTPException(status_code=403, detail="Cannot view other students' percentile")
+    
+    distribution = await get_semester_distribution(semester, academic_year)
+    standing = student_percentile(distribution, target_student_id)
+    if standing is None:
+        raise HTTPException(status_code=404, detail="No result with SGPA for this semester")
+    
+    return {"semester": semester, "academic_year": academic_year, **standing}
 
 
 @router.get("/{result_id}", response_model=ResultResponse)
@@ -125,12 +319,29 @@ async def get_result(
     return ResultResponse(**result, id=result["_id"])
 
 
+async def cgpa_summary(db, student_id: Optional[str]) -> dict:
+    """Credit-weighted CGPA of a student, read from their academic summary"""
+    if student_id is None:
+        return summary_response(None, None)
+    
+    summary = await db.academic_summaries.find_one({"student_id": student_id}, {"_id": 0})
+    
+    if summary is None:
+        # Not built yet (e.g. results written before summaries existed)
+        await ensure_academic_summary(db, student_id)
+        summary = await db.academic_summaries.find_one({"student_id": student_id}, {"_id": 0})
+    
+    return summary_response(student_id, summary)
+
+
 @router.get("/cgpa/calculate")
 async def calculate_cgpa(
+    request: Request,
+    response: Response,
     student_id: Optional[str] = Query(None),
     current_user: User = Depends(get_current_user)
 ):
-    """Calculate overall CGPA for a student"""
+    """Get credit-weighted CGPA for a student from their academic summary"""
     db = get_database()
     
     # Determine student_id
@@ -139,39 +350,14 @@ async def calculate_cgpa(
     if current_user.role == "student" and student_id and student_id != current_user.student_id:
         raise HTTPException(status_code=403, detail="Cannot view other students' CGPA")
     
-    # Fetch all results
-    cursor = db.results.find({"student_id": target_student_id})
-    results = await cursor.to_list(length=None)
+    snapshot = target_student_id and await asyncio.to_thread(snapshots.read_snapshot, target_student_id, snapshots.CGPA)
+    if snapshot:
+        return snapshots.snapshot_response(request, snapshot)
     
-    if not results:
-        return {
-            "student_id": target_student_id,
-            "cgpa": None,
-            "total_semesters": 0,
-            "semesters": []
-        }
-    
-    # Calculate weighted CGPA
-    total_sgpa = 0
-    total_semesters = 0
-    semester_details = []
-    
-    for result in sorted(results, key=lambda x: (x["academic_year"], x["semester"])):
-        if result.get("sgpa"):
-            total_sgpa += result["sgpa"]
-            total_semesters += 1
-            semester_details.append({
-                "semester": result["semester"],
-                "academic_year": result["academic_year"],
-                "sgpa": result["sgpa"]
-            })
-    
-    cgpa = (total_sgpa / total_semesters) if total_semesters > 0 else None
+    etag = version_etag(request, current_user, results_scope(target_student_id))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers.update(cache_headers(etag))
     
-    return {
-        "student_id": target_student_id,
-        "cgpa": round(cgpa, 2) if cgpa else None,
-        "total_semesters": total_semesters,
-        "semesters": semester_details
-    }
-
+    return await cgpa_summary(db, target_student_id)
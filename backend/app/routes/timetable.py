@@ -1,13 +1,23 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from typing import Optional, List
 from app.models.timetable import TimetableEntry, TimetableResponse
 from app.models.user import User
 from app.auth.jwt import get_current_user, get_current_admin_user
 from app.database import get_database
+from app.utils.serialization import MongoJSONResponse, encode_documents
+from app.utils.projection import parse_fields, projected_fields
+from app.utils.versions import versions, version_etag, not_modified, cache_headers, TIMETABLE
+from app.utils.singleflight import SingleFlight, query_key
+from app.utils.timetables import merge_weekly_timetable
+from app.utils import events
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 
 router = APIRouter(prefix="/api/timetable", tags=["Timetable"])
 
+# Whole classes load the same timetable at once; identical reads share one query
+timetable_reads = SingleFlight("timetable")
+
 
 @router.post("/", response_model=TimetableResponse, status_code=201)
 async def create_timetable(
@@ -43,19 +53,38 @@ async def create_timetable(
     else:
         # Create
         timetable_doc["created_at"] = datetime.utcnow()
-        result = await db.timetable.insert_one(timetable_doc)
-        timetable_doc["_id"] = result.inserted_id
+        try:
+            result = await db.timetable.insert_one(timetable_doc)
+            timetable_doc["_id"] = result.inserted_id
+        except DuplicateKeyError:
+            # Created concurrently since the check: update that one instead
+            timetable_doc.pop("_id", None)
+            existing = await db.timetable.find_one(query)
+            timetable_doc["created_at"] = existing.get("created_at", timetable_doc["created_at"])
+            await db.timetable.update_one({"_id": existing["_id"]}, {"$set": timetable_doc})
+            timetable_doc["_id"] = existing["_id"]
+    
+    await versions.bump(db, [TIMETABLE])
+    events.broker.publish(events.TIMETABLE, [timetable.student_id])
     
     return TimetableResponse(**timetable_doc, id=timetable_doc["_id"])
 
 
 @router.get("/", response_model=List[TimetableResponse])
 async def get_timetable(
+    request: Request,
     student_id: Optional[str] = Query(None),
     day: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
     current_user: User = Depends(get_current_user)
 ):
     """Get timetable"""
+    projection = parse_fields(fields, TimetableResponse)
+    etag = version_etag(request, current_user, TIMETABLE)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
     db = get_database()
     
     # Build query
@@ -78,61 +107,53 @@ async def get_timetable(
     if day:
         query["day"] = day
     
-    # Fetch records
-    cursor = db.timetable.find(query).sort("day", 1)
-    timetables = await cursor.to_list(length=None)
+    # Fetch records (keyed by version: a read after a write never joins one started before it)
+    timetables = await timetable_reads.do(
+        query_key("find", query, "day", projection, versions.get(TIMETABLE)),
+        lambda: db.timetable.find(query, projection).sort("day", 1).to_list(length=None)
+    )
     
-    return [TimetableResponse(**t, id=t["_id"]) for t in timetables]
+    return MongoJSONResponse(
+        encode_documents(timetables, TimetableResponse, projected_fields(projection)),
+        headers=cache_headers(etag)
+    )
 
 
-@router.get("/current-week")
-async def get_current_week_timetable(
-    current_user: User = Depends(get_current_user)
-):
-    """Get complete weekly timetable"""
-    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    db = get_database()
-    
-    # Build query
-    if current_user.role == "student":
+async def weekly_timetable(db, student_id: Optional[str]) -> dict:
+    """Week of a student (their own days override the common ones), or the common week for None"""
+    if student_id:
         query = {
             "$or": [
-                {"student_id": current_user.student_id},
+                {"student_id": student_id},
                 {"student_id": None}
             ]
         }
     else:
         query = {"student_id": None}
     
-    # Fetch all timetables
-    cursor = db.timetable.find(query)
-    all_timetables = await cursor.to_list(length=None)
+    # Fetch all timetables (keyed by version like the list above)
+    all_timetables = await timetable_reads.do(
+        query_key("find", query, versions.get(TIMETABLE)),
+        lambda: db.timetable.find(query).to_list(length=None)
+    )
     
-    # Organize by day
-    weekly_timetable = {}
-    for day in days:
-        weekly_timetable[day] = []
-    
-    for timetable in all_timetables:
-        day = timetable["day"]
-        if day in weekly_timetable:
-            # Prioritize student-specific over common
-            if timetable.get("student_id") and day not in [t["day"] for t in weekly_timetable[day] if t.get("student_id")]:
-                weekly_timetable[day].append(TimetableResponse(**timetable, id=timetable["_id"]))
-            elif not timetable.get("student_id"):
-                # Add common timetable if no student-specific exists
-                if not any(t.get("student_id") for t in weekly_timetable[day]):
-                    weekly_timetable[day].append(TimetableResponse(**timetable, id=timetable["_id"]))
-    
-    # Convert to list format
-    result = []
-    for day in days:
-        for timetable in weekly_timetable[day]:
-            result.append({
-                "day": day,
-                "time_slots": timetable.time_slots
-            })
-            break  # Only one timetable per day
-    
-    return {"timetable": result}
+    return {"timetable": merge_weekly_timetable(all_timetables)}
+
+
+@router.get("/current-week")
+async def get_current_week_timetable(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+):
+    """Get complete weekly timetable"""
+    etag = version_etag(request, current_user, TIMETABLE)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers.update(cache_headers(etag))
+    
+    # Admins see the common timetable
+    student_id = current_user.student_id if current_user.role == "student" else None
+    return await weekly_timetable(get_database(), student_id)
 
@@ -0,0 +1,203 @@
+import logging
+from datetime import datetime
+from typing import Optional, List, Iterable
+from bson import ObjectId
+from pymongo import InsertOne, ReplaceOne
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+# Summaries are written in batches of this many students
+BULK_WRITE_BATCH_SIZE = 1000
+
+# Incremental updates that lose a race with another writer are re-read and retried this often
+MAX_UPDATE_ATTEMPTS = 5
+
+
+def semester_entry(result_doc: dict) -> Optional[dict]:
+    """Summarize one result document (None if it has no SGPA yet)"""
+    # 0.0 is a real SGPA (every subject failed), only a missing one is skipped
+    if result_doc.get("sgpa") is None:
+        return None
+
+    credits = sum(s.get("credits") or 0 for s in result_doc.get("subjects") or [])
+    return {
+        "semester": result_doc["semester"],
+        "academic_year": result_doc["academic_year"],
+        "sgpa": result_doc["sgpa"],
+        "credits": credits
+    }
+
+
+def summarize(student_id: str, semesters: List[dict]) -> dict:
+    """
+    Build a student's academic summary from their per-semester entries.
+
+    CGPA is weighted by credits when every semester has credit information,
+    otherwise it falls back to the plain mean of SGPAs.
+    """
+    semesters = sorted(semesters, key=lambda x: (x["academic_year"], x["semester"]))
+    total_credits = sum(s["credits"] for s in semesters)
+
+    cgpa = None
+    if semesters:
+        if all(s["credits"] > 0 for s in semesters):
+            cgpa = sum(s["sgpa"] * s["credits"] for s in semesters) / total_credits
+        else:
+            cgpa = sum(s["sgpa"] for s in semesters) / len(semesters)
+
+    return {
+        "student_id": student_id,
+        "cgpa": round(cgpa, 2) if cgpa is not None else None,
+        "total_credits": total_credits,
+        "total_semesters": len(semesters),
+        "semesters": semesters,
+        "updated_at": datetime.utcnow(),
+        # Changes on every write; updates only replace the revision they read
+        "revision": ObjectId()
+    }
+
+
+def apply_result(student_id: str, summary: Optional[dict], result_doc: dict) -> dict:
+    """Fold one inserted/updated result into an existing summary without rescanning results"""
+    key = (result_doc["academic_year"], result_doc["semester"])
+    semesters = [
+        s for s in (summary or {}).get("semesters", [])
+        if (s["academic_year"], s["semester"]) != key
+    ]
+    entry = semester_entry(result_doc)
+    if entry:
+        semesters.append(entry)
+    return summarize(student_id, semesters)
+
+
+async def update_academic_summaries(db, result_docs: Iterable[dict]):
+    """Incrementally update the summaries of the students whose results were written"""
+    pending: dict = {}
+    for result_doc in result_docs:
+        pending.setdefault(result_doc["student_id"], []).append(result_doc)
+    await _update_summaries(db, pending)
+
+
+async def ensure_academic_summary(db, student_id: str):
+    """Build a student's summary from their results if they do not have one yet"""
+    await _update_summaries(db, {student_id: []})
+
+
+async def _update_summaries(db, pending: dict):
+    """
+    Read-modify-write the summaries of `pending` (student_id -> result docs to fold in).
+
+    Each write is conditional on the revision that was read (or on no summary
+    existing yet), so a concurrent update is never overwritten: the students
+    whose write lost are re-read and their results folded in again.
+    """
+    for _ in range(MAX_UPDATE_ATTEMPTS):
+        pending = await _try_update_summaries(db, pending)
+        if not pending:
+            return
+
+    # Still contended: rebuilding from the results collection includes every write so far
+    logger.warning(f"Academic summary updates kept conflicting, rebuilding {len(pending)} students")
+    for student_id in pending:
+        await rebuild_academic_summaries(db, student_id)
+
+
+async def _try_update_summaries(db, pending: dict) -> dict:
+    """One attempt of _update_summaries; returns the students whose write conflicted"""
+    student_ids = list(pending)
+    cursor = db.academic_summaries.find({"student_id": {"$in": student_ids}}, {"_id": 0})
+    current = {s["student_id"]: s for s in await cursor.to_list(length=None)}
+
+    # Students without a summary yet may have older results - build theirs in full
+    missing = [sid for sid in student_ids if sid not in current]
+    semesters_by_student = await _load_semesters(db, {"student_id": {"$in": missing}}) if missing else {}
+
+    operations = []
+    written = {}
+    for student_id, docs in pending.items():
+        summary = current.get(student_id)
+        if summary is None:
+            summary = summarize(student_id, semesters_by_student.get(student_id, []))
+            operations.append(InsertOne(summary))
+        elif docs:
+            read_revision = summary.get("revision")
+            for result_doc in docs:
+                summary = apply_result(student_id, summary, result_doc)
+            operations.append(ReplaceOne({"student_id": student_id, "revision": read_revision}, summary))
+        else:
+            continue
+        written[student_id] = summary["revision"]
+
+    applied = 0
+    for start in range(0, len(operations), BULK_WRITE_BATCH_SIZE):
+        try:
+            outcome = await db.academic_summaries.bulk_write(operations[start:start + BULK_WRITE_BATCH_SIZE], ordered=False)
+            applied += outcome.inserted_count + outcome.matched_count
+        except BulkWriteError as e:
+            # Duplicate keys: another writer created the summary first
+            applied += e.details.get("nInserted", 0) + e.details.get("nMatched", 0)
+    if applied == len(operations):
+        return {}
+
+    # Find out which writes lost: their summary holds someone else's revision
+    cursor = db.academic_summaries.find({"student_id": {"$in": list(written)}}, {"_id": 0, "student_id": 1, "revision": 1})
+    stored = {s["student_id"]: s.get("revision") for s in await cursor.to_list(length=None)}
+    return {sid: pending[sid] for sid, revision in written.items() if stored.get(sid) != revision}
+
+
+async def _load_semesters(db, query: dict) -> dict:
+    """Read semester entries straight from the results collection, grouped by student"""
+    projection = {"student_id": 1, "semester": 1, "academic_year": 1, "sgpa": 1, "subjects.credits": 1}
+
+    semesters_by_student: dict = {}
+    async for result_doc in db.results.find(query, projection):
+        entries = semesters_by_student.setdefault(result_doc["student_id"], [])
+        entry = semester_entry(result_doc)
+        if entry:
+            entries.append(entry)
+    return semesters_by_student
+
+
+async def _write_summaries(db, summaries: Iterable[dict]):
+    batch = []
+    for summary in summaries:
+        batch.append(ReplaceOne({"student_id": summary["student_id"]}, summary, upsert=True))
+        if len(batch) >= BULK_WRITE_BATCH_SIZE:
+            await db.academic_summaries.bulk_write(batch, ordered=False)
+            batch = []
+    if batch:
+        await db.academic_summaries.bulk_write(batch, ordered=False)
+
+
+async def rebuild_academic_summaries(db, student_id: Optional[str] = None) -> int:
+    """
+    Recompute summaries from the results collection (for backfills), returning how many were written.
+
+    Rebuilds every student when student_id is None.
+    """
+    query = {} if student_id is None else {"student_id": student_id}
+    semesters_by_student = await _load_semesters(db, query)
+
+    summaries = [summarize(sid, entries) for sid, entries in semesters_by_student.items()]
+    await _write_summaries(db, summaries)
+    return len(summaries)
+
+
+def summary_response(student_id: str, summary: Optional[dict]) -> dict:
+    """Shape a stored summary for the CGPA endpoint"""
+    if not summary:
+        return {
+            "student_id": student_id,
+            "cgpa": None,
+            "total_credits": 0,
+            "total_semesters": 0,
+            "semesters": []
+        }
+    return {
+        "student_id": student_id,
+        "cgpa": summary["cgpa"],
+        "total_credits": summary["total_credits"],
+        "total_semesters": summary["total_semesters"],
+        "semesters": summary["semesters"]
+    }
@@ -0,0 +1,252 @@
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import List, Optional
+from jose import JWTError, jwt
+from pymongo import ReturnDocument
+from app.config import settings
+from app.database import get_database
+
+logger = logging.getLogger(__name__)
+
+# Probes and metrics scraping must keep working while the API sheds load, and
+# event streams stay open indefinitely, so they would pin a read slot each
+EXEMPT_PATHS = ("/health", "/ready", "/metrics", "/api/events/stream")
+
+# Idle buckets are pruned once the memory backend tracks this many users
+MAX_TRACKED_KEYS = 100_000
+
+
+def route_class(scope: dict) -> str:
+    """Concurrency class of a request: reads, writes or uploads (multipart bodies)"""
+    if scope["method"] in ("GET", "HEAD"):
+        return "reads"
+    for name, value in scope["headers"]:
+        if name == b"content-type":
+            return "uploads" if value.startswith(b"multipart/form-data") else "writes"
+    return "writes"
+
+
+def token_claims(scope: dict) -> Optional[dict]:
+    """Claims of the request's bearer token (signature checked, user not looked up)"""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+            except JWTError:
+                return None
+    return None
+
+
+class MemoryRateLimitBackend:
+    """Token buckets in this worker's memory (each worker allows the full rate)"""
+
+    def __init__(self):
+        self._buckets: dict = {}
+
+    def _prune(self, now: float, rate: float, burst: int):
+        # Drop buckets that have refilled completely; they behave like new ones
+        full_after = burst / rate
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if now - bucket[1] < full_after}
+
+    async def hit(self, key: str, rate: float, burst: int) -> float:
+        """Take a token; returns 0 when allowed, otherwise the seconds until one is available"""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= MAX_TRACKED_KEYS:
+                self._prune(now, rate, burst)
+            bucket = self._buckets[key] = [float(burst), now]
+
+        tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / rate
+
+
+class MongoRateLimitBackend:
+    """
+    Limits shared by every worker, counted in the rate_limits collection.
+
+    Mongo cannot refill a bucket atomically in one round trip, so this uses fixed
+    windows of burst / rate seconds allowing `burst` requests each: the same
+    average rate, with up to twice the burst across a window boundary. Expired
+    windows are removed by a TTL index. If Mongo errors the request is allowed.
+    """
+
+    async def hit(self, key: str, rate: float, burst: int) -> float:
+        window = burst / rate
+        now = time.time()
+        start = math.floor(now / window) * window
+        try:
+            doc = await get_database().rate_limits.find_one_and_update(
+                {"_id": f"{key}:{int(start)}"},
+                {
+                    "$inc": {"count": 1},
+                    "$setOnInsert": {"expires_at": datetime.utcfromtimestamp(start) + timedelta(seconds=window * 2)}
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except Exception as e:
+            logger.error(f"Rate limit backend error, allowing request: {e}")
+            return 0.0
+        return 0.0 if doc["count"] <= burst else start + window - now
+
+
+RATE_LIMIT_BACKENDS = {
+    "memory": MemoryRateLimitBackend,
+    "mongo": MongoRateLimitBackend,
+}
+
+
+class ConcurrencyLimiter:
+    """
+    Cap on requests of one class running at once in this worker.
+
+    Requests over the limit wait in FIFO order for up to the queue timeout; when
+    the queue is full or the wait times out, acquire returns False.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self.rejected = {"queue_full": 0, "queue_timeout": 0}
+        self._waiters: deque = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float) -> bool:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.rejected["queue_full"] += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # A slot was handed over just as the deadline passed
+                return True
+            self._waiters.remove(waiter)
+            self.rejected["queue_timeout"] += 1
+            return False
+        except asyncio.CancelledError:
+            if waiter.done():
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+        return True
+
+    def release(self):
+        # Hand the slot straight to the oldest waiter, so newcomers cannot overtake the queue
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionController:
+    """Per-user token buckets plus per-class concurrency limits"""
+
+    def __init__(self):
+        self.backend = RATE_LIMIT_BACKENDS[settings.RATE_LIMIT_BACKEND]()
+        self.limiters = {
+            "reads": ConcurrencyLimiter("reads", settings.MAX_CONCURRENT_READS, settings.ADMISSION_MAX_QUEUE),
+            "writes": ConcurrencyLimiter("writes", settings.MAX_CONCURRENT_WRITES, settings.ADMISSION_MAX_QUEUE),
+            "uploads": ConcurrencyLimiter("uploads", settings.MAX_CONCURRENT_UPLOADS, settings.ADMISSION_MAX_QUEUE),
+        }
+        self.rate_limited = 0
+
+    async def rate_limit_wait(self, scope: dict) -> float:
+        """Seconds the caller must wait before its next request (0 = allowed)"""
+        if settings.RATE_LIMIT_PER_SECOND <= 0:
+            return 0.0
+        claims = token_claims(scope)
+        # Unauthenticated requests are rejected by the routes; admins run imports and are not limited
+        if not claims or not claims.get("sub") or claims.get("role") == "admin":
+            return 0.0
+        wait = await self.backend.hit(f"user:{claims['sub']}", settings.RATE_LIMIT_PER_SECOND, settings.RATE_LIMIT_BURST)
+        if wait > 0:
+            self.rate_limited += 1
+        return wait
+
+    def render(self, lines: List[str]):
+        lines.append("# HELP unipulse_admission_active_requests Requests running, by route class")
+        lines.append("# TYPE unipulse_admission_active_requests gauge")
+        for limiter in self.limiters.values():
+            lines.append(f'unipulse_admission_active_requests{{class="{limiter.name}"}} {limiter.active}')
+        lines.append("# HELP unipulse_admission_queued_requests Requests waiting for a slot, by route class")
+        lines.append("# TYPE unipulse_admission_queued_requests gauge")
+        for limiter in self.limiters.values():
+            lines.append(f'unipulse_admission_queued_requests{{class="{limiter.name}"}} {limiter.queued}')
+        lines.append("# HELP unipulse_admission_rejected_total Requests shed, by route class and reason")
+        lines.append("# TYPE unipulse_admission_rejected_total counter")
+        for limiter in self.limiters.values():
+            for reason, count in limiter.rejected.items():
+                lines.append(f'unipulse_admission_rejected_total{{class="{limiter.name}",reason="{reason}"}} {count}')
+        lines.append(f'unipulse_admission_rejected_total{{class="all",reason="rate_limited"}} {self.rate_limited}')
+
+
+admission = AdmissionController()
+
+
+async def _reject(send, status: int, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    """Shed load before it reaches the routes: 429 over a user's rate, 503 when a route class is saturated"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        wait = await admission.rate_limit_wait(scope)
+        if wait > 0:
+            await _reject(send, 429, "Too many requests", wait)
+            return
+
+        limiter = admission.limiters[route_class(scope)]
+        if not await limiter.acquire(settings.ADMISSION_QUEUE_TIMEOUT_SECONDS):
+            await _reject(send, 503, "Server is busy, try again shortly", settings.ADMISSION_RETRY_AFTER_SECONDS)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
@@ -0,0 +1,25 @@
+from typing import Iterable, List
+
+
+def compute_subject_stats(records: Iterable[dict]) -> List[dict]:
+    """Count classes, presences and absences per subject (in order of first appearance)"""
+    counts: dict = {}
+    for record in records:
+        subject_counts = counts.get(record["subject"])
+        if subject_counts is None:
+            subject_counts = counts[record["subject"]] = [0, 0]
+        subject_counts[0] += 1
+        if record["status"] == "present":
+            subject_counts[1] += 1
+
+    result = []
+    for subject, (total, present) in counts.items():
+        percentage = (present / total * 100) if total > 0 else 0.0
+        result.append({
+            "subject": subject,
+            "total_classes": total,
+            "present": present,
+            "absent": total - present,
+            "percentage": round(percentage, 2)
+        })
+    return result
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+from typing import List, Optional, Set
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from app.config import settings
+from app.database import get_database
+
+logger = logging.getLogger(__name__)
+
+# Items are (record_doc, future resolved with the inserted _id)
+_pending: List[tuple] = []
+_deadline: Optional[asyncio.TimerHandle] = None
+_inflight: Set[asyncio.Task] = set()
+_running = False
+
+stats = {"batches": 0, "records": 0}
+
+# Duplicates are only caught by this unique index, so the buffer is not used without it
+UNIQUE_FIELDS = {"student_id", "subject", "date"}
+
+
+async def _write(batch: List[tuple]):
+    docs = [doc for doc, _ in batch]
+    errors = {}
+    try:
+        await get_database().attendance.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        # Unordered: only the records listed in writeErrors failed
+        errors = {error["index"]: error for error in e.details["writeErrors"]}
+    except Exception as e:
+        logger.error(f"Attendance batch of {len(batch)} failed: {e}")
+        errors = {index: e for index in range(len(batch))}
+
+    stats["batches"] += 1
+    stats["records"] += len(batch)
+    for index, (doc, future) in enumerate(batch):
+        if future.done():
+            # The caller went away; the record is written regardless
+            continue
+        error = errors.get(index)
+        if error is None:
+            future.set_result(doc["_id"])
+        elif isinstance(error, Exception):
+            future.set_exception(error)
+        elif error["code"] == 11000:
+            # The unique (student_id, subject, date) index caught a duplicate, in the database or earlier in this batch
+            future.set_exception(DuplicateKeyError(error["errmsg"], 11000))
+        else:
+            future.set_exception(OperationFailure(error["errmsg"], error["code"]))
+
+
+def _flush():
+    global _pending, _deadline
+    if _deadline is not None:
+        _deadline.cancel()
+        _deadline = None
+    if not _pending:
+        return
+    batch, _pending = _pending, []
+    task = asyncio.create_task(_write(batch))
+    _inflight.add(task)
+    task.add_done_callback(_inflight.discard)
+
+
+async def insert_attendance(record_doc: dict) -> ObjectId:
+    """
+    Insert an attendance record through the write-behind buffer.
+
+    Records are collected for up to ATTENDANCE_BATCH_WINDOW_MS (or until
+    ATTENDANCE_BATCH_SIZE are waiting) and written with one unordered
+    insert_many. Raises DuplicateKeyError if the record already exists.
+    """
+    global _deadline
+    if not _running:
+        # No buffer (e.g. scripts, or during shutdown) - insert inline
+        result = await get_database().attendance.insert_one(record_doc)
+        return result.inserted_id
+
+    future = asyncio.get_running_loop().create_future()
+    _pending.append((record_doc, future))
+    if len(_pending) >= settings.ATTENDANCE_BATCH_SIZE:
+        _flush()
+    elif _deadline is None:
+        _deadline = asyncio.get_running_loop().call_later(settings.ATTENDANCE_BATCH_WINDOW_MS / 1000, _flush)
+    return await future
+
+
+def write_behind_active() -> bool:
+    """Whether inserts go through the buffer (otherwise callers check for duplicates themselves)"""
+    return _running
+
+
+async def _has_unique_index(db) -> bool:
+    indexes = await db.attendance.index_information()
+    return any(
+        index.get("unique") and {field for field, _ in index["key"]} == UNIQUE_FIELDS
+        for index in indexes.values()
+    )
+
+
+async def start_attendance_writer(db):
+    """Start buffering attendance inserts (if enabled and the unique index exists)"""
+    global _running
+    if not settings.ATTENDANCE_WRITE_BEHIND:
+        return
+    try:
+        has_index = await _has_unique_index(db)
+    except Exception as e:
+        logger.error(f"Could not check attendance indexes, write-behind disabled: {e}")
+        return
+    if not has_index:
+        # e.g. index creation failed on existing duplicates, or ENSURE_INDEXES_ON_STARTUP is off
+        logger.error("Unique attendance index (student_id, subject, date) is missing, write-behind disabled")
+        return
+    _running = True
+
+
+async def stop_attendance_writer(timeout: float = 10.0):
+    """Write out buffered records and wait for batches in flight"""
+    global _running
+    if not _running:
+        return
+    _running = False
+    _flush()
+    if _inflight:
+        done, pending = await asyncio.wait(set(_inflight), timeout=timeout)
+        if pending:
+            logger.warning(f"{len(pending)} attendance batches still in flight at shutdown")
+
+
+def render_attendance_writer(lines: List[str]):
+    """Export batches written and records they carried (records / batches = average batch size)"""
+    lines.append("# HELP unipulse_attendance_write_batches_total insert_many calls made by the write-behind buffer")
+    lines.append("# TYPE unipulse_attendance_write_batches_total counter")
+    lines.append(f"unipulse_attendance_write_batches_total {stats['batches']}")
+    lines.append("# HELP unipulse_attendance_write_records_total Attendance records written by the write-behind buffer")
+    lines.append("# TYPE unipulse_attendance_write_records_total counter")
+    lines.append(f"unipulse_attendance_write_records_total {stats['records']}")
@@ -0,0 +1,22 @@
+from typing import Any, Hashable, Optional
+
+
+class InvalidatingCache:
+    """In-process cache whose entries live until the write path invalidates them"""
+
+    def __init__(self):
+        self._entries: dict = {}
+
+    def get(self, key: Hashable = None) -> Optional[Any]:
+        return self._entries.get(key)
+
+    def set(self, key: Hashable, value: Any) -> Any:
+        self._entries[key] = value
+        return value
+
+    def invalidate(self, key: Hashable = None):
+        """Drop one entry (or everything when no key is given)"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
@@ -1,4 +1,3 @@
-import pandas as pd
 from typing import List
 from datetime import datetime
 from fastapi import HTTPException
@@ -7,6 +6,9 @@ from app.models.attendance import AttendanceCreate
 
 def parse_attendance_csv(file_content: bytes) -> List[AttendanceCreate]:
     """Parse CSV file containing attendance records"""
+    # Imported on first use to keep pandas out of worker startup
+    import pandas as pd
+    
     try:
         # Read CSV
         df = pd.read_csv(pd.io.common.BytesIO(file_content))
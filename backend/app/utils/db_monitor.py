@@ -0,0 +1,160 @@
+import bisect
+import json
+import logging
+import threading
+from collections import deque
+from typing import Optional
+from pymongo import monitoring
+from app.config import settings
+from app.utils.request_context import current_route
+
+slow_query_logger = logging.getLogger("app.slow_queries")
+
+# Upper bounds (ms) of the per-route DB time histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Commands whose first field names the collection
+_COLLECTION_COMMANDS = {
+    "find", "insert", "update", "delete", "aggregate", "count",
+    "distinct", "findAndModify", "createIndexes", "listIndexes"
+}
+
+
+def _collection_of(command_name: str, command: dict) -> Optional[str]:
+    if command_name in _COLLECTION_COMMANDS:
+        value = command.get(command_name)
+        return value if isinstance(value, str) else None
+    if command_name == "getMore":
+        return command.get("collection")
+    return None
+
+
+def _filter_of(command_name: str, command: dict):
+    if command_name in ("find", "count", "distinct"):
+        return command.get("filter") or command.get("query")
+    if command_name == "findAndModify":
+        return command.get("query")
+    if command_name in ("update", "delete"):
+        statements = command.get("updates") or command.get("deletes") or []
+        return statements[0].get("q") if statements else None
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or []
+        return pipeline[0] if pipeline else None
+    return None
+
+
+def filter_shape(value):
+    """Replace literal values in a filter with "?" so queries group by shape"""
+    if isinstance(value, dict):
+        return {key: filter_shape(v) for key, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [filter_shape(v) for v in value[:3]]
+    return "?"
+
+
+def _documents_returned(reply: dict) -> int:
+    cursor = reply.get("cursor")
+    if cursor:
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+    if "values" in reply:
+        return len(reply["values"])
+    return reply.get("n", 0)
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Record per-route Mongo command latency and log slow commands"""
+
+    def __init__(self, slow_query_ms: float = None, keep_slow_queries: int = 100):
+        self.slow_query_ms = settings.SLOW_QUERY_MS if slow_query_ms is None else slow_query_ms
+        self.slow_queries = deque(maxlen=keep_slow_queries)
+        self._pending: dict = {}
+        self._routes: dict = {}
+        self._commands: dict = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        # Runs on the executor thread with the request's context copied in
+        self._pending[(event.connection_id, event.request_id)] = (
+            current_route(),
+            _collection_of(event.command_name, event.command),
+            event.command
+        )
+
+    def succeeded(self, event):
+        self._finish(event, _documents_returned(event.reply))
+
+    def failed(self, event):
+        self._finish(event, 0)
+
+    def _finish(self, event, documents: int):
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        route, collection, command = pending
+        duration_ms = event.duration_micros / 1000
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, duration_ms)
+
+        with self._lock:
+            route_stats = self._routes.get(route)
+            if route_stats is None:
+                route_stats = self._routes[route] = {
+                    "count": 0, "total_ms": 0.0, "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1)
+                }
+            route_stats["count"] += 1
+            route_stats["total_ms"] += duration_ms
+            route_stats["buckets"][bucket] += 1
+
+            key = (route, event.command_name, collection)
+            command_stats = self._commands.get(key)
+            if command_stats is None:
+                command_stats = self._commands[key] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "documents": 0}
+            command_stats["count"] += 1
+            command_stats["total_ms"] += duration_ms
+            command_stats["max_ms"] = max(command_stats["max_ms"], duration_ms)
+            command_stats["documents"] += documents
+
+        if duration_ms >= self.slow_query_ms:
+            entry = {
+                "route": route,
+                "command": event.command_name,
+                "collection": collection,
+                "duration_ms": round(duration_ms, 2),
+                "documents": documents,
+                "filter_shape": filter_shape(_filter_of(event.command_name, command))
+            }
+            self.slow_queries.append(entry)
+            slow_query_logger.warning(json.dumps(entry, default=str))
+
+    def snapshot(self) -> dict:
+        """Export per-route DB time histograms, per-command totals and recent slow queries"""
+        with self._lock:
+            routes = {
+                route: {
+                    "count": s["count"],
+                    "total_ms": round(s["total_ms"], 2),
+                    "buckets": dict(zip([*map(str, LATENCY_BUCKETS_MS), "+Inf"], s["buckets"]))
+                }
+                for route, s in self._routes.items()
+            }
+            commands = [
+                {"route": route, "command": name, "collection": collection, **{
+                    k: round(v, 2) if isinstance(v, float) else v for k, v in s.items()
+                }}
+                for (route, name, collection), s in self._commands.items()
+            ]
+        return {
+            "slow_query_ms": self.slow_query_ms,
+            "routes": routes,
+            "commands": sorted(commands, key=lambda c: c["total_ms"], reverse=True),
+            "slow_queries": list(self.slow_queries)
+        }
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self._commands.clear()
+            self.slow_queries.clear()
+
+
+# Attached to the Motor client only when DB_MONITORING_ENABLED is set
+command_monitor = CommandMonitor()
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from typing import List, Optional
+from app.config import settings
+from app.utils.file_upload import (
+    s3_key_from_url,
+    local_path_from_url,
+    delete_s3_objects,
+    delete_local_files
+)
+
+logger = logging.getLogger(__name__)
+
+# Items are (file_url, attempt)
+_queue: Optional[asyncio.Queue] = None
+_worker: Optional[asyncio.Task] = None
+# Backoff timers of failed deletes: file_url -> (timer handle, attempt)
+_retries: dict = {}
+_stopping = False
+
+BATCH_SIZE = 1000
+
+
+async def delete_files(file_urls: List[str]) -> List[str]:
+    """Delete stored files in batches, returning the URLs that could not be deleted"""
+    s3_keys = {}
+    local_paths = {}
+    for file_url in file_urls:
+        key = s3_key_from_url(file_url)
+        if key:
+            s3_keys[key] = file_url
+            continue
+        path = local_path_from_url(file_url)
+        if path:
+            local_paths[path] = file_url
+
+    failed = []
+    if s3_keys:
+        failed_keys = await asyncio.to_thread(delete_s3_objects, list(s3_keys))
+        failed.extend(s3_keys[key] for key in failed_keys)
+    if local_paths:
+        failed_paths = await asyncio.to_thread(delete_local_files, list(local_paths))
+        failed.extend(local_paths[path] for path in failed_paths)
+    return failed
+
+
+async def delete_file(file_url: Optional[str]):
+    """Schedule a file for deletion from storage"""
+    if not file_url:
+        return
+    if _queue is None:
+        # No background worker (e.g. scripts) - delete inline
+        await delete_files([file_url])
+        return
+    _queue.put_nowait((file_url, 0))
+
+
+async def _process_batch(batch: List[tuple]):
+    attempts = dict(batch)
+    failed = await delete_files(list(attempts))
+
+    loop = asyncio.get_running_loop()
+    for file_url in failed:
+        attempt = attempts[file_url] + 1
+        if attempt > settings.DELETE_MAX_RETRIES or _stopping:
+            # Unreferenced, so collect_orphan_files.py removes it later
+            logger.error(f"Giving up deleting {file_url} after {attempt} attempts")
+            continue
+        # Exponential backoff: 1s, 2s, 4s, ...
+        handle = loop.call_later(2 ** (attempt - 1), _retry, file_url, attempt)
+        _retries[file_url] = (handle, attempt)
+
+
+def _retry(file_url: str, attempt: int):
+    _retries.pop(file_url, None)
+    _queue.put_nowait((file_url, attempt))
+
+
+async def _run_worker():
+    while True:
+        batch = [await _queue.get()]
+        try:
+            # Let deletes pile up briefly so they share one request
+            await asyncio.sleep(settings.DELETE_BATCH_WINDOW_SECONDS)
+            while len(batch) < BATCH_SIZE and not _queue.empty():
+                batch.append(_queue.get_nowait())
+            await _process_batch(batch)
+        except Exception as e:
+            logger.error(f"Error deleting files: {e}")
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def start_delete_worker():
+    """Start the background file deletion worker"""
+    global _queue, _worker, _stopping
+    _queue = asyncio.Queue()
+    _worker = asyncio.create_task(_run_worker())
+    _stopping = False
+
+
+async def stop_delete_worker(timeout: float = 10.0):
+    """Flush pending deletes, retrying the ones waiting out a backoff now (once), and stop the worker"""
+    global _queue, _worker, _stopping
+    if _worker is None:
+        return
+    _stopping = True
+    for file_url, (handle, attempt) in list(_retries.items()):
+        handle.cancel()
+        _queue.put_nowait((file_url, attempt))
+    _retries.clear()
+    try:
+        await asyncio.wait_for(_queue.join(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"{_queue.qsize()} file deletes still pending at shutdown, "
+            "collect_orphan_files.py will remove them"
+        )
+    _worker.cancel()
+    _queue = None
+    _worker = None
@@ -0,0 +1,257 @@
+import asyncio
+import logging
+import uuid
+from typing import Iterable, List, Optional
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid, OperationFailure, PyMongoError
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Event types, named after the collections whose writes produce them
+ATTENDANCE = "attendance"
+RESULTS = "results"
+TIMETABLE = "timetable"
+
+# Writes the change stream forwards; only the fields needed to route an event are kept
+_CHANGE_PIPELINE = [
+    {"$match": {
+        "operationType": {"$in": ["insert", "update", "replace"]},
+        "ns.coll": {"$in": [ATTENDANCE, RESULTS, TIMETABLE]}
+    }},
+    {"$project": {"operationType": 1, "ns.coll": 1, "fullDocument.student_id": 1}},
+]
+
+# ChangeStreamFatalError, ChangeStreamHistoryLost: the resume token can never be used again
+_NON_RESUMABLE_CODES = (280, 286)
+
+# Capped collection the workers share events through when change streams are unavailable
+FEED_COLLECTION = "events"
+# Student IDs per feed document (a bulk publish of a whole cohort is split up)
+FEED_CHUNK_SIZE = 1000
+
+
+class Subscription:
+    """
+    One connected client's pending notifications.
+
+    Repeated notifications are coalesced (a bulk upload touching a student 30
+    times is one "attendance" event), so an idle connection costs one small
+    object and a slow client buffers at most one entry per (type, student).
+    """
+
+    __slots__ = ("student_id", "owner", "pending", "wake")
+
+    def __init__(self, student_id: Optional[str], owner: str):
+        self.student_id = student_id
+        self.owner = owner
+        self.pending: dict = {}
+        self.wake = asyncio.Event()
+
+    def notify(self, event_type: str, student_id: Optional[str]):
+        self.pending[(event_type, student_id)] = None
+        self.wake.set()
+
+    async def next(self, timeout: float) -> dict:
+        """Wait for notifications (empty after the timeout, for heartbeats)"""
+        if not self.pending:
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self.wake.clear()
+        pending, self.pending = self.pending, {}
+        return pending
+
+
+class EventBroker:
+    """
+    Per-student notifications of new results, attendance and timetables.
+
+    With a replica set, every worker tails a Mongo change stream, so a write made
+    by any worker (or by a script) reaches clients connected to all of them.
+    Without one (a standalone mongod), the write routes publish in-process and
+    also append the event to a small capped collection that every worker tails,
+    so clients connected to the other workers are notified too.
+    """
+
+    def __init__(self):
+        self.change_streams = False
+        self.feed = False
+        self.published = 0
+        self.connections = 0
+        self._by_student: dict = {}
+        self._everyone: set = set()
+        self._by_owner: dict = {}
+        self._task: Optional[asyncio.Task] = None
+        self._db = None
+        # Tells this worker's own feed entries apart (they were dispatched when published)
+        self._origin = uuid.uuid4().hex
+        self._pending_writes: set = set()
+
+    def connections_of(self, owner: str) -> int:
+        """Open streams of one user in this worker"""
+        return self._by_owner.get(owner, 0)
+
+    def subscribe(self, student_id: Optional[str], owner: str) -> Subscription:
+        """Subscribe `owner` to one student's events, or to all events when student_id is None (admins)"""
+        subscription = Subscription(student_id, owner)
+        self.connections += 1
+        self._by_owner[owner] = self._by_owner.get(owner, 0) + 1
+        if student_id is None:
+            self._everyone.add(subscription)
+        else:
+            self._by_student.setdefault(student_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.connections -= 1
+        remaining = self._by_owner.pop(subscription.owner) - 1
+        if remaining:
+            self._by_owner[subscription.owner] = remaining
+        if subscription.student_id is None:
+            self._everyone.discard(subscription)
+            return
+        subs = self._by_student.get(subscription.student_id)
+        if subs is not None:
+            subs.discard(subscription)
+            if not subs:
+                del self._by_student[subscription.student_id]
+
+    def _dispatch(self, event_type: str, student_ids: Iterable[Optional[str]]):
+        for student_id in set(student_ids):
+            self.published += 1
+            if student_id is None:
+                # Common timetable: everyone's week changed
+                targets = [sub for subs in self._by_student.values() for sub in subs]
+            else:
+                targets = self._by_student.get(student_id, ())
+            for subscription in targets:
+                subscription.notify(event_type, student_id)
+            for subscription in self._everyone:
+                subscription.notify(event_type, student_id)
+
+    def publish(self, event_type: str, student_ids: Iterable[Optional[str]]):
+        """Notify after a write (a no-op when the change stream delivers it instead)"""
+        if self.change_streams:
+            return
+        student_ids = list(set(student_ids))
+        self._dispatch(event_type, student_ids)
+        if self.feed and student_ids:
+            task = asyncio.create_task(self._append_feed(event_type, student_ids))
+            self._pending_writes.add(task)
+            task.add_done_callback(self._pending_writes.discard)
+
+    async def _append_feed(self, event_type: str, student_ids: List[Optional[str]]):
+        try:
+            await self._db[FEED_COLLECTION].insert_many([
+                {"type": event_type, "student_ids": student_ids[i:i + FEED_CHUNK_SIZE], "origin": self._origin}
+                for i in range(0, len(student_ids), FEED_CHUNK_SIZE)
+            ])
+        except Exception as e:
+            logger.error(f"Error sharing {event_type} event with other workers: {e}")
+
+    async def _start_feed(self, db) -> bool:
+        """Create the capped feed collection if needed and start sharing events through it"""
+        try:
+            await db.create_collection(FEED_COLLECTION, capped=True, size=settings.EVENTS_FEED_SIZE_BYTES)
+        except CollectionInvalid:
+            pass  # Created by another worker
+        except PyMongoError as e:
+            logger.error(f"Could not create the event feed, events stay in-process: {e}")
+            return False
+        try:
+            capped = (await db[FEED_COLLECTION].options()).get("capped")
+        except PyMongoError as e:
+            logger.error(f"Could not check the event feed, events stay in-process: {e}")
+            return False
+        if not capped:
+            logger.error(f"'{FEED_COLLECTION}' is not a capped collection, events stay in-process")
+            return False
+        self._db = db
+        self.feed = True
+        return True
+
+    async def _tail_feed(self, db):
+        # Only entries written after this worker started
+        newest = await db[FEED_COLLECTION].find({}, {"_id": 1}).sort("$natural", -1).limit(1).to_list(length=1)
+        last_id = newest[0]["_id"] if newest else None
+        while True:
+            try:
+                # Entries come in insertion order; the _id filter only matters when reopening
+                query = {"_id": {"$gt": last_id}} if last_id else {}
+                cursor = db[FEED_COLLECTION].find(query, cursor_type=CursorType.TAILABLE_AWAIT)
+                while cursor.alive:
+                    async for entry in cursor:
+                        last_id = entry["_id"]
+                        if entry.get("origin") != self._origin:
+                            self._dispatch(entry["type"], entry["student_ids"])
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError as e:
+                logger.error(f"Event feed error, reopening: {e}")
+            # A tailable cursor on an empty collection dies at once; wait for the first entry
+            await asyncio.sleep(1)
+
+    async def _watch(self, db):
+        resume_token = None
+        while True:
+            try:
+                async with db.watch(_CHANGE_PIPELINE, full_document="updateLookup", resume_after=resume_token) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        document = change.get("fullDocument") or {}
+                        self._dispatch(change["ns"]["coll"], [document.get("student_id")])
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError as e:
+                if isinstance(e, OperationFailure) and (
+                    e.has_error_label("NonResumableChangeStreamError") or e.code in _NON_RESUMABLE_CODES
+                ):
+                    # Changes since the token are lost either way; start from now
+                    logger.error(f"Change stream cannot resume, reopening from now: {e}")
+                    resume_token = None
+                else:
+                    logger.error(f"Change stream error, reopening: {e}")
+                await asyncio.sleep(1)
+            except Exception:
+                # Without the stream the write routes must publish again
+                logger.exception("Change stream watcher failed, falling back to the event feed")
+                self.change_streams = False
+                if settings.EVENTS_FEED and await self._start_feed(db):
+                    await self._tail_feed(db)
+                return
+
+    async def start(self, db):
+        """Tail the change stream when the deployment supports it, otherwise the capped event feed"""
+        if settings.EVENTS_CHANGE_STREAMS:
+            try:
+                hello = await db.client.admin.command("hello")
+            except PyMongoError as e:
+                logger.error(f"Could not check for change stream support: {e}")
+                hello = {}
+            # Change streams need a replica set or a sharded cluster (mongos)
+            if "setName" in hello or hello.get("msg") == "isdbgrid":
+                self.change_streams = True
+                self._task = asyncio.create_task(self._watch(db))
+                return
+        if settings.EVENTS_FEED and await self._start_feed(db):
+            self._task = asyncio.create_task(self._tail_feed(db))
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self.change_streams = False
+        self.feed = False
+
+    def render(self, lines: List[str]):
+        lines.append("# HELP unipulse_event_stream_connections Open event stream connections")
+        lines.append("# TYPE unipulse_event_stream_connections gauge")
+        lines.append(f"unipulse_event_stream_connections {self.connections}")
+        lines.append("# HELP unipulse_events_published_total Notifications dispatched to this worker's clients")
+        lines.append("# TYPE unipulse_events_published_total counter")
+        lines.append(f"unipulse_events_published_total {self.published}")
+
+
+broker = EventBroker()
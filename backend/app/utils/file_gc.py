@@ -0,0 +1,91 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import List, Set
+from app.config import settings
+from app.database import get_database
+from app.utils.file_upload import s3_enabled, get_s3_client, delete_s3_objects, delete_local_files
+
+# Directories / key prefixes that hold uploaded files
+UPLOAD_SUBDIRECTORIES = ("pyq", "results")
+
+
+async def referenced_file_urls() -> Set[str]:
+    """Collect every file URL still referenced by PYQs or results"""
+    db = get_database()
+    pyq_urls, result_urls = await asyncio.gather(
+        db.pyq.distinct("file_url"),
+        db.results.distinct("file_url")
+    )
+    return {url for url in pyq_urls + result_urls if url}
+
+
+def _list_local_files(cutoff: float) -> List[tuple[str, str, int]]:
+    """List (url, path, size) of local uploads last modified before the cutoff"""
+    files = []
+    for subdirectory in UPLOAD_SUBDIRECTORIES:
+        directory = os.path.join(settings.UPLOAD_DIR, subdirectory)
+        if not os.path.isdir(directory):
+            continue
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                if stat.st_mtime < cutoff:
+                    files.append((f"/files/{subdirectory}/{entry.name}", entry.path, stat.st_size))
+    return files
+
+
+def _list_s3_files(cutoff: float) -> List[tuple[str, str, int]]:
+    """List (url, key, size) of S3 uploads last modified before the cutoff"""
+    files = []
+    paginator = get_s3_client().get_paginator("list_objects_v2")
+    base_url = f"https://{settings.S3_BUCKET_NAME}.s3.{settings.S3_REGION}.amazonaws.com"
+    for subdirectory in UPLOAD_SUBDIRECTORIES:
+        for page in paginator.paginate(Bucket=settings.S3_BUCKET_NAME, Prefix=f"{subdirectory}/"):
+            for obj in page.get("Contents", []):
+                if obj["LastModified"].timestamp() < cutoff:
+                    files.append((f"{base_url}/{obj['Key']}", obj["Key"], obj["Size"]))
+    return files
+
+
+async def collect_orphan_files(dry_run: bool = True, grace_seconds: int = None) -> dict:
+    """
+    Reconcile stored files against pyq.file_url / results.file_url and delete unreferenced ones.
+
+    Files younger than the grace period are skipped so uploads whose metadata
+    has not been written yet are never collected.
+    """
+    grace = settings.ORPHAN_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    cutoff = time.time() - grace
+
+    use_s3 = s3_enabled()
+    list_files = _list_s3_files if use_s3 else _list_local_files
+    stored, referenced = await asyncio.gather(
+        asyncio.to_thread(list_files, cutoff),
+        referenced_file_urls()
+    )
+
+    orphans = [(url, location, size) for url, location, size in stored if url not in referenced]
+    failed: List[str] = []
+    if orphans and not dry_run:
+        remove = delete_s3_objects if use_s3 else delete_local_files
+        failed = await asyncio.to_thread(remove, [location for _, location, _ in orphans])
+
+    failed_set = set(failed)
+    return {
+        "storage": "s3" if use_s3 else "local",
+        "dry_run": dry_run,
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+        "scanned": len(stored),
+        "orphaned": len(orphans),
+        "deleted": 0 if dry_run else len(orphans) - len(failed),
+        "bytes_reclaimed": 0 if dry_run else sum(
+            size for _, location, size in orphans if location not in failed_set
+        ),
+        "bytes_orphaned": sum(size for _, _, size in orphans),
+        "failed": failed,
+        "files": [url for url, _, _ in orphans]
+    }
@@ -1,20 +1,40 @@
 import os
 import uuid
-from typing import Optional
+import asyncio
+import threading
+from typing import Optional, List
 from fastapi import UploadFile, HTTPException
 from app.config import settings
-import boto3
-from botocore.exceptions import ClientError
-
-# Initialize S3 client if credentials are provided
-s3_client = None
-if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
-    s3_client = boto3.client(
-        's3',
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.S3_REGION
-    )
+
+# boto3/botocore are imported on first S3 use, so local-storage deployments never load them
+
+# Maximum keys per S3 DeleteObjects request
+S3_DELETE_BATCH_SIZE = 1000
+
+_s3_client = None
+_s3_client_pid = None
+_s3_client_lock = threading.Lock()
+
+
+def s3_enabled() -> bool:
+    """Whether uploads go to S3 (credentials and bucket configured)"""
+    return bool(settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY and settings.S3_BUCKET_NAME)
+
+
+def get_s3_client():
+    """S3 client of this process, created on first use (a client must not be shared by forked workers)"""
+    global _s3_client, _s3_client_pid
+    with _s3_client_lock:
+        if _s3_client is None or _s3_client_pid != os.getpid():
+            import boto3
+            _s3_client = boto3.client(
+                's3',
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                region_name=settings.S3_REGION
+            )
+            _s3_client_pid = os.getpid()
+        return _s3_client
 
 
 async def upload_file_to_local(file: UploadFile, subdirectory: str = "") -> tuple[str, str]:
@@ -45,7 +65,7 @@ async def upload_file_to_local(file: UploadFile, subdirectory: str = "") -> tupl
 
 async def upload_file_to_s3(file: UploadFile, subdirectory: str = "") -> tuple[str, str]:
     """Upload file to AWS S3"""
-    if not s3_client or not settings.S3_BUCKET_NAME:
+    if not s3_enabled():
         raise HTTPException(
             status_code=500,
             detail="S3 configuration not available. Using local storage."
@@ -65,8 +85,9 @@ async def upload_file_to_s3(file: UploadFile, subdirectory: str = "") -> tuple[s
         )
     
     # Upload to S3
+    from botocore.exceptions import ClientError
     try:
-        s3_client.put_object(
+        get_s3_client().put_object(
             Bucket=settings.S3_BUCKET_NAME,
             Key=s3_key,
             Body=content,
@@ -85,7 +106,7 @@ async def upload_file_to_s3(file: UploadFile, subdirectory: str = "") -> tuple[s
 
 async def upload_file(file: UploadFile, subdirectory: str = "") -> tuple[str, str]:
     """Upload file - uses S3 if configured, otherwise local storage"""
-    if s3_client and settings.S3_BUCKET_NAME:
+    if s3_enabled():
         return await upload_file_to_s3(file, subdirectory)
     else:
         file_path, original_name = await upload_file_to_local(file, subdirectory)
@@ -94,22 +115,107 @@ async def upload_file(file: UploadFile, subdirectory: str = "") -> tuple[str, st
         return file_url, original_name
 
 
-async def delete_file(file_url: str):
-    """Delete a file from storage"""
-    if file_url.startswith("http"):
-        # S3 file
-        if s3_client and settings.S3_BUCKET_NAME:
-            try:
-                # Extract key from URL
-                key = file_url.split(f"{settings.S3_BUCKET_NAME}.s3")[1].split("/", 1)[1]
-                s3_client.delete_object(Bucket=settings.S3_BUCKET_NAME, Key=key)
-            except Exception:
-                pass
-    else:
-        # Local file
-        if file_url.startswith("/files/"):
-            file_path = file_url.replace("/files/", "")
-            full_path = os.path.join(settings.UPLOAD_DIR, file_path)
-            if os.path.exists(full_path):
-                os.remove(full_path)
+def _write_local_content(content: bytes, filename: str, subdirectory: str = "") -> str:
+    """Write raw content to local storage and return its relative path"""
+    upload_path = os.path.join(settings.UPLOAD_DIR, subdirectory)
+    os.makedirs(upload_path, exist_ok=True)
+    
+    file_extension = os.path.splitext(filename)[1]
+    unique_filename = f"{uuid.uuid4()}{file_extension}"
+    with open(os.path.join(upload_path, unique_filename), "wb") as buffer:
+        buffer.write(content)
+    
+    return os.path.join(subdirectory, unique_filename) if subdirectory else unique_filename
+
+
+def _put_s3_content(content: bytes, filename: str, subdirectory: str, content_type: Optional[str]) -> str:
+    """Upload raw content to S3 and return its public URL"""
+    file_extension = os.path.splitext(filename)[1]
+    unique_filename = f"{uuid.uuid4()}{file_extension}"
+    s3_key = f"{subdirectory}/{unique_filename}" if subdirectory else unique_filename
+    
+    get_s3_client().put_object(
+        Bucket=settings.S3_BUCKET_NAME,
+        Key=s3_key,
+        Body=content,
+        ContentType=content_type or "application/octet-stream"
+    )
+    return f"https://{settings.S3_BUCKET_NAME}.s3.{settings.S3_REGION}.amazonaws.com/{s3_key}"
+
+
+async def upload_content(
+    content: bytes,
+    filename: str,
+    subdirectory: str = "",
+    content_type: Optional[str] = None
+) -> tuple[str, str]:
+    """Upload raw file content (e.g. extracted from an archive) without blocking the event loop"""
+    if len(content) > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File size exceeds {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB limit"
+        )
+    
+    if s3_enabled():
+        from botocore.exceptions import ClientError
+        try:
+            file_url = await asyncio.to_thread(_put_s3_content, content, filename, subdirectory, content_type)
+        except ClientError as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error uploading file to S3: {str(e)}"
+            )
+        return file_url, filename
+    
+    file_path = await asyncio.to_thread(_write_local_content, content, filename, subdirectory)
+    return f"/files/{file_path}", filename
+
+
+def s3_key_from_url(file_url: str) -> Optional[str]:
+    """Get the S3 key of an uploaded file URL (None for local files)"""
+    if not file_url.startswith("http") or not settings.S3_BUCKET_NAME:
+        return None
+    try:
+        return file_url.split(f"{settings.S3_BUCKET_NAME}.s3")[1].split("/", 1)[1]
+    except IndexError:
+        return None
+
+
+def local_path_from_url(file_url: str) -> Optional[str]:
+    """Get the local path of an uploaded file URL (None for S3 files)"""
+    if file_url.startswith("/files/"):
+        return os.path.join(settings.UPLOAD_DIR, file_url[len("/files/"):])
+    return None
+
+
+def delete_s3_objects(keys: List[str]) -> List[str]:
+    """Delete S3 objects with batched DeleteObjects calls (blocking), returning keys that failed"""
+    if not s3_enabled():
+        return list(keys)
+    from botocore.exceptions import ClientError, BotoCoreError
+    
+    failed = []
+    for i in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+        batch = keys[i:i + S3_DELETE_BATCH_SIZE]
+        try:
+            response = get_s3_client().delete_objects(
+                Bucket=settings.S3_BUCKET_NAME,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+            )
+            failed.extend(error["Key"] for error in response.get("Errors", []))
+        except (ClientError, BotoCoreError):
+            failed.extend(batch)
+    return failed
+
 
+def delete_local_files(paths: List[str]) -> List[str]:
+    """Delete local files (blocking), returning paths that failed"""
+    failed = []
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            failed.append(path)
+    return failed
@@ -0,0 +1,136 @@
+import io
+import json
+from itertools import groupby
+from typing import TYPE_CHECKING, List, Optional, Tuple
+from fastapi import HTTPException
+from app.config import settings
+
+# pandas/numpy are imported on first use to keep them out of worker startup
+if TYPE_CHECKING:
+    import pandas as pd
+
+GradeScale = List[Tuple[float, str, float]]
+
+
+def parse_grade_scale(grade_scale: Optional[str]) -> GradeScale:
+    """Parse a JSON grade scale ([[min_marks, grade, grade_points], ...]) or use the configured one"""
+    if not grade_scale:
+        return settings.GRADE_SCALE
+    try:
+        scale = [(float(m), str(g), float(p)) for m, g, p in json.loads(grade_scale)]
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid grade scale: {str(e)}")
+    if not scale:
+        raise HTTPException(status_code=400, detail="Grade scale is empty")
+    return scale
+
+
+def parse_marks_sheet(file_content: bytes, filename: str) -> "pd.DataFrame":
+    """Parse a long-format marks sheet (student_id, subject, marks, credits) from CSV or XLSX"""
+    import pandas as pd
+
+    # Read IDs as text so leading zeros survive and numeric-looking IDs stay IDs (not 1001.0)
+    dtype = {"student_id": str}
+    try:
+        if filename.lower().endswith(".xlsx"):
+            df = pd.read_excel(io.BytesIO(file_content), dtype=dtype)
+        else:
+            df = pd.read_csv(io.BytesIO(file_content), dtype=dtype)
+    except ImportError:
+        raise HTTPException(status_code=400, detail="Excel support is not installed, upload a CSV")
+    except pd.errors.EmptyDataError:
+        raise HTTPException(status_code=400, detail="Marks sheet is empty")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error parsing marks sheet: {str(e)}")
+
+    required_columns = ["student_id", "subject", "marks", "credits"]
+    missing_columns = [col for col in required_columns if col not in df.columns]
+    if missing_columns:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Missing required columns: {', '.join(missing_columns)}"
+        )
+
+    return df[required_columns]
+
+
+def compute_cohort_results(df: "pd.DataFrame", scale: GradeScale) -> Tuple[List[dict], List[dict]]:
+    """
+    Grade every row and compute each student's SGPA in one vectorized pass.
+
+    Returns one {student_id, subjects, sgpa} entry per student and the skipped
+    rows ({row, student_id, reason}, row numbers as in the sheet, header = 1).
+    Students with a skipped row get no SGPA, since it would leave out a subject.
+    """
+    import numpy as np
+    import pandas as pd
+
+    df = df.assign(
+        student_id=df["student_id"].fillna("").astype(str).str.strip(),
+        subject=df["subject"].fillna("").astype(str).str.strip(),
+        marks=pd.to_numeric(df["marks"], errors="coerce"),
+        credits=pd.to_numeric(df["credits"], errors="coerce")
+    )
+    # First failing check wins
+    checks = [
+        (df["student_id"] == "", "Missing student_id"),
+        (df["subject"] == "", "Missing subject"),
+        (df["marks"].isna(), "Missing or non-numeric marks"),
+        (df["credits"].isna(), "Missing or non-numeric credits"),
+        (df["credits"] < 0, "Negative credits"),
+    ]
+    reasons = pd.Series(np.select([mask for mask, _ in checks], [reason for _, reason in checks], default=""), index=df.index)
+    invalid = reasons != ""
+    incomplete_students = set(df.loc[invalid & (df["student_id"] != ""), "student_id"])
+
+    # Later rows win if a subject is listed twice for a student
+    valid = df[~invalid]
+    duplicates = valid.duplicated(subset=["student_id", "subject"], keep="last")
+    reasons[duplicates[duplicates].index] = "Duplicate subject, a later row was used"
+
+    skipped = [
+        {"row": int(index) + 2, "student_id": df.at[index, "student_id"] or None, "reason": reason}
+        for index, reason in reasons[reasons != ""].sort_index().items()
+    ]
+    df = valid[~duplicates]
+    if df.empty:
+        return [], skipped
+
+    # Map marks to grade / grade points: thresholds ascending, pick the highest one reached
+    scale = sorted(scale, key=lambda x: x[0])
+    thresholds = np.array([s[0] for s in scale])
+    grades = np.array([s[1] for s in scale], dtype=object)
+    points = np.array([s[2] for s in scale])
+    index = np.clip(np.searchsorted(thresholds, df["marks"].to_numpy(), side="right") - 1, 0, None)
+
+    df = df.assign(grade=grades[index], grade_points=points[index])
+    df = df.assign(weighted=df["grade_points"] * df["credits"])
+
+    # SGPA = sum(grade points x credits) / sum(credits), per student
+    totals = df.groupby("student_id", sort=True)[["weighted", "credits"]].sum()
+    sgpa = (totals["weighted"] / totals["credits"].where(totals["credits"] > 0)).round(2)
+    sgpa_by_student = {
+        sid: (None if pd.isna(v) or sid in incomplete_students else float(v))
+        for sid, v in sgpa.items()
+    }
+
+    # Nested subject lists for the result documents
+    df = df.sort_values("student_id", kind="stable")
+    rows = df[["student_id", "subject", "grade", "marks", "credits"]].to_dict("records")
+    cohort = []
+    for student_id, subject_rows in groupby(rows, key=lambda r: r["student_id"]):
+        cohort.append({
+            "student_id": student_id,
+            "subjects": [
+                {
+                    "subject": r["subject"],
+                    "grade": r["grade"],
+                    "marks": float(r["marks"]),
+                    "credits": float(r["credits"])
+                }
+                for r in subject_rows
+            ],
+            "sgpa": sgpa_by_student[student_id]
+        })
+
+    return cohort, skipped
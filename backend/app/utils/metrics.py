@@ -0,0 +1,241 @@
+import asyncio
+import bisect
+import logging
+import threading
+import time
+from typing import List, Optional
+from pymongo import monitoring
+from app.utils.request_context import route_path
+from app.utils.db_monitor import LATENCY_BUCKETS_MS
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the request latency histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _RouteStats:
+    __slots__ = ("buckets", "sum", "count", "statuses")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.statuses = {}
+
+
+class RequestMetrics:
+    """
+    Per-route request counters and latency histograms.
+
+    Only touched from the event loop thread, so no locking is needed; stats are
+    keyed by the endpoint object and method, and labels are built at export time.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self._routes: dict = {}
+        self._app = None
+
+    def observe(self, app, endpoint, method: str, status: int, duration: float):
+        self._app = app
+        by_method = self._routes.get(endpoint)
+        if by_method is None:
+            by_method = self._routes[endpoint] = {}
+        stats = by_method.get(method)
+        if stats is None:
+            stats = by_method[method] = _RouteStats()
+
+        stats.buckets[bisect.bisect_left(LATENCY_BUCKETS, duration)] += 1
+        stats.sum += duration
+        stats.count += 1
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def render(self, lines: List[str]):
+        lines.append("# HELP unipulse_http_requests_in_flight Requests currently being handled")
+        lines.append("# TYPE unipulse_http_requests_in_flight gauge")
+        lines.append(f"unipulse_http_requests_in_flight {self.in_flight}")
+
+        counters = []
+        histograms = []
+        for endpoint, by_method in list(self._routes.items()):
+            path = route_path(self._app, endpoint)
+            for method, stats in list(by_method.items()):
+                labels = f'method="{method}",route="{path}"'
+                for status, count in list(stats.statuses.items()):
+                    counters.append(f'unipulse_http_requests_total{{{labels},status="{status}"}} {count}')
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    cumulative += count
+                    histograms.append(f'unipulse_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                histograms.append(f'unipulse_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+                histograms.append(f"unipulse_http_request_duration_seconds_sum{{{labels}}} {stats.sum:.6f}")
+                histograms.append(f"unipulse_http_request_duration_seconds_count{{{labels}}} {stats.count}")
+
+        lines.append("# HELP unipulse_http_requests_total Requests handled, by route and status")
+        lines.append("# TYPE unipulse_http_requests_total counter")
+        lines.extend(counters)
+        lines.append("# HELP unipulse_http_request_duration_seconds Request latency, by route")
+        lines.append("# TYPE unipulse_http_request_duration_seconds histogram")
+        lines.extend(histograms)
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Motor/pymongo connection pool usage per server"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: dict = {}
+
+    def _pool(self, address) -> dict:
+        pool = self._pools.get(address)
+        if pool is None:
+            pool = self._pools[address] = {"open": 0, "in_use": 0, "checkout_failures": 0, "cleared": 0}
+        return pool
+
+    def _bump(self, address, field: str, delta: int):
+        with self._lock:
+            pool = self._pool(address)
+            pool[field] = max(pool[field] + delta, 0)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._bump(event.address, "cleared", 1)
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop(event.address, None)
+
+    def connection_created(self, event):
+        self._bump(event.address, "open", 1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._bump(event.address, "open", -1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._bump(event.address, "checkout_failures", 1)
+
+    def connection_checked_out(self, event):
+        self._bump(event.address, "in_use", 1)
+
+    def connection_checked_in(self, event):
+        self._bump(event.address, "in_use", -1)
+
+    def render(self, lines: List[str]):
+        with self._lock:
+            pools = {address: dict(pool) for address, pool in self._pools.items()}
+
+        lines.append("# HELP unipulse_mongo_pool_connections Mongo pool connections, by state")
+        lines.append("# TYPE unipulse_mongo_pool_connections gauge")
+        for (host, port), pool in pools.items():
+            address = f"{host}:{port}"
+            lines.append(f'unipulse_mongo_pool_connections{{address="{address}",state="open"}} {pool["open"]}')
+            lines.append(f'unipulse_mongo_pool_connections{{address="{address}",state="in_use"}} {pool["in_use"]}')
+        lines.append("# HELP unipulse_mongo_pool_checkout_failures_total Failed connection checkouts")
+        lines.append("# TYPE unipulse_mongo_pool_checkout_failures_total counter")
+        for (host, port), pool in pools.items():
+            lines.append(f'unipulse_mongo_pool_checkout_failures_total{{address="{host}:{port}"}} {pool["checkout_failures"]}')
+        lines.append("# HELP unipulse_mongo_pool_cleared_total Times the pool was cleared")
+        lines.append("# TYPE unipulse_mongo_pool_cleared_total counter")
+        for (host, port), pool in pools.items():
+            lines.append(f'unipulse_mongo_pool_cleared_total{{address="{host}:{port}"}} {pool["cleared"]}')
+
+
+class EventLoopLag:
+    """Measure how late the event loop wakes up a periodic sleeper"""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.last = 0.0
+        self.max = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.last = max(loop.time() - start - self.interval, 0.0)
+            self.max = max(self.max, self.last)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def render(self, lines: List[str]):
+        lines.append("# HELP unipulse_event_loop_lag_seconds Latest event loop scheduling delay")
+        lines.append("# TYPE unipulse_event_loop_lag_seconds gauge")
+        lines.append(f"unipulse_event_loop_lag_seconds {self.last:.6f}")
+        lines.append("# HELP unipulse_event_loop_lag_max_seconds Largest event loop delay since start")
+        lines.append("# TYPE unipulse_event_loop_lag_max_seconds gauge")
+        lines.append(f"unipulse_event_loop_lag_max_seconds {self.max:.6f}")
+
+
+def render_db_time(snapshot: dict, lines: List[str]):
+    """Export the command monitor's per-route DB time histograms"""
+    lines.append("# HELP unipulse_db_command_duration_seconds Mongo command latency, by originating route")
+    lines.append("# TYPE unipulse_db_command_duration_seconds histogram")
+    for route, stats in snapshot["routes"].items():
+        method, _, path = route.partition(" ")
+        labels = f'method="{method}",route="{path}"'
+        cumulative = 0
+        for bound, count in zip([*LATENCY_BUCKETS_MS, None], stats["buckets"].values()):
+            cumulative += count
+            le = "+Inf" if bound is None else bound / 1000
+            lines.append(f'unipulse_db_command_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"unipulse_db_command_duration_seconds_sum{{{labels}}} {stats['total_ms'] / 1000:.6f}")
+        lines.append(f"unipulse_db_command_duration_seconds_count{{{labels}}} {stats['count']}")
+
+
+request_metrics = RequestMetrics()
+pool_metrics = PoolMetrics()
+event_loop_lag = EventLoopLag()
+
+
+class MetricsMiddleware:
+    """Record request count, status, in-flight and latency per route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        request_metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_metrics.in_flight -= 1
+            request_metrics.observe(
+                scope.get("app"),
+                scope.get("endpoint"),
+                scope["method"],
+                status,
+                time.perf_counter() - start
+            )
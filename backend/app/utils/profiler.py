@@ -0,0 +1,171 @@
+import asyncio
+import itertools
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import List, Optional
+from jose import JWTError, jwt
+from app.config import settings
+from app.utils.request_context import route_label
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_FLAG = b"__profile=1"
+
+
+class StackSampler:
+    """Periodically sample one thread's stack into folded (flame-graph) form"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+
+def _is_admin_token(headers: List[tuple]) -> bool:
+    for name, value in headers:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return False
+            try:
+                payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+            except JWTError:
+                return False
+            return payload.get("role") == "admin"
+    return False
+
+
+def _profile_requested(scope: dict) -> bool:
+    if PROFILE_QUERY_FLAG in scope.get("query_string", b""):
+        return True
+    return any(name == PROFILE_HEADER and value == b"1" for name, value in scope["headers"])
+
+
+def folded_profile(root: str, samples: Counter) -> str:
+    """Render samples as folded stacks ("frame;frame;frame count" per line)"""
+    return "".join(f"{root};{stack} {count}\n" for stack, count in samples.most_common())
+
+
+def _write_profile(profile_id: str, content: str):
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    with open(os.path.join(settings.PROFILE_DIR, f"{profile_id}.folded"), "w") as f:
+        f.write(content)
+
+    # Keep only the newest profiles
+    profiles = sorted(
+        (entry for entry in os.scandir(settings.PROFILE_DIR) if entry.name.endswith(".folded")),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True
+    )
+    for entry in profiles[settings.PROFILE_KEEP:]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+def list_profiles() -> List[dict]:
+    """List stored profiles, newest first"""
+    if not os.path.isdir(settings.PROFILE_DIR):
+        return []
+    profiles = []
+    for entry in os.scandir(settings.PROFILE_DIR):
+        if entry.name.endswith(".folded"):
+            stat = entry.stat()
+            profiles.append({
+                "id": entry.name[:-len(".folded")],
+                "size": stat.st_size,
+                "created_at": stat.st_mtime
+            })
+    return sorted(profiles, key=lambda p: p["created_at"], reverse=True)
+
+
+def read_profile(profile_id: str) -> Optional[str]:
+    """Read a stored profile in folded format"""
+    if os.path.basename(profile_id) != profile_id:
+        return None
+    try:
+        with open(os.path.join(settings.PROFILE_DIR, f"{profile_id}.folded")) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+class ProfilerMiddleware:
+    """
+    Sample the event loop while a request runs and store a folded-stack profile.
+
+    Triggered per request by an admin (X-Profile: 1 header or __profile=1 query flag)
+    or for 1 in PROFILE_SAMPLE_EVERY_N requests, at most once per PROFILE_MIN_INTERVAL_SECONDS.
+    Only one request is profiled at a time; samples include any concurrent work on the loop.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._counter = itertools.count(1)
+        self._busy = False
+        self._last_background = 0.0
+
+    def _background_due(self) -> bool:
+        every_n = settings.PROFILE_SAMPLE_EVERY_N
+        if every_n <= 0 or next(self._counter) % every_n:
+            return False
+        now = time.monotonic()
+        if now - self._last_background < settings.PROFILE_MIN_INTERVAL_SECONDS:
+            return False
+        self._last_background = now
+        return True
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._busy:
+            await self.app(scope, receive, send)
+            return
+
+        on_demand = _profile_requested(scope) and _is_admin_token(scope["headers"])
+        if not on_demand and not self._background_due():
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and on_demand:
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode("ascii"))
+                ]
+            await send(message)
+
+        self._busy = True
+        sampler = StackSampler(threading.get_ident(), settings.PROFILE_INTERVAL_MS / 1000)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            samples = sampler.stop()
+            self._busy = False
+            content = folded_profile(route_label(scope).replace(";", ","), samples)
+            await asyncio.to_thread(_write_profile, profile_id, content)
@@ -0,0 +1,42 @@
+from typing import Optional, List, Type
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+
+def response_fields(model: Type[BaseModel]) -> List[str]:
+    """Field names a client may select for a response model (by alias, as serialized)"""
+    return [field.alias or name for name, field in model.model_fields.items()]
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[dict]:
+    """
+    Translate a comma-separated `fields` parameter into a Mongo projection.
+
+    Returns None when no selection was made. Unknown fields are rejected.
+    """
+    if not fields:
+        return None
+
+    allowed = response_fields(model)
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    if "id" in selected:
+        selected = ["_id" if f == "id" else f for f in selected]
+
+    invalid = [f for f in selected if f not in allowed]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid fields: {', '.join(invalid)}. Allowed: {', '.join(allowed)}"
+        )
+
+    projection = {f: 1 for f in selected}
+    if "_id" not in projection:
+        projection["_id"] = 0
+    return projection
+
+
+def projected_fields(projection: Optional[dict]) -> Optional[List[str]]:
+    """Keys a `parse_fields` projection selects, for encode_documents (None = all fields)"""
+    if projection is None:
+        return None
+    return [field for field, included in projection.items() if included]
@@ -0,0 +1,170 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import zipfile
+from datetime import datetime
+from typing import List, Optional, BinaryIO
+from fastapi import HTTPException
+from app.config import settings
+from app.utils.file_upload import upload_content
+from app.utils.delete_queue import delete_file
+from app.utils.text_extract import extract_text_async
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_EXTENSIONS = (".pdf", ".doc", ".docx")
+MANIFEST_NAMES = ("manifest.csv", "manifest.json")
+CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+def parse_manifest(content: bytes, filename: str) -> List[dict]:
+    """Parse a CSV or JSON manifest describing the files in a PYQ archive"""
+    try:
+        text = content.decode("utf-8-sig")
+        if filename.lower().endswith(".json"):
+            rows = json.loads(text)
+            if isinstance(rows, dict):
+                rows = rows.get("files", [])
+        else:
+            rows = list(csv.DictReader(io.StringIO(text)))
+    except (UnicodeDecodeError, json.JSONDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Error parsing manifest: {str(e)}")
+
+    if not isinstance(rows, list) or not rows:
+        raise HTTPException(status_code=400, detail="Manifest has no entries")
+
+    # Expected columns: file, subject, semester, year, exam_type
+    required_columns = ["file", "subject", "semester", "year", "exam_type"]
+    missing_columns = [col for col in required_columns if col not in rows[0]]
+    if missing_columns:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Missing required columns: {', '.join(missing_columns)}"
+        )
+
+    return rows
+
+
+def find_manifest(archive: zipfile.ZipFile) -> Optional[tuple[bytes, str]]:
+    """Look for a manifest bundled at the root of the archive"""
+    for name in MANIFEST_NAMES:
+        if name in archive.NameToInfo:
+            return archive.read(name), name
+    return None
+
+
+def _validate_entry(entry: dict) -> dict:
+    """Normalize one manifest row into PYQ metadata"""
+    file_name = str(entry["file"]).strip()
+    if not file_name.lower().endswith(ALLOWED_EXTENSIONS):
+        raise ValueError("File must be PDF, DOC, or DOCX")
+
+    return {
+        "file": file_name,
+        "subject": str(entry["subject"]).strip(),
+        "semester": int(entry["semester"]),
+        "year": int(entry["year"]),
+        "exam_type": str(entry["exam_type"]).strip().lower(),
+    }
+
+
+def _read_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> bytes:
+    """Decompress a single archive member"""
+    with archive.open(info) as member:
+        return member.read(settings.MAX_UPLOAD_SIZE + 1)
+
+
+async def import_pyq_archive(
+    archive_file: BinaryIO,
+    manifest: List[dict],
+    uploaded_by: str,
+    workers: int = None
+) -> tuple[List[dict], List[dict]]:
+    """
+    Store every file listed in the manifest with a bounded pool of concurrent uploads.
+
+    Members are decompressed one at a time per worker straight from the spooled
+    upload, so at most `workers` files are held in memory at once. Their text is
+    extracted in the same step so it is written with the metadata.
+    Returns the PYQ documents to insert and a per-file report (same order as the manifest).
+    """
+    try:
+        archive = zipfile.ZipFile(archive_file)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="File must be a valid ZIP archive")
+
+    semaphore = asyncio.Semaphore(workers or settings.BULK_IMPORT_WORKERS)
+    report: List[dict] = [None] * len(manifest)
+    documents: List[Optional[dict]] = [None] * len(manifest)
+
+    async def store(index: int, entry: dict):
+        name = str(entry.get("file", "")).strip()
+        try:
+            metadata = _validate_entry(entry)
+            info = archive.NameToInfo.get(metadata["file"])
+            if info is None or info.is_dir():
+                raise ValueError("File not found in archive")
+            if info.file_size > settings.MAX_UPLOAD_SIZE:
+                raise ValueError(f"File size exceeds {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB limit")
+
+            async with semaphore:
+                content = await asyncio.to_thread(_read_member, archive, info)
+                extension = os.path.splitext(name)[1].lower()
+                file_url, file_name = await upload_content(
+                    content,
+                    os.path.basename(name),
+                    subdirectory="pyq",
+                    content_type=CONTENT_TYPES.get(extension)
+                )
+                try:
+                    content_text = await extract_text_async(content, file_name)
+                except Exception as e:
+                    # The paper is still imported, just not searchable by its contents
+                    logger.error(f"Error extracting text from {name}: {e}")
+                    content_text = None
+        except HTTPException as e:
+            report[index] = {"file": name, "status": "failed", "detail": e.detail}
+            return
+        except (ValueError, KeyError, TypeError, zipfile.BadZipFile, OSError) as e:
+            report[index] = {"file": name, "status": "failed", "detail": str(e)}
+            return
+
+        documents[index] = {
+            "subject": metadata["subject"],
+            "semester": metadata["semester"],
+            "year": metadata["year"],
+            "exam_type": metadata["exam_type"],
+            "file_url": file_url,
+            "file_name": file_name,
+            "uploaded_by": uploaded_by,
+            "uploaded_at": datetime.utcnow()
+        }
+        if content_text:
+            documents[index]["content_text"] = content_text
+        report[index] = {"file": name, "status": "imported"}
+
+    try:
+        outcomes = await asyncio.gather(
+            *(store(i, entry) for i, entry in enumerate(manifest)),
+            return_exceptions=True
+        )
+        failure = next((outcome for outcome in outcomes if isinstance(outcome, BaseException)), None)
+        if failure is not None:
+            raise failure
+    except BaseException:
+        # The import is aborted, so nothing will reference the files stored so far
+        for document in documents:
+            if document:
+                await delete_file(document["file_url"])
+        raise
+    finally:
+        archive.close()
+
+    return documents, report
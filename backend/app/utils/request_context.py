@@ -0,0 +1,58 @@
+from contextvars import ContextVar
+from typing import Optional
+
+# ASGI scope of the request being handled; the router fills in scope["endpoint"]
+current_scope: ContextVar[Optional[dict]] = ContextVar("current_scope", default=None)
+
+_route_paths: dict = {}
+
+
+def _build_route_paths(app) -> dict:
+    paths = {}
+    for route in app.routes:
+        endpoint = getattr(route, "endpoint", None) or getattr(route, "app", None)
+        if endpoint is not None:
+            paths[endpoint] = route.path
+    return paths
+
+
+def route_path(app, endpoint) -> str:
+    """Route template of an endpoint (e.g. "/api/results/{result_id}")"""
+    global _route_paths
+    if endpoint is None:
+        return "unmatched"
+
+    path = _route_paths.get(endpoint)
+    if path is None:
+        _route_paths = _build_route_paths(app)
+        path = _route_paths.setdefault(endpoint, "unmatched")
+    return path
+
+
+def route_label(scope: dict) -> str:
+    """Label a request by method and route template (e.g. "GET /api/results/{result_id}")"""
+    return f"{scope.get('method', '')} {route_path(scope.get('app'), scope.get('endpoint'))}"
+
+
+def current_route() -> str:
+    """Route label of the request running in this context ("background" outside requests)"""
+    scope = current_scope.get()
+    return route_label(scope) if scope is not None else "background"
+
+
+class RequestContextMiddleware:
+    """Expose the current request's scope to code that has no access to the request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
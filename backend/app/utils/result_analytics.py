@@ -0,0 +1,106 @@
+from typing import List, Optional
+from app.utils.grading import GradeScale
+
+TOPPERS_COUNT = 10
+
+
+def analytics_pipeline(semester: int, academic_year: str) -> List[dict]:
+    """Aggregation feeding the analytics: one slim row per student result"""
+    return [
+        {"$match": {"semester": semester, "academic_year": academic_year}},
+        {"$project": {"_id": 0, "student_id": 1, "sgpa": 1, "subjects.subject": 1, "subjects.grade": 1}}
+    ]
+
+
+def compute_semester_analytics(rows: List[dict], scale: GradeScale) -> dict:
+    """
+    Compute class rank, toppers, grade distributions and pass rates for one semester.
+
+    Returns the response payload plus the lookup structures used to answer
+    per-student percentile queries without touching the database.
+    """
+    import numpy as np
+    import pandas as pd
+
+    fail_grades = {grade for _, grade, points in scale if points == 0}
+
+    students = pd.DataFrame(rows, columns=["student_id", "sgpa"])
+    students["sgpa"] = pd.to_numeric(students["sgpa"], errors="coerce")
+    ranked = students.dropna(subset=["sgpa"]).sort_values("sgpa", ascending=False)
+    ranked = ranked.assign(rank=ranked["sgpa"].rank(method="min", ascending=False).astype(int))
+
+    # One row per (student, subject) grade
+    grades = pd.DataFrame(
+        [
+            (row["student_id"], s.get("subject"), s.get("grade"))
+            for row in rows
+            for s in row.get("subjects") or []
+        ],
+        columns=["student_id", "subject", "grade"]
+    )
+    grades = grades.assign(failed=grades["grade"].isin(fail_grades))
+
+    subjects = []
+    if not grades.empty:
+        histogram = pd.crosstab(grades["subject"], grades["grade"])
+        pass_rates = (1 - grades.groupby("subject")["failed"].mean()) * 100
+        for subject, counts in histogram.iterrows():
+            subjects.append({
+                "subject": subject,
+                "students": int(counts.sum()),
+                "grades": {grade: int(n) for grade, n in counts.items() if n},
+                "pass_rate": round(float(pass_rates[subject]), 2)
+            })
+
+    failed_students = set(grades.loc[grades["failed"], "student_id"])
+    graded_students = set(grades["student_id"])
+    overall_pass_rate = (
+        (1 - len(failed_students) / len(graded_students)) * 100 if graded_students else None
+    )
+
+    sgpa = ranked["sgpa"]
+    analytics = {
+        "total_students": len(students),
+        "ranked_students": len(ranked),
+        "sgpa": {
+            "mean": round(float(sgpa.mean()), 2) if len(sgpa) else None,
+            "median": round(float(sgpa.median()), 2) if len(sgpa) else None,
+            "max": float(sgpa.max()) if len(sgpa) else None,
+            "min": float(sgpa.min()) if len(sgpa) else None,
+            "std": round(float(sgpa.std(ddof=0)), 2) if len(sgpa) else None
+        },
+        "pass_rate": round(overall_pass_rate, 2) if overall_pass_rate is not None else None,
+        "toppers": [
+            {"student_id": r.student_id, "sgpa": float(r.sgpa), "rank": int(r.rank)}
+            for r in ranked.head(TOPPERS_COUNT).itertuples()
+        ],
+        "subjects": subjects
+    }
+
+    return {
+        "analytics": analytics,
+        "sorted_sgpa": np.sort(sgpa.to_numpy()),
+        "standing": {
+            r.student_id: (float(r.sgpa), int(r.rank)) for r in ranked.itertuples()
+        }
+    }
+
+
+def student_percentile(distribution: dict, student_id: str) -> Optional[dict]:
+    """Look up a student's rank and percentile in a cached semester distribution"""
+    import numpy as np
+
+    standing = distribution["standing"].get(student_id)
+    if standing is None:
+        return None
+
+    sgpa, rank = standing
+    sorted_sgpa = distribution["sorted_sgpa"]
+    at_or_below = int(np.searchsorted(sorted_sgpa, sgpa, side="right"))
+    return {
+        "student_id": student_id,
+        "sgpa": sgpa,
+        "rank": rank,
+        "out_of": len(sorted_sgpa),
+        "percentile": round(at_or_below / len(sorted_sgpa) * 100, 2)
+    }
@@ -0,0 +1,128 @@
+import json
+import typing
+from typing import Iterable, Optional, Type
+from bson import ObjectId
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements, json is the fallback
+    orjson = None
+
+_MISSING = object()
+_plans: dict = {}
+
+
+def _nested_model(annotation):
+    """Find the model class (and whether it is a list) inside e.g. Optional[List[SubjectGrade]]"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    for arg in typing.get_args(annotation):
+        model, many = _nested_model(arg)
+        if model is not None:
+            return model, many or typing.get_origin(annotation) is list
+    return None, False
+
+
+def _field_encoder(annotation, encoders: dict):
+    """The model's json_encoders entry for a field's type, looked up along the MRO like Pydantic does"""
+    if not encoders:
+        return None
+    types = [annotation] if isinstance(annotation, type) else typing.get_args(annotation)
+    for tp in types:
+        if isinstance(tp, type):
+            for base in tp.__mro__:
+                if base in encoders:
+                    return encoders[base]
+    return None
+
+
+def _plan(model: Type[BaseModel]) -> tuple:
+    """Precompute (key, default factory, nested plan, is list, encoder) per field; documents use the aliases as keys"""
+    plan = _plans.get(model)
+    if plan is None:
+        encoders = model.model_config.get("json_encoders") or {}
+        fields = []
+        for name, field in model.model_fields.items():
+            if field.default_factory is not None:
+                default = field.default_factory
+            else:
+                value = None if field.is_required() else field.default
+                default = lambda value=value: value
+            nested, many = _nested_model(field.annotation)
+            fields.append((
+                field.alias or name,
+                default,
+                _plan(nested) if nested else None,
+                many,
+                _field_encoder(field.annotation, encoders)
+            ))
+        plan = _plans[model] = tuple(fields)
+    return plan
+
+
+def _convert(doc: dict, plan: tuple) -> dict:
+    out = {}
+    for key, default, nested, many, encoder in plan:
+        value = doc.get(key, _MISSING)
+        if value is _MISSING:
+            value = default()
+        elif nested is not None and value is not None:
+            value = [_convert(v, nested) for v in value] if many else _convert(value, nested)
+        if encoder is not None and value is not None:
+            value = encoder(value)
+        out[key] = value
+    return out
+
+
+def _default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload) -> bytes:
+    """Serialize plain data (ObjectId, date and datetime included) to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+def _trimmed_plan(model: Type[BaseModel], fields: frozenset) -> tuple:
+    """The model's plan restricted to the selected keys (a `fields=` selection), in model order"""
+    # Keyed by the set, not the order the client listed them in, so the cache stays bounded
+    plan = _plans.get((model, fields))
+    if plan is None:
+        plan = _plans[(model, fields)] = tuple(field for field in _plan(model) if field[0] in fields)
+    return plan
+
+
+def encode_documents(docs: Iterable[dict], model: Type[BaseModel], fields: Optional[Iterable[str]] = None) -> bytes:
+    """
+    Serialize Mongo documents with a response model's fields and aliases, without building models.
+
+    Output matches what FastAPI produces through response_model for stored documents:
+    extra keys are dropped, missing ones get the model default and ObjectIds become strings.
+    With `fields` (keys as serialized, e.g. "_id") only those keys are written.
+    """
+    plan = _plan(model) if fields is None else _trimmed_plan(model, frozenset(fields))
+    return dumps([_convert(doc, plan) for doc in docs])
+
+
+class MongoJSONResponse(Response):
+    """JSON response for content already encoded by encode_documents (skips response_model validation)"""
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
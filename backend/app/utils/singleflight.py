@@ -0,0 +1,65 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Hashable, List
+
+_groups: List["SingleFlight"] = []
+
+
+def query_key(*parts) -> str:
+    """Normalized key of a query (filters, sort, projection...); key order inside dicts does not matter"""
+    return json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+
+
+class SingleFlight:
+    """
+    Share one in-flight call between concurrent callers asking for the same key.
+
+    The call runs in its own task: a caller that is cancelled stops waiting but does
+    not cancel the call for the others. Results are shared, so callers must treat
+    them as read-only. Keys must include every filter that depends on the caller
+    (e.g. the student_id scoping a student's query) so callers never share data
+    they could not have read themselves, and the data version read before the
+    call, so a read that starts after a write never joins one that started
+    before it (and returns stale data under the new version's ETag).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.executions = 0
+        self._inflight: dict = {}
+        _groups.append(self)
+
+    def _done(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the error as retrieved when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task)
+
+
+def render_singleflight(lines: List[str]):
+    """Export calls and actual executions per group (coalescing ratio = 1 - executions / calls)"""
+    lines.append("# HELP unipulse_singleflight_calls_total Reads requested through single-flight groups")
+    lines.append("# TYPE unipulse_singleflight_calls_total counter")
+    for group in _groups:
+        lines.append(f'unipulse_singleflight_calls_total{{group="{group.name}"}} {group.calls}')
+    lines.append("# HELP unipulse_singleflight_executions_total Reads that actually ran (the rest shared one in flight)")
+    lines.append("# TYPE unipulse_singleflight_executions_total counter")
+    for group in _groups:
+        lines.append(f'unipulse_singleflight_executions_total{{group="{group.name}"}} {group.executions}')
+    lines.append("# HELP unipulse_singleflight_coalescing_ratio Share of reads served by another caller's call")
+    lines.append("# TYPE unipulse_singleflight_coalescing_ratio gauge")
+    for group in _groups:
+        ratio = 1 - group.executions / group.calls if group.calls else 0.0
+        lines.append(f'unipulse_singleflight_coalescing_ratio{{group="{group.name}"}} {ratio:.4f}')
@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import json
+import os
+from itertools import groupby
+from typing import Iterable, Optional, List
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from app.config import settings
+from app.models.result import ResultResponse
+from app.utils.academics import summary_response
+from app.utils.serialization import encode_documents
+from app.utils.versions import versions, results_scope
+
+# Snapshot kinds, one file each per student
+RESULTS = "results"
+CGPA = "cgpa"
+
+
+def _snapshot_path(student_id: str, kind: str) -> str:
+    # Student IDs are free-form, so hash them into safe file names
+    name = hashlib.sha1(student_id.encode("utf-8")).hexdigest()
+    return os.path.join(settings.SNAPSHOT_DIR, f"{name}.{kind}.json")
+
+
+def render_json(payload) -> bytes:
+    """Serialize a payload exactly like FastAPI's JSONResponse"""
+    return json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _write_snapshot(student_id: str, kind: str, body: bytes, version: int) -> bool:
+    # Results written since the data was read make this snapshot stale before it lands
+    if versions.get(results_scope(student_id)) != version:
+        return False
+    etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+    path = _snapshot_path(student_id, kind)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(f"{version} {etag}\n".encode("ascii") + body)
+    os.replace(tmp_path, path)
+    return True
+
+
+def read_snapshot(student_id: str, kind: str) -> Optional[tuple[bytes, str]]:
+    """
+    Get a published (body, etag) pair, or None if there is no valid snapshot.
+
+    Each snapshot records the student's results version it was rendered from and
+    is ignored once that version has moved on, even if invalidating the file lost a
+    race with a publish still writing it. Reads from disk, so call it off the event loop.
+    """
+    try:
+        with open(_snapshot_path(student_id, kind), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    header, _, body = data.partition(b"\n")
+    version, _, etag = header.decode("ascii").partition(" ")
+    if not version.isdigit() or int(version) != versions.get(results_scope(student_id)):
+        return None
+    return body, etag
+
+
+def invalidate_snapshots(student_ids: Iterable[str]):
+    """Drop the snapshots of students whose results changed (reads fall back to the database; blocking I/O)"""
+    for student_id in student_ids:
+        for kind in (RESULTS, CGPA):
+            try:
+                os.remove(_snapshot_path(student_id, kind))
+            except FileNotFoundError:
+                pass
+
+
+def snapshot_response(request: Request, snapshot: tuple[bytes, str]) -> Response:
+    """Serve a snapshot, answering 304 when the client already has it"""
+    body, etag = snapshot
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _write_results_snapshots(results: List[dict], published_versions: dict) -> int:
+    os.makedirs(settings.SNAPSHOT_DIR, exist_ok=True)
+    count = 0
+    for student_id, student_results in groupby(results, key=lambda r: r["student_id"]):
+        version = published_versions.get(results_scope(student_id), 0)
+        count += _write_snapshot(student_id, RESULTS, encode_documents(student_results, ResultResponse), version)
+    return count
+
+
+def _write_cgpa_snapshots(summaries: List[dict], published_versions: dict):
+    os.makedirs(settings.SNAPSHOT_DIR, exist_ok=True)
+    for summary in summaries:
+        student_id = summary["student_id"]
+        version = published_versions.get(results_scope(student_id), 0)
+        _write_snapshot(student_id, CGPA, render_json(summary_response(student_id, summary)), version)
+
+
+async def publish_snapshots(db, batch_size: int = 1000) -> dict:
+    """
+    Render every student's result list and CGPA summary into pre-serialized JSON files.
+
+    Results are streamed in student order and written in batches off the event loop.
+    Snapshots live on disk so every worker process serves the same files.
+    """
+    students = 0
+    results_count = 0
+    # Taken before reading, so results written during the publish outdate its snapshots
+    await versions.sync(db)
+    published_versions = versions.current()
+
+    cursor = db.results.find({}).sort([("student_id", 1), ("academic_year", -1), ("semester", -1)])
+    batch: List[dict] = []
+    async for result_doc in cursor:
+        # Only cut batches between students so each snapshot is complete
+        if len(batch) >= batch_size and batch[-1]["student_id"] != result_doc["student_id"]:
+            students += await asyncio.to_thread(_write_results_snapshots, batch, published_versions)
+            batch = []
+        batch.append(result_doc)
+        results_count += 1
+    if batch:
+        students += await asyncio.to_thread(_write_results_snapshots, batch, published_versions)
+
+    summaries: List[dict] = []
+    async for summary in db.academic_summaries.find({}, {"_id": 0}):
+        summaries.append(summary)
+        if len(summaries) >= batch_size:
+            await asyncio.to_thread(_write_cgpa_snapshots, summaries, published_versions)
+            summaries = []
+    if summaries:
+        await asyncio.to_thread(_write_cgpa_snapshots, summaries, published_versions)
+
+    return {"students": students, "results": results_count}
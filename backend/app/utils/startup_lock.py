@@ -0,0 +1,84 @@
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from typing import Awaitable, Callable
+from app.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process development only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Set by gunicorn.conf.py in the master before workers fork
+STARTUP_ID_ENV = "UNIPULSE_STARTUP_ID"
+
+
+def _start_time(pid: int) -> str:
+    """Start time of a process in clock ticks since boot ("" where /proc is unavailable)"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Fields after the parenthesised command name; starttime is field 22 of the whole line
+            return f.read().rpartition(")")[2].split()[19]
+    except (OSError, IndexError):
+        return ""
+
+
+def startup_id() -> str:
+    """
+    Identify this server start: shared by every worker of one gunicorn/uvicorn master.
+
+    Without the variable set by gunicorn.conf.py this is the process group (uvicorn
+    workers share their master's; systemd, supervisord and shells start a new one
+    per run) plus its leader's start time, so a reused pid is not mistaken for it.
+    """
+    if STARTUP_ID_ENV not in os.environ:
+        try:
+            pgid = os.getpgid(0)
+        except AttributeError:  # Windows: no process groups, single-process development only
+            os.environ[STARTUP_ID_ENV] = uuid.uuid4().hex
+        else:
+            return f"pgid-{pgid}-{_start_time(pgid)}"
+    return os.environ[STARTUP_ID_ENV]
+
+
+def _acquire(path: str):
+    lock_file = open(path, "a+")
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+    return lock_file
+
+
+def _release(lock_file):
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+    lock_file.close()
+
+
+async def run_once(name: str, fingerprint: str, work: Callable[[], Awaitable[None]]) -> bool:
+    """
+    Run one-time startup work in only one worker per server start.
+
+    Workers queue on an exclusive file lock; the first runs the work and records
+    the start id and fingerprint in the lock file, the others find it and skip.
+    A changed fingerprint (e.g. new indexes) makes the work run again.
+    Returns whether this worker ran it.
+    """
+    marker = hashlib.sha1(f"{name}|{startup_id()}|{fingerprint}".encode("utf-8")).hexdigest()
+    lock_file = await asyncio.to_thread(_acquire, settings.STARTUP_LOCK_FILE)
+    try:
+        lock_file.seek(0)
+        if lock_file.read().strip() == marker:
+            return False
+        await work()
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(marker)
+        lock_file.flush()
+        logger.info(f"Ran startup work '{name}' in worker {os.getpid()}")
+        return True
+    finally:
+        _release(lock_file)
@@ -0,0 +1,110 @@
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+from bson import ObjectId
+from app.config import settings
+from app.database import get_database
+from app.utils.versions import versions, PYQ
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pending_tasks: set = set()
+
+_WHITESPACE = re.compile(r"\s+")
+_XML_TAG = re.compile(r"<[^>]+>")
+
+
+def _extract_pdf_text(content: bytes) -> str:
+    """Extract text from a PDF (requires the optional pypdf package)"""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return ""
+
+    reader = PdfReader(io.BytesIO(content))
+    return " ".join(page.extract_text() or "" for page in reader.pages)
+
+
+def _extract_docx_text(content: bytes) -> str:
+    """Extract text from a DOCX by stripping the markup of its main document part"""
+    with zipfile.ZipFile(io.BytesIO(content)) as docx:
+        xml = docx.read("word/document.xml").decode("utf-8", errors="ignore")
+    return _XML_TAG.sub(" ", xml.replace("</w:p>", "\n"))
+
+
+def extract_text(content: bytes, filename: str) -> str:
+    """Extract searchable text from an uploaded paper (runs in a worker process)"""
+    extension = os.path.splitext(filename)[1].lower()
+    try:
+        if extension == ".pdf":
+            text = _extract_pdf_text(content)
+        elif extension == ".docx":
+            text = _extract_docx_text(content)
+        else:
+            return ""
+    except Exception:
+        # Unreadable or encrypted documents are still searchable by metadata
+        return ""
+
+    return _WHITESPACE.sub(" ", text).strip()[:settings.MAX_INDEXED_TEXT_CHARS]
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Get the process pool used for text extraction"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.TEXT_EXTRACTION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+async def extract_text_async(content: bytes, filename: str) -> str:
+    """Extract text in the worker pool without blocking the event loop"""
+    global _executor
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    try:
+        return await loop.run_in_executor(executor, extract_text, content, filename)
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); later calls start a fresh pool
+        if _executor is executor:
+            _executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+        raise
+
+
+async def _index_pyq_text(pyq_id: ObjectId, content: bytes, filename: str):
+    try:
+        text = await extract_text_async(content, filename)
+        if text:
+            db = get_database()
+            await db.pyq.update_one({"_id": pyq_id}, {"$set": {"content_text": text}})
+            # Search results change once the contents are indexed
+            await versions.bump(db, [PYQ])
+    except Exception as e:
+        logger.error(f"Error indexing PYQ {pyq_id}: {e}")
+
+
+def schedule_pyq_indexing(pyq_id: ObjectId, content: bytes, filename: str):
+    """Extract and store the text of an uploaded PYQ in the background"""
+    task = asyncio.create_task(_index_pyq_text(pyq_id, content, filename))
+    _pending_tasks.add(task)
+    task.add_done_callback(_pending_tasks.discard)
+
+
+def shutdown_executor():
+    """Stop the text extraction workers"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,21 @@
+from typing import Iterable, List
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def merge_weekly_timetable(timetables: Iterable[dict]) -> List[dict]:
+    """One timetable per day in week order; a student's own timetable takes precedence over the common one"""
+    by_day: dict = {}
+    for timetable in timetables:
+        day = timetable["day"]
+        if day not in DAYS:
+            continue
+        current = by_day.get(day)
+        if current is None or (timetable.get("student_id") and not current.get("student_id")):
+            by_day[day] = timetable
+
+    return [
+        {"day": day, "time_slots": by_day[day]["time_slots"]}
+        for day in DAYS
+        if day in by_day
+    ]
@@ -0,0 +1,134 @@
+import asyncio
+import hashlib
+import logging
+from datetime import timedelta
+from typing import Iterable, Optional
+from fastapi import Request, Response
+from pymongo import UpdateOne
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Scopes bumped by the write routes
+PYQ = "pyq"
+TIMETABLE = "timetable"
+
+# Re-read versions changed slightly before the last one seen, in case writes
+# with an older server timestamp became visible after it
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def results_scope(student_id: Optional[str]) -> str:
+    """Version scope of one student's results and CGPA"""
+    return f"results:{student_id}"
+
+
+def semester_scope(semester: int, academic_year: str) -> str:
+    """Version scope of one semester's results (its analytics and percentiles)"""
+    return f"semester:{academic_year}:{semester}"
+
+
+class VersionStore:
+    """
+    Version counters of read-mostly data, used to answer conditional GETs without querying it.
+
+    Counters live in the collection_versions collection so every worker sees the same
+    values; each worker keeps a local copy that the write path updates immediately and
+    a background task refreshes every VERSION_SYNC_SECONDS for writes made elsewhere.
+    """
+
+    def __init__(self):
+        self._versions: dict = {}
+        self._last_seen = None
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, scope: str) -> int:
+        return self._versions.get(scope, 0)
+
+    def current(self) -> dict:
+        """Copy of every known version, to compare against later"""
+        return dict(self._versions)
+
+    def _apply(self, docs: list):
+        for doc in docs:
+            self._versions[doc["_id"]] = doc["version"]
+            if self._last_seen is None or doc["updated_at"] > self._last_seen:
+                self._last_seen = doc["updated_at"]
+
+    async def bump(self, db, scopes: Iterable[str]):
+        """Increment the versions of changed scopes (call after the write succeeds)"""
+        scopes = list(dict.fromkeys(scopes))
+        if not scopes:
+            return
+        try:
+            await db.collection_versions.bulk_write([
+                UpdateOne(
+                    {"_id": scope},
+                    {"$inc": {"version": 1}, "$currentDate": {"updated_at": True}},
+                    upsert=True
+                )
+                for scope in scopes
+            ], ordered=False)
+            self._apply(await db.collection_versions.find({"_id": {"$in": scopes}}).to_list(length=None))
+        except Exception as e:
+            # The write itself succeeded; clients may see stale 304s until the next bump
+            logger.error(f"Error bumping versions {scopes}: {e}")
+
+    async def sync(self, db):
+        """Load versions changed since the last sync (everything on the first one)"""
+        query = {}
+        if self._last_seen is not None:
+            query["updated_at"] = {"$gte": self._last_seen - SYNC_OVERLAP}
+        self._apply(await db.collection_versions.find(query).to_list(length=None))
+
+    async def _run(self, db):
+        while True:
+            await asyncio.sleep(settings.VERSION_SYNC_SECONDS)
+            try:
+                await self.sync(db)
+            except Exception as e:
+                logger.error(f"Error syncing versions: {e}")
+
+    async def start(self, db):
+        await self.sync(db)
+        self._task = asyncio.create_task(self._run(db))
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+
+versions = VersionStore()
+
+
+def version_etag(request: Request, user, *scopes: str) -> str:
+    """
+    ETag of a GET response from the versions of the data it reads.
+
+    The path, query string and caller are part of the tag because they select
+    which documents (and which fields) the response contains.
+    """
+    key = "|".join([
+        request.url.path,
+        request.url.query,
+        user.role,
+        user.student_id,
+        *(f"{scope}={versions.get(scope)}" for scope in scopes)
+    ])
+    return '"v-' + hashlib.blake2b(key.encode("utf-8"), digest_size=12).hexdigest() + '"'
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response when the client already has this version, else None"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in tags or "*" in tags:
+        return Response(status_code=304, headers=cache_headers(etag))
+    return None
@@ -0,0 +1,89 @@
+"""
+Benchmark `fields=` projections on the list endpoints: full documents vs a summary selection
+Compares BSON bytes read from Mongo, BSON decode time, JSON bytes sent and encode time
+Runs on synthetic documents (projected in Python the way Mongo would), no database needed
+
+Usage: python -m benchmarks.bench_fields [--rows 1000] [--repeat 50]
+"""
+
+import argparse
+import bson
+from datetime import datetime
+from app.models.attendance import AttendanceResponse
+from app.models.pyq import PYQResponse
+from app.models.result import ResultResponse
+from app.models.timetable import TimetableResponse
+from app.utils.projection import parse_fields, projected_fields
+from app.utils.serialization import encode_documents
+from benchmarks.bench_serialization import make_documents, timeit
+
+# A typical summary selection per list endpoint
+SELECTIONS = {
+    AttendanceResponse: "date,subject,status",
+    ResultResponse: "id,semester,academic_year,sgpa",
+    TimetableResponse: "day,student_id",
+    PYQResponse: "id,subject,year,semester,file_url",
+}
+
+
+def make_pyq_documents(rows: int) -> list:
+    return [
+        {
+            "_id": bson.ObjectId(),
+            "subject": f"Subject {i % 8}",
+            "semester": i % 8 + 1,
+            "year": 2015 + i % 10,
+            "exam_type": "end",
+            "file_url": f"/files/pyq/paper_{i:05d}.pdf",
+            "file_name": f"paper_{i:05d}.pdf",
+            "uploaded_by": "ADMIN001",
+            "uploaded_at": datetime(2024, 1, 1),
+            "content_text": "question " * 400
+        }
+        for i in range(rows)
+    ]
+
+
+def project(doc: dict, projection: dict) -> dict:
+    """Apply an inclusion projection like the server does"""
+    keys = [key for key, included in projection.items() if included]
+    if projection.get("_id", 1):
+        keys.append("_id")
+    return {key: doc[key] for key in keys if key in doc}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    documents = make_documents(args.rows)
+    # The PYQ list already drops the extracted text by default
+    documents[PYQResponse] = [{k: v for k, v in doc.items() if k != "content_text"} for doc in make_pyq_documents(args.rows)]
+
+    for model, fields in SELECTIONS.items():
+        docs = documents[model]
+        projection = parse_fields(fields, model)
+        selected = projected_fields(projection)
+        projected = [project(doc, projection) for doc in docs]
+
+        full_bson = b"".join(bson.encode(doc) for doc in docs)
+        trimmed_bson = b"".join(bson.encode(doc) for doc in projected)
+        full_json = encode_documents(docs, model)
+        trimmed_json = encode_documents(projected, model, selected)
+
+        decode_full = timeit(lambda: bson.decode_all(full_bson), args.repeat)
+        decode_trimmed = timeit(lambda: bson.decode_all(trimmed_bson), args.repeat)
+        encode_full = timeit(lambda: encode_documents(docs, model), args.repeat)
+        encode_trimmed = timeit(lambda: encode_documents(projected, model, selected), args.repeat)
+
+        print(f"{model.__name__} ({args.rows} rows, fields={fields})")
+        print(f"   BSON from Mongo  {len(full_bson):>10,} B -> {len(trimmed_bson):>10,} B  ({len(trimmed_bson) / len(full_bson) - 1:+.0%})")
+        print(f"   BSON decode      {decode_full:>10.2f} ms -> {decode_trimmed:>9.2f} ms  ({decode_trimmed / decode_full - 1:+.0%})")
+        print(f"   JSON response    {len(full_json):>10,} B -> {len(trimmed_json):>10,} B  ({len(trimmed_json) / len(full_json) - 1:+.0%})")
+        print(f"   JSON encode      {encode_full:>10.2f} ms -> {encode_trimmed:>9.2f} ms  ({encode_trimmed / encode_full - 1:+.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Throughput scaling across worker processes
+
+Starts gunicorn (gunicorn.conf.py) with 1, 2, 4... workers and drives it from
+separate client processes, reporting requests/s and scaling efficiency
+(throughput / (workers x single-worker throughput)). Needs MongoDB, since every
+worker connects on startup.
+
+Client and server share the machine, so by default worker counts go up to half
+the CPUs and the other half generate load.
+
+Needs gunicorn and httpx (loadtest/requirements.txt).
+
+Usage: python -m benchmarks.bench_scaling [--workers 1 2 4] [--path /health] [--token JWT]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import httpx
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not become ready")
+
+
+async def _drive(url: str, headers: dict, connections: int, duration: float) -> int:
+    done = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(limits=limits, headers=headers, timeout=30.0) as client:
+        async def loop():
+            nonlocal done
+            while time.monotonic() < deadline:
+                response = await client.get(url)
+                if response.status_code < 400:
+                    done += 1
+
+        await asyncio.gather(*(loop() for _ in range(connections)))
+    return done
+
+
+def _client_process(args: tuple) -> int:
+    url, headers, connections, duration = args
+    return asyncio.run(_drive(url, headers, connections, duration))
+
+
+def measure(workers: int, args) -> float:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {**os.environ, "WEB_WORKERS": str(workers), "BIND": f"127.0.0.1:{port}", "METRICS_ENABLED": "false"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        _wait_ready(base_url)
+        headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+        jobs = [(base_url + args.path, headers, args.connections, args.warmup) for _ in range(args.clients)]
+        with multiprocessing.Pool(args.clients) as pool:
+            pool.map(_client_process, jobs)
+            jobs = [(base_url + args.path, headers, args.connections, args.duration) for _ in range(args.clients)]
+            total = sum(pool.map(_client_process, jobs))
+        return total / args.duration
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    default_workers = [n for n in (1, 2, 4, 8, 16, 32) if n <= max(cpus // 2, 1)]
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers)
+    parser.add_argument("--clients", type=int, default=max(cpus // 2, 1), help="Load generating processes")
+    parser.add_argument("--connections", type=int, default=32, help="Concurrent connections per client process")
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--token", help="Bearer token for authenticated paths")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for workers in args.workers:
+        rps = measure(workers, args)
+        baseline = results[0]["rps"] / results[0]["workers"] if results else rps / workers
+        efficiency = rps / (workers * baseline)
+        results.append({"workers": workers, "rps": round(rps, 1), "efficiency": round(efficiency, 3)})
+        print(f"{workers:>3} workers: {rps:>10.1f} req/s  scaling efficiency {efficiency:6.1%}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"path": args.path, "cpus": cpus, "clients": args.clients, "results": results}, f, indent=2)
+        print(f"\n✅ Saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark list-response serialization: the response_model path vs encode_documents
+Runs on synthetic documents, no database needed
+
+Usage: python -m benchmarks.bench_serialization [--rows 1000] [--repeat 50]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from app.models.attendance import AttendanceResponse
+from app.models.result import ResultResponse
+from app.models.timetable import TimetableResponse
+from app.utils.snapshots import render_json
+from app.utils.serialization import encode_documents
+
+
+def make_documents(rows: int) -> dict:
+    now = datetime.utcnow()
+    return {
+        AttendanceResponse: [
+            {
+                "_id": ObjectId(),
+                "student_id": f"STU{i % 200:04d}",
+                "subject": f"Subject {i % 8}",
+                "date": (now - timedelta(days=i % 120)).date().isoformat(),
+                "status": "present" if i % 5 else "absent",
+                "created_at": now
+            }
+            for i in range(rows)
+        ],
+        ResultResponse: [
+            {
+                "_id": ObjectId(),
+                "student_id": f"STU{i:04d}",
+                "semester": i % 8 + 1,
+                "academic_year": "2023-24",
+                "subjects": [
+                    {"subject": f"Subject {j}", "grade": "A", "marks": 80.0 + j, "credits": 4.0}
+                    for j in range(6)
+                ],
+                "sgpa": 8.4,
+                "cgpa": None,
+                "file_url": None,
+                "uploaded_by": "ADMIN001",
+                "uploaded_at": now
+            }
+            for i in range(rows)
+        ],
+        TimetableResponse: [
+            {
+                "_id": ObjectId(),
+                "student_id": None,
+                "day": "Monday",
+                "time_slots": [
+                    {"start_time": f"{9 + j:02d}:00", "end_time": f"{10 + j:02d}:00", "subject": f"Subject {j}", "room": "A101"}
+                    for j in range(6)
+                ],
+                "created_at": now,
+                "updated_at": now
+            }
+            for _ in range(rows)
+        ]
+    }
+
+
+def response_model_path(docs: list, model) -> bytes:
+    # What the list endpoints used to do: build models, then FastAPI validates
+    # them against response_model again and encodes through jsonable_encoder
+    models = [model(**{**doc, "_id": str(doc["_id"])}) for doc in docs]
+    validated = [model.model_validate(m.model_dump(by_alias=True)) for m in models]
+    return render_json(jsonable_encoder(validated, by_alias=True))
+
+
+def fast_path(docs: list, model) -> bytes:
+    return encode_documents(docs, model)
+
+
+def timeit(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    for model, docs in make_documents(args.rows).items():
+        slow_body = response_model_path(docs, model)
+        fast_body = fast_path(docs, model)
+        same = json.loads(slow_body) == json.loads(fast_body)
+
+        slow_ms = timeit(lambda: response_model_path(docs, model), args.repeat)
+        fast_ms = timeit(lambda: fast_path(docs, model), args.repeat)
+        print(
+            f"{model.__name__:<20} {args.rows} rows: "
+            f"response_model {slow_ms:7.2f} ms | fast path {fast_ms:6.2f} ms | "
+            f"{slow_ms / fast_ms:5.1f}x | identical output: {'✅' if same else '❌'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Microbenchmarks of the CPU work done per request (no database needed)
+
+Usage:
+    python -m benchmarks.microbench                          # run everything
+    python -m benchmarks.microbench -k csv -k jwt            # only matching names
+    python -m benchmarks.microbench --output bench.json      # save results
+    python -m benchmarks.microbench --compare bench.json     # diff against saved results
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import date, datetime, timedelta
+from typing import Callable, List
+from bson import ObjectId
+from jose import jwt
+from app.auth.jwt import create_access_token
+from app.config import settings
+from app.models.attendance import AttendanceResponse
+from app.models.result import ResultResponse
+from app.models.timetable import TimetableResponse
+from app.models.user import User
+from app.utils.academics import summarize
+from app.utils.attendance_stats import compute_subject_stats
+from app.utils.csv_parser import parse_attendance_csv
+from app.utils.serialization import encode_documents
+from app.utils.timetables import DAYS, merge_weekly_timetable
+
+# name -> (group, setup); setup returns the zero-argument callable to time
+BENCHMARKS: dict = {}
+
+# A median change beyond this is flagged when comparing runs
+REGRESSION_THRESHOLD = 0.10
+
+
+def benchmark(name: str, group: str):
+    def register(setup: Callable[[], Callable[[], object]]):
+        BENCHMARKS[name] = (group, setup)
+        return setup
+    return register
+
+
+SUBJECTS = [f"Subject {i + 1:02d}" for i in range(8)]
+
+
+def attendance_rows(count: int) -> List[dict]:
+    start = date(2024, 1, 1)
+    return [
+        {
+            "_id": ObjectId(),
+            "student_id": "STU0001",
+            "subject": SUBJECTS[i % len(SUBJECTS)],
+            "date": (start + timedelta(days=i // len(SUBJECTS))).isoformat(),
+            "status": "absent" if i % 5 == 0 else "present",
+            "created_at": datetime(2024, 1, 1, 9, 0)
+        }
+        for i in range(count)
+    ]
+
+
+def attendance_csv(rows: int) -> bytes:
+    lines = ["student_id,subject,date,status"]
+    for row in attendance_rows(rows):
+        lines.append(f"{row['student_id']},{row['subject']},{row['date']},{row['status']}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def result_docs(count: int) -> List[dict]:
+    return [
+        {
+            "_id": ObjectId(),
+            "student_id": "STU0001",
+            "semester": i % 8 + 1,
+            "academic_year": f"{2020 + i // 2}-{21 + i // 2}",
+            "subjects": [{"subject": s, "grade": "A", "marks": 78.5, "credits": 4.0} for s in SUBJECTS],
+            "sgpa": 8.2,
+            "cgpa": None,
+            "file_url": None,
+            "uploaded_by": "admin",
+            "uploaded_at": datetime(2024, 6, 1)
+        }
+        for i in range(count)
+    ]
+
+
+def timetable_docs() -> List[dict]:
+    slots = [
+        {"start_time": f"{9 + h:02d}:00", "end_time": f"{10 + h:02d}:00", "subject": s, "faculty": "Faculty", "room": "A101"}
+        for h, s in enumerate(SUBJECTS[:6])
+    ]
+    common = [
+        {"_id": ObjectId(), "student_id": None, "day": day, "time_slots": slots, "created_at": datetime(2024, 1, 1), "updated_at": datetime(2024, 1, 1)}
+        for day in DAYS[:6]
+    ]
+    personal = [
+        {"_id": ObjectId(), "student_id": "STU0001", "day": day, "time_slots": slots[::-1], "created_at": datetime(2024, 1, 1), "updated_at": datetime(2024, 1, 1)}
+        for day in ("Monday", "Thursday")
+    ]
+    return common + personal
+
+
+for rows in (100, 1_000, 10_000):
+    @benchmark(f"parse_attendance_csv[{rows}]", "csv")
+    def _(rows=rows):
+        content = attendance_csv(rows)
+        return lambda: parse_attendance_csv(content)
+
+
+@benchmark("create_access_token", "jwt")
+def _():
+    return lambda: create_access_token({"sub": "STU0001", "role": "student"})
+
+
+@benchmark("jwt.decode", "jwt")
+def _():
+    token = create_access_token({"sub": "STU0001", "role": "student"})
+    return lambda: jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+
+
+@benchmark("User(**doc)", "models")
+def _():
+    doc = {
+        "_id": ObjectId(),
+        "student_id": "STU0001",
+        "name": "Student One",
+        "email": "stu0001@example.com",
+        "role": "student",
+        "hashed_password": "$2b$12$" + "x" * 53,
+        "created_at": datetime(2024, 1, 1),
+        "updated_at": datetime(2024, 1, 1)
+    }
+    return lambda: User(**doc)
+
+
+for model, make_docs in ((AttendanceResponse, lambda: attendance_rows(100)), (ResultResponse, lambda: result_docs(8)), (TimetableResponse, timetable_docs)):
+    @benchmark(f"{model.__name__} construct+dump", "models")
+    def _(model=model, make_docs=make_docs):
+        docs = make_docs()
+        return lambda: [model(**{**d, "_id": str(d["_id"])}).model_dump_json(by_alias=True) for d in docs]
+
+    @benchmark(f"{model.__name__} encode_documents", "models")
+    def _(model=model, make_docs=make_docs):
+        docs = make_docs()
+        return lambda: encode_documents(docs, model)
+
+
+for rows in (100, 1_000):
+    @benchmark(f"compute_subject_stats[{rows}]", "stats")
+    def _(rows=rows):
+        records = attendance_rows(rows)
+        return lambda: compute_subject_stats(records)
+
+
+@benchmark("summarize (cgpa sort+sum, 8 semesters)", "stats")
+def _():
+    semesters = [
+        {"semester": s + 1, "academic_year": f"{2020 + s // 2}-{21 + s // 2}", "sgpa": 7.5 + s / 10, "credits": 24.0}
+        for s in reversed(range(8))
+    ]
+    return lambda: summarize("STU0001", semesters)
+
+
+@benchmark("merge_weekly_timetable", "timetable")
+def _():
+    timetables = timetable_docs()
+    return lambda: merge_weekly_timetable(timetables)
+
+
+def run_benchmark(fn: Callable, repeat: int, min_time: float) -> dict:
+    # Pick a loop count that runs for at least min_time, then time `repeat` rounds of it
+    number = 1
+    while True:
+        elapsed = timeit.timeit(fn, number=number)
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    timings = [t / number for t in timeit.repeat(fn, number=number, repeat=repeat)]
+    median = statistics.median(timings)
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_us": round(min(timings) * 1e6, 3),
+        "median_us": round(median * 1e6, 3),
+        "mean_us": round(statistics.mean(timings) * 1e6, 3),
+        "stdev_us": round(statistics.stdev(timings) * 1e6, 3) if repeat > 1 else 0.0,
+        "ops_per_sec": round(1 / median, 1)
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", dest="filters", action="append", default=[], help="Only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds each timing round runs for")
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--compare", help="Earlier JSON results to diff against")
+    args = parser.parse_args()
+
+    results = {}
+    for name, (group, setup) in BENCHMARKS.items():
+        if args.filters and not any(f.lower() in name.lower() for f in args.filters):
+            continue
+        stats = run_benchmark(setup(), args.repeat, args.min_time)
+        results[name] = {"group": group, **stats}
+        print(f"{name:<45} {stats['median_us']:>12.2f} µs  ±{stats['stdev_us']:>9.2f}  ({stats['ops_per_sec']:,.1f}/s)")
+
+    report = {
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "machine": platform.platform(),
+        "benchmarks": results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Saved {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["benchmarks"]
+        print(f"\n📊 Against {args.compare}")
+        regressed = False
+        for name, stats in results.items():
+            if name not in baseline:
+                continue
+            change = stats["median_us"] / baseline[name]["median_us"] - 1
+            marker = "❌" if change > REGRESSION_THRESHOLD else "✅" if change < -REGRESSION_THRESHOLD else "  "
+            regressed |= change > REGRESSION_THRESHOLD
+            print(f"{marker} {name:<45} {baseline[name]['median_us']:>12.2f} -> {stats['median_us']:>12.2f} µs ({change:+.1%})")
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
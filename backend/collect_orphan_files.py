@@ -0,0 +1,43 @@
+"""
+Script to find and delete uploaded files no longer referenced by any PYQ or result
+Runs as a dry run unless --delete is passed
+"""
+
+import argparse
+import asyncio
+import sys
+from app.database import connect_to_mongo, close_mongo_connection
+from app.utils.file_gc import collect_orphan_files
+
+
+async def main(delete: bool, grace_seconds: int):
+    await connect_to_mongo()
+    try:
+        report = await collect_orphan_files(dry_run=not delete, grace_seconds=grace_seconds)
+    finally:
+        await close_mongo_connection()
+
+    print(f"Storage: {report['storage']}")
+    print(f"   Scanned: {report['scanned']} files")
+    print(f"   Orphaned: {report['orphaned']} files ({report['bytes_orphaned'] / 1024 / 1024:.2f}MB)")
+    for file_url in report["files"]:
+        print(f"   - {file_url}")
+
+    if delete:
+        print(f"✅ Deleted {report['deleted']} files, reclaimed {report['bytes_reclaimed'] / 1024 / 1024:.2f}MB")
+        if report["failed"]:
+            print(f"❌ Failed to delete {len(report['failed'])} files")
+    else:
+        print("\nDry run - pass --delete to remove these files")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--delete", action="store_true", help="Delete orphaned files")
+    parser.add_argument("--grace-seconds", type=int, default=None, help="Skip files newer than this")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.delete, args.grace_seconds))
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,36 @@
+"""
+Script to create every index in the registry (app/indexes.py)
+Safe to run repeatedly - existing indexes are left alone
+"""
+
+import asyncio
+import sys
+from app.database import connect_to_mongo, close_mongo_connection, get_database
+from app.indexes import ensure_indexes
+
+
+async def main():
+    await connect_to_mongo()
+    try:
+        report = await ensure_indexes(get_database())
+    finally:
+        await close_mongo_connection()
+
+    failed = False
+    for collection, outcome in report.items():
+        if outcome["status"] == "ok":
+            print(f"✅ {collection}: {', '.join(outcome['indexes'])}")
+        else:
+            failed = True
+            print(f"❌ {collection}: {outcome['detail']}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
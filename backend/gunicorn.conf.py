@@ -0,0 +1,64 @@
+"""
+Gunicorn config for multi-process serving
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Each worker runs its own event loop, Mongo client and pool (MONGO_MAX_POOL_SIZE);
+one-time startup work (upload dirs, indexes) runs in a single worker under STARTUP_LOCK_FILE.
+"""
+
+import math
+import os
+import uuid
+from app.config import settings
+from app.utils.startup_lock import STARTUP_ID_ENV
+
+
+def cpu_quota():
+    """CPUs allowed by the cgroup CPU quota (docker --cpus, Kubernetes limits), or None if unlimited"""
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1: quota is -1 when unlimited
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+    except (OSError, ValueError):
+        return None
+    return quota / period if quota > 0 and period > 0 else None
+
+
+def default_workers() -> int:
+    """One worker per CPU this process may use (respects affinity, container cpusets and CPU quotas)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = cpu_quota()
+    if quota is not None:
+        # The host's CPUs are still visible under a quota; more workers than it allows just get throttled
+        cpus = min(cpus, math.ceil(quota))
+    return max(cpus, 1)
+
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = settings.WEB_WORKERS or default_workers()
+worker_class = "uvicorn.workers.UvicornWorker"
+# Workers import the app after forking so nothing (Mongo client, S3 client, thread pools) is shared
+preload_app = False
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+
+def on_starting(server):
+    # Every worker of this start shares the id, so the one-time startup work runs once
+    os.environ[STARTUP_ID_ENV] = uuid.uuid4().hex
@@ -0,0 +1,109 @@
+"""
+Script to report what importing the app costs (python -X importtime, grouped by package)
+With --check it enforces the startup budget and exits 1 when it is exceeded,
+e.g. when pandas, numpy or boto3 get imported at startup again
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+
+# Heavy dependencies that must only be imported on first use
+LAZY_MODULES = ["pandas", "numpy", "boto3", "botocore", "pypdf"]
+
+# Startup budget enforced by --check (and by tests/test_import_time.py)
+MAX_SECONDS = 2.0
+MAX_RSS_MB = 90.0
+
+# Printed by the child process after importing the app
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+try:
+    # Peak RSS of this program only: ru_maxrss can carry over the parent's peak across exec
+    with open("/proc/self/status") as f:
+        rss_kb = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+except OSError:
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": elapsed, "rss_mb": rss_kb / 1024, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure(module: str) -> dict:
+    """Import the module in a fresh interpreter and collect timings, peak RSS and loaded modules"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module)],
+        capture_output=True,
+        text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    # importtime lines: "import time: self [us] | cumulative | imported package"
+    self_us = defaultdict(int)
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, _, name = line[len("import time:"):].split("|")
+        self_us[name.strip().split(".")[0]] += int(self_time)
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["packages"] = dict(sorted(self_us.items(), key=lambda item: item[1], reverse=True))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report and check the app's import time and memory")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=15, help="Packages to list")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if a budget is exceeded")
+    parser.add_argument("--max-seconds", type=float, default=MAX_SECONDS)
+    parser.add_argument("--max-rss-mb", type=float, default=MAX_RSS_MB)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    result = measure(args.module)
+    eager = [module for module in LAZY_MODULES if module in result["modules"]]
+
+    if args.json:
+        print(json.dumps({
+            "module": args.module,
+            "seconds": round(result["seconds"], 3),
+            "rss_mb": round(result["rss_mb"], 1),
+            "eager_heavy_modules": eager,
+            "packages_ms": {name: round(us / 1000, 1) for name, us in result["packages"].items()}
+        }, indent=2))
+    else:
+        print(f"⏱️  import {args.module}: {result['seconds']:.3f}s, peak RSS {result['rss_mb']:.1f} MB\n")
+        total_us = sum(result["packages"].values()) or 1
+        for name, us in list(result["packages"].items())[:args.top]:
+            print(f"   {name:<28} {us / 1000:>9.1f} ms  {us / total_us:6.1%}")
+
+    if not args.check:
+        return
+
+    failures = []
+    if result["seconds"] > args.max_seconds:
+        failures.append(f"import took {result['seconds']:.3f}s (budget {args.max_seconds}s)")
+    if result["rss_mb"] > args.max_rss_mb:
+        failures.append(f"peak RSS {result['rss_mb']:.1f} MB (budget {args.max_rss_mb} MB)")
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager)} (must be imported on first use)")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("\n✅ Within the startup budget")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
@@ -0,0 +1 @@
+# Load testing: synthetic dataset seeding and scenarios (see __main__.py)
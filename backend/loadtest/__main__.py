@@ -0,0 +1,135 @@
+"""
+Load test CLI (run from backend/)
+
+    python -m loadtest seed --students 2000 --drop
+    python -m loadtest run timetable-rush --users 200 --save-baseline
+    python -m loadtest run timetable-rush --users 200 --fail-on-regression
+    python -m loadtest run result-publication --users 300 --snapshots
+
+Seeding writes to the configured MONGODB_URI / DATABASE_NAME - point them at a
+local test database. Runs mint tokens with JWT_SECRET, so use the server's .env.
+Simulated students are subject to the per-user rate limit; start the server with
+RATE_LIMIT_PER_SECOND=0 to measure raw capacity instead of admission control.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from dataclasses import fields
+from app.database import connect_to_mongo, close_mongo_connection, get_database
+from app.indexes import ensure_indexes
+from app.utils.academics import rebuild_academic_summaries
+from loadtest.dataset import DatasetConfig, seed_database, fingerprint, PASSWORD, ADMIN_ID
+from loadtest.runner import print_report, save_report, load_report, compare_reports, print_comparison
+from loadtest.scenarios import SCENARIOS
+
+DATASET_FILE = "dataset.json"
+
+
+def _add_dataset_arguments(parser: argparse.ArgumentParser):
+    for field in fields(DatasetConfig):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=int, default=field.default)
+
+
+async def seed(args):
+    config = DatasetConfig(**{field.name: getattr(args, field.name) for field in fields(DatasetConfig)})
+    await connect_to_mongo()
+    try:
+        db = get_database()
+        if not args.drop and await db.users.count_documents({"student_id": ADMIN_ID}, limit=1):
+            print("❌ Load test data already seeded, pass --drop to replace it")
+            sys.exit(1)
+        report = await seed_database(db, config, drop=args.drop)
+        # Build the registry's indexes (--drop removed any that existed)
+        await ensure_indexes(db)
+        start = time.perf_counter()
+        summaries = await rebuild_academic_summaries(db)
+        report["academic_summaries"] = {"count": summaries, "seconds": round(time.perf_counter() - start, 2)}
+    finally:
+        await close_mongo_connection()
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    with open(os.path.join(args.results_dir, DATASET_FILE), "w") as f:
+        json.dump(config.to_dict(), f, indent=2)
+
+    for collection, outcome in report.items():
+        print(f"✅ {collection}: {outcome['count']} documents in {outcome['seconds']}s")
+    print(f"\nAccounts: {ADMIN_ID} (admin) and LT000000... (students), password {PASSWORD}")
+
+
+async def run(args):
+    dataset_path = os.path.join(args.results_dir, DATASET_FILE)
+    if not os.path.exists(dataset_path):
+        print(f"❌ {dataset_path} not found, run 'python -m loadtest seed' first")
+        sys.exit(1)
+    with open(dataset_path) as f:
+        config = DatasetConfig(**json.load(f))
+
+    options = {"users": args.users, "iterations": args.iterations}
+    if args.ramp_up is not None:
+        options["ramp_up"] = args.ramp_up
+    if args.snapshots:
+        if args.scenario != "result-publication":
+            print("❌ --snapshots only applies to the result-publication scenario")
+            sys.exit(1)
+        options["snapshots"] = True
+    recorder = await SCENARIOS[args.scenario](args.base_url, config, **options)
+
+    report = {
+        "scenario": args.scenario,
+        "dataset": fingerprint(config),
+        "options": options,
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **recorder.report()
+    }
+    print_report(report)
+
+    save_report(report, os.path.join(args.results_dir, f"{args.scenario}-{time.strftime('%Y%m%d-%H%M%S')}.json"))
+    baseline_path = os.path.join(args.results_dir, f"baseline-{args.scenario}.json")
+    if args.save_baseline:
+        save_report(report, baseline_path)
+        print(f"\n✅ Saved baseline {baseline_path}")
+        return
+
+    if os.path.exists(baseline_path):
+        changes = compare_reports(load_report(baseline_path), report, args.threshold)
+        print_comparison(changes)
+        if args.fail_on_regression and any(change["regression"] for change in changes):
+            sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="UniPulse load tests")
+    parser.add_argument("--results-dir", default="loadtest_results")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = subcommands.add_parser("seed", help="Insert a synthetic campus dataset")
+    _add_dataset_arguments(seed_parser)
+    seed_parser.add_argument("--drop", action="store_true", help="Drop the seeded collections first")
+
+    run_parser = subcommands.add_parser("run", help="Run a scenario against a running server")
+    run_parser.add_argument("scenario", choices=sorted(SCENARIOS))
+    run_parser.add_argument("--base-url", default="http://localhost:8000")
+    run_parser.add_argument("--users", type=int, default=200)
+    run_parser.add_argument("--iterations", type=int, default=5)
+    run_parser.add_argument("--ramp-up", type=float, default=None, help="Seconds over which users start")
+    run_parser.add_argument("--snapshots", action="store_true", help="result-publication: pre-render results before students arrive")
+    run_parser.add_argument("--save-baseline", action="store_true", help="Store this run as the scenario's baseline")
+    run_parser.add_argument("--threshold", type=float, default=0.10, help="Relative change reported as a regression")
+    run_parser.add_argument("--fail-on-regression", action="store_true")
+
+    args = parser.parse_args()
+    asyncio.run(seed(args) if args.command == "seed" else run(args))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
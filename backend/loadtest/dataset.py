@@ -0,0 +1,239 @@
+"""
+Synthetic campus dataset: students, attendance, results, PYQs and timetables
+
+Everything is derived from one seed, so the same config always produces the same data.
+"""
+
+import hashlib
+import time
+from dataclasses import dataclass, asdict
+from datetime import date, datetime, timedelta
+from typing import Iterator, List
+import bcrypt
+import numpy as np
+from app.config import settings
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+EXAM_TYPES = ["mid", "end", "supplementary"]
+SEEDED_COLLECTIONS = ["users", "attendance", "results", "pyq", "timetable", "academic_summaries", "collection_versions"]
+
+# Every seeded account uses this password
+PASSWORD = "loadtest123"
+ADMIN_ID = "LTADMIN"
+
+INSERT_BATCH = 10_000
+
+
+@dataclass
+class DatasetConfig:
+    students: int = 2000
+    subjects: int = 8
+    attendance_days: int = 60
+    semesters: int = 4
+    pyqs: int = 500
+    personal_timetables: int = 50  # Students with their own timetable on top of the common one
+    seed: int = 42
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def student_ids(count: int) -> List[str]:
+    return [f"LT{i:06d}" for i in range(count)]
+
+
+def subject_names(count: int) -> List[str]:
+    return [f"Subject {i + 1:02d}" for i in range(count)]
+
+
+def generate_users(config: DatasetConfig) -> Iterator[dict]:
+    # bcrypt is deliberately slow, so every account shares one hash
+    hashed = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    now = datetime.utcnow()
+    yield {
+        "student_id": ADMIN_ID,
+        "name": "Load Test Admin",
+        "email": None,
+        "role": "admin",
+        "hashed_password": hashed,
+        "created_at": now,
+        "updated_at": now
+    }
+    for student_id in student_ids(config.students):
+        yield {
+            "student_id": student_id,
+            "name": f"Student {student_id}",
+            "email": f"{student_id.lower()}@loadtest.local",
+            "role": "student",
+            "hashed_password": hashed,
+            "created_at": now,
+            "updated_at": now
+        }
+
+
+def class_days(count: int) -> List[str]:
+    """The last `count` weekdays (Monday-Saturday), oldest first"""
+    days = []
+    day = date.today()
+    while len(days) < count:
+        day -= timedelta(days=1)
+        if day.weekday() < 6:
+            days.append(day.isoformat())
+    return days[::-1]
+
+
+def generate_attendance(config: DatasetConfig) -> Iterator[dict]:
+    rng = np.random.default_rng(config.seed)
+    subjects = subject_names(config.subjects)
+    days = class_days(config.attendance_days)
+    now = datetime.utcnow()
+    # Each student has their own attendance rate (mostly 60-95%)
+    rates = np.clip(rng.normal(0.8, 0.1, config.students), 0.3, 1.0)
+    for student_id, rate in zip(student_ids(config.students), rates):
+        present = rng.random((len(days), len(subjects))) < rate
+        for day_index, day in enumerate(days):
+            for subject_index, subject in enumerate(subjects):
+                yield {
+                    "student_id": student_id,
+                    "subject": subject,
+                    "date": day,
+                    "status": "present" if present[day_index, subject_index] else "absent",
+                    "created_at": now
+                }
+
+
+def academic_year(semester: int) -> str:
+    start = date.today().year - (semester + 1) // 2
+    return f"{start}-{str(start + 1)[-2:]}"
+
+
+def generate_results(config: DatasetConfig) -> Iterator[dict]:
+    rng = np.random.default_rng(config.seed + 1)
+    subjects = subject_names(config.subjects)
+    credits = rng.choice([2.0, 3.0, 4.0], size=config.subjects)
+    scale = settings.GRADE_SCALE
+    thresholds = np.array([min_marks for min_marks, _, _ in scale][::-1])
+    grades = [grade for _, grade, _ in scale][::-1]
+    points = np.array([grade_points for _, _, grade_points in scale][::-1])
+    now = datetime.utcnow()
+
+    for student_id in student_ids(config.students):
+        ability = rng.normal(70, 12)
+        marks = np.clip(rng.normal(ability, 8, (config.semesters, config.subjects)), 0, 100).round(1)
+        grade_index = np.searchsorted(thresholds, marks, side="right") - 1
+        for semester in range(config.semesters):
+            semester_points = points[grade_index[semester]]
+            yield {
+                "student_id": student_id,
+                "semester": semester + 1,
+                "academic_year": academic_year(semester + 1),
+                "subjects": [
+                    {
+                        "subject": subjects[i],
+                        "grade": grades[grade_index[semester, i]],
+                        "marks": float(marks[semester, i]),
+                        "credits": float(credits[i])
+                    }
+                    for i in range(config.subjects)
+                ],
+                "sgpa": round(float((semester_points * credits).sum() / credits.sum()), 2),
+                "cgpa": None,
+                "file_url": None,
+                "uploaded_by": ADMIN_ID,
+                "uploaded_at": now,
+                "published_at": now
+            }
+
+
+def generate_pyqs(config: DatasetConfig) -> Iterator[dict]:
+    rng = np.random.default_rng(config.seed + 2)
+    subjects = subject_names(config.subjects)
+    years = rng.integers(date.today().year - 8, date.today().year, config.pyqs)
+    semesters = rng.integers(1, 9, config.pyqs)
+    subject_index = rng.integers(0, config.subjects, config.pyqs)
+    exam_index = rng.integers(0, len(EXAM_TYPES), config.pyqs)
+    now = datetime.utcnow()
+    for i in range(config.pyqs):
+        subject = subjects[subject_index[i]]
+        exam_type = EXAM_TYPES[exam_index[i]]
+        file_name = f"{subject.lower().replace(' ', '_')}_{years[i]}_{exam_type}_{i}.pdf"
+        yield {
+            "subject": subject,
+            "semester": int(semesters[i]),
+            "year": int(years[i]),
+            "exam_type": exam_type,
+            "file_url": f"/files/pyq/{file_name}",
+            "file_name": file_name,
+            "uploaded_by": ADMIN_ID,
+            "uploaded_at": now,
+            "content_text": f"{subject} {exam_type} examination {years[i]} question paper"
+        }
+
+
+def _time_slots(rng, subjects: List[str]) -> List[dict]:
+    order = rng.permutation(len(subjects))[:6]
+    return [
+        {
+            "start_time": f"{9 + hour:02d}:00",
+            "end_time": f"{10 + hour:02d}:00",
+            "subject": subjects[index],
+            "faculty": f"Faculty {index + 1}",
+            "room": f"R{100 + int(index)}"
+        }
+        for hour, index in enumerate(order)
+    ]
+
+
+def generate_timetables(config: DatasetConfig) -> Iterator[dict]:
+    rng = np.random.default_rng(config.seed + 3)
+    subjects = subject_names(config.subjects)
+    now = datetime.utcnow()
+    for day in DAYS:
+        yield {"student_id": None, "day": day, "time_slots": _time_slots(rng, subjects), "created_at": now, "updated_at": now}
+    for student_id in student_ids(min(config.personal_timetables, config.students)):
+        day = DAYS[int(rng.integers(0, len(DAYS)))]
+        yield {"student_id": student_id, "day": day, "time_slots": _time_slots(rng, subjects), "created_at": now, "updated_at": now}
+
+
+GENERATORS = {
+    "users": generate_users,
+    "attendance": generate_attendance,
+    "results": generate_results,
+    "pyq": generate_pyqs,
+    "timetable": generate_timetables,
+}
+
+
+def fingerprint(config: DatasetConfig) -> str:
+    """Short id of a dataset config, stored with load test results so runs on different data are not compared"""
+    key = ",".join(f"{k}={v}" for k, v in sorted(config.to_dict().items()))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+async def _insert_batches(collection, documents: Iterator[dict]) -> int:
+    count = 0
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= INSERT_BATCH:
+            await collection.insert_many(batch, ordered=False)
+            count += len(batch)
+            batch = []
+    if batch:
+        await collection.insert_many(batch, ordered=False)
+        count += len(batch)
+    return count
+
+
+async def seed_database(db, config: DatasetConfig, drop: bool = False) -> dict:
+    """Insert the dataset collection by collection, returning (count, seconds) per collection"""
+    if drop:
+        for name in SEEDED_COLLECTIONS:
+            await db[name].drop()
+
+    report = {}
+    for name, generate in GENERATORS.items():
+        start = time.perf_counter()
+        count = await _insert_batches(db[name], generate(config))
+        report[name] = {"count": count, "seconds": round(time.perf_counter() - start, 2)}
+    return report
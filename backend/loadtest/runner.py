@@ -0,0 +1,131 @@
+"""
+Load generation and reporting: virtual users, per-endpoint latency percentiles, baselines
+"""
+
+import asyncio
+import json
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, Optional
+import httpx
+import numpy as np
+from app.auth.jwt import create_access_token
+
+# A p95/p99 or throughput change beyond this is reported as a regression
+REGRESSION_THRESHOLD = 0.10
+
+
+def token_for(student_id: str, role: str = "student") -> str:
+    """Mint a token like /api/auth/login does (needs the server's JWT_SECRET), skipping bcrypt"""
+    return create_access_token({"sub": student_id, "role": role})
+
+
+class LoadRecorder:
+    """Collect (latency, status) per endpoint label"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            response = None
+            status = type(e).__name__
+        self.latencies[label].append(time.perf_counter() - start)
+        self.statuses[label][status] += 1
+        return response
+
+    def stop(self):
+        self.finished = time.perf_counter()
+
+    def report(self) -> dict:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        endpoints = {}
+        for label, samples in sorted(self.latencies.items()):
+            latencies_ms = np.array(samples) * 1000
+            p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+            statuses = {str(status): count for status, count in self.statuses[label].items()}
+            errors = sum(count for status, count in self.statuses[label].items() if not (isinstance(status, int) and status < 400))
+            endpoints[label] = {
+                "requests": len(samples),
+                "throughput_rps": round(len(samples) / elapsed, 2),
+                "p50_ms": round(float(p50), 2),
+                "p95_ms": round(float(p95), 2),
+                "p99_ms": round(float(p99), 2),
+                "max_ms": round(float(latencies_ms.max()), 2),
+                "error_rate": round(errors / len(samples), 4),
+                "statuses": statuses
+            }
+        return {"duration_seconds": round(elapsed, 2), "endpoints": endpoints}
+
+
+async def run_users(
+    users: int,
+    user_task: Callable[[int], Awaitable[None]],
+    ramp_up: float = 0.0
+):
+    """Run `users` virtual users concurrently, starting them evenly over `ramp_up` seconds"""
+    async def start_user(index: int):
+        if ramp_up:
+            await asyncio.sleep(ramp_up * index / users)
+        await user_task(index)
+
+    await asyncio.gather(*(start_user(i) for i in range(users)))
+
+
+def print_report(report: dict):
+    print(f"\n⏱️  {report['scenario']} - {report['duration_seconds']}s")
+    print(f"{'endpoint':<48} {'reqs':>7} {'rps':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'errors':>7}")
+    for label, stats in report["endpoints"].items():
+        print(
+            f"{label:<48} {stats['requests']:>7} {stats['throughput_rps']:>9.1f} "
+            f"{stats['p50_ms']:>8.1f}ms {stats['p95_ms']:>7.1f}ms {stats['p99_ms']:>7.1f}ms "
+            f"{stats['error_rate']:>6.1%}"
+        )
+
+
+def save_report(report: dict, path: str):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_reports(baseline: dict, current: dict, threshold: float = REGRESSION_THRESHOLD) -> list:
+    """Per-endpoint changes against a baseline; each entry says whether it is a regression"""
+    if baseline.get("dataset") != current.get("dataset"):
+        print("⚠️  Baseline was recorded on a different dataset config, comparison may be meaningless")
+
+    changes = []
+    for label, stats in current["endpoints"].items():
+        before = baseline["endpoints"].get(label)
+        if before is None:
+            continue
+        for metric, higher_is_worse in (("p50_ms", True), ("p95_ms", True), ("p99_ms", True), ("throughput_rps", False), ("error_rate", True)):
+            old, new = before[metric], stats[metric]
+            if old == 0:
+                change = 0.0 if new == 0 else float("inf")
+            else:
+                change = (new - old) / old
+            worse = change > threshold if higher_is_worse else change < -threshold
+            changes.append({"endpoint": label, "metric": metric, "baseline": old, "current": new, "change": change, "regression": worse})
+    return changes
+
+
+def print_comparison(changes: list):
+    print("\n📊 Against baseline")
+    for change in changes:
+        marker = "❌" if change["regression"] else "  "
+        print(
+            f"{marker} {change['endpoint']:<48} {change['metric']:<15} "
+            f"{change['baseline']:>10} -> {change['current']:<10} ({change['change']:+.1%})"
+        )
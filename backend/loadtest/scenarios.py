@@ -0,0 +1,205 @@
+"""
+Load test scenarios against a running server seeded with loadtest.dataset
+"""
+
+import asyncio
+import io
+import random
+import zipfile
+from datetime import date
+import httpx
+from loadtest.dataset import DatasetConfig, ADMIN_ID, student_ids, subject_names, academic_year
+from loadtest.runner import LoadRecorder, run_users, token_for
+
+
+def _client(base_url: str, users: int) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=base_url,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    )
+
+
+def _auth(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def _get_cached(recorder: LoadRecorder, client, label: str, url: str, headers: dict, etags: dict):
+    """GET like a browser would: revalidate with the ETag from the previous visit"""
+    request_headers = dict(headers)
+    if url in etags:
+        request_headers["If-None-Match"] = etags[url]
+    response = await recorder.request(client, label, "GET", url, headers=request_headers)
+    if response is not None and "etag" in response.headers:
+        etags[url] = response.headers["etag"]
+
+
+async def timetable_rush(base_url: str, config: DatasetConfig, users: int = 200, iterations: int = 5, ramp_up: float = 2.0) -> LoadRecorder:
+    """
+    9am: every student opens the dashboard at once and refreshes it a few times.
+
+    Each visit loads the weekly timetable, the timetable list, the PYQ subjects
+    and the student's attendance stats.
+    """
+    recorder = LoadRecorder()
+    students = student_ids(config.students)
+    rng = random.Random(config.seed)
+
+    async def student(index: int):
+        headers = _auth(token_for(students[index % len(students)]))
+        etags = {}
+        for _ in range(iterations):
+            await asyncio.gather(
+                _get_cached(recorder, client, "GET /api/timetable/current-week", "/api/timetable/current-week", headers, etags),
+                _get_cached(recorder, client, "GET /api/timetable/", "/api/timetable/", headers, etags),
+                _get_cached(recorder, client, "GET /api/pyq/subjects", "/api/pyq/subjects", headers, etags),
+                recorder.request(client, "GET /api/attendance/stats/subject-wise", "GET", "/api/attendance/stats/subject-wise", headers=headers)
+            )
+            # Think time between refreshes
+            await asyncio.sleep(rng.uniform(0.5, 1.5))
+
+    async with _client(base_url, users) as client:
+        await run_users(users, student, ramp_up)
+    recorder.stop()
+    return recorder
+
+
+def marks_sheet(config: DatasetConfig) -> bytes:
+    """Long-format marks CSV (student_id, subject, marks, credits) for the whole cohort"""
+    rng = random.Random(config.seed + 10)
+    lines = ["student_id,subject,marks,credits"]
+    for student_id in student_ids(config.students):
+        for subject in subject_names(config.subjects):
+            lines.append(f"{student_id},{subject},{rng.uniform(35, 100):.1f},{rng.choice([2, 3, 4])}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def result_publication(base_url: str, config: DatasetConfig, users: int = 300, iterations: int = 3, ramp_up: float = 1.0, snapshots: bool = False) -> LoadRecorder:
+    """
+    Results day: the admin publishes a new semester, then every student checks results and CGPA.
+
+    With snapshots=True the results are pre-rendered (POST /api/results/publish) before students arrive.
+    """
+    recorder = LoadRecorder()
+    students = student_ids(config.students)
+    admin_headers = _auth(token_for(ADMIN_ID, "admin"))
+    semester = config.semesters + 1
+
+    async with _client(base_url, users) as client:
+        response = await recorder.request(
+            client, "POST /api/results/bulk-publish", "POST", "/api/results/bulk-publish",
+            params={"semester": semester, "academic_year": academic_year(semester)},
+            files={"file": ("marks.csv", marks_sheet(config), "text/csv")},
+            headers=admin_headers
+        )
+        if response is None or response.status_code >= 400:
+            print(f"❌ Bulk publish failed: {response.text if response is not None else 'no response'}")
+        if snapshots:
+            await recorder.request(client, "POST /api/results/publish", "POST", "/api/results/publish", headers=admin_headers)
+
+        async def student(index: int):
+            headers = _auth(token_for(students[index % len(students)]))
+            etags = {}
+            for _ in range(iterations):
+                await asyncio.gather(
+                    _get_cached(recorder, client, "GET /api/results/", "/api/results/", headers, etags),
+                    _get_cached(recorder, client, "GET /api/results/cgpa/calculate", "/api/results/cgpa/calculate", headers, etags)
+                )
+                await asyncio.sleep(0.5)
+
+        await run_users(users, student, ramp_up)
+    recorder.stop()
+    return recorder
+
+
+def tiny_pdf(text: str) -> bytes:
+    """One-page PDF with a line of text, enough to exercise storage and text extraction"""
+    stream = f"BT /F1 12 Tf 20 100 Td ({text}) Tj ET".encode("ascii")
+    objects = [
+        b"<</Type/Catalog/Pages 2 0 R>>",
+        b"<</Type/Pages/Kids[3 0 R]/Count 1>>",
+        b"<</Type/Page/Parent 2 0 R/MediaBox[0 0 200 200]/Contents 4 0 R"
+        b"/Resources<</Font<</F1<</Type/Font/Subtype/Type1/BaseFont/Helvetica>>>>>>>>",
+        b"<</Length %d>>stream\n%s\nendstream" % (len(stream), stream),
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer<</Size %d/Root 1 0 R>>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return pdf
+
+
+def pyq_archive(config: DatasetConfig, files: int) -> bytes:
+    """ZIP of small PDFs with a bundled manifest.csv"""
+    rng = random.Random(config.seed + 20)
+    subjects = subject_names(config.subjects)
+    buffer = io.BytesIO()
+    manifest = ["file,subject,semester,year,exam_type"]
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(files):
+            subject = rng.choice(subjects)
+            name = f"loadtest_{i:05d}.pdf"
+            zf.writestr(name, tiny_pdf(f"{subject} question paper {i}"))
+            manifest.append(f"{name},{subject},{rng.randint(1, 8)},{date.today().year - rng.randint(1, 8)},end")
+        zf.writestr("manifest.csv", "\n".join(manifest) + "\n")
+    return buffer.getvalue()
+
+
+def attendance_csv(config: DatasetConfig, day: str) -> bytes:
+    rng = random.Random(config.seed + 30)
+    lines = ["student_id,subject,date,status"]
+    for student_id in student_ids(config.students):
+        for subject in subject_names(config.subjects):
+            lines.append(f"{student_id},{subject},{day},{'present' if rng.random() < 0.8 else 'absent'}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def bulk_upload(base_url: str, config: DatasetConfig, users: int = 100, iterations: int = 10, ramp_up: float = 0.0, files: int = 200) -> LoadRecorder:
+    """
+    Admin imports a day of attendance and a PYQ archive while students keep browsing PYQs.
+
+    Shows how much the imports slow down concurrent reads.
+    """
+    recorder = LoadRecorder()
+    students = student_ids(config.students)
+    admin_headers = _auth(token_for(ADMIN_ID, "admin"))
+    archive = pyq_archive(config, files)
+    attendance = attendance_csv(config, date.today().isoformat())
+
+    async with _client(base_url, users + 2) as client:
+        async def admin_imports():
+            await asyncio.gather(
+                recorder.request(
+                    client, "POST /api/attendance/bulk-upload", "POST", "/api/attendance/bulk-upload",
+                    files={"file": ("attendance.csv", attendance, "text/csv")},
+                    headers=admin_headers
+                ),
+                recorder.request(
+                    client, "POST /api/pyq/bulk-upload", "POST", "/api/pyq/bulk-upload",
+                    files={"archive": ("papers.zip", archive, "application/zip")},
+                    headers=admin_headers
+                )
+            )
+
+        async def student(index: int):
+            headers = _auth(token_for(students[index % len(students)]))
+            for page in range(1, iterations + 1):
+                await recorder.request(client, "GET /api/pyq/", "GET", "/api/pyq/", params={"page": page % 5 + 1}, headers=headers)
+                await recorder.request(client, "GET /api/pyq/search", "GET", "/api/pyq/search", params={"q": "question paper"}, headers=headers)
+                await asyncio.sleep(0.2)
+
+        await asyncio.gather(admin_imports(), run_users(users, student, ramp_up))
+    recorder.stop()
+    return recorder
+
+
+SCENARIOS = {
+    "timetable-rush": timetable_rush,
+    "result-publication": result_publication,
+    "bulk-upload": bulk_upload,
+}
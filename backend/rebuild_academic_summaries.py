@@ -0,0 +1,31 @@
+"""
+Script to rebuild per-student academic summaries (CGPA, credits, semesters)
+from the results collection. Run after importing results directly into MongoDB.
+"""
+
+import argparse
+import asyncio
+import sys
+from app.database import connect_to_mongo, close_mongo_connection, get_database
+from app.utils.academics import rebuild_academic_summaries
+
+
+async def main(student_id: str = None):
+    await connect_to_mongo()
+    try:
+        count = await rebuild_academic_summaries(get_database(), student_id)
+    finally:
+        await close_mongo_connection()
+
+    print(f"✅ Rebuilt academic summaries for {count} students")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--student-id", default=None, help="Only rebuild this student's summary")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.student_id))
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
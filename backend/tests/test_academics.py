@@ -0,0 +1,56 @@
+from app.utils.academics import semester_entry, summarize, apply_result
+
+
+def result(semester: int, sgpa, credits=(4,), academic_year: str = "2023-24") -> dict:
+    return {
+        "student_id": "STU001",
+        "semester": semester,
+        "academic_year": academic_year,
+        "sgpa": sgpa,
+        "subjects": [{"subject": f"S{i}", "credits": c} for i, c in enumerate(credits)]
+    }
+
+
+def test_failed_semester_counts_towards_cgpa():
+    semesters = [semester_entry(result(1, 0.0)), semester_entry(result(2, 8.0))]
+    summary = summarize("STU001", semesters)
+    assert summary["total_semesters"] == 2
+    assert summary["total_credits"] == 8
+    assert summary["cgpa"] == 4.0
+
+
+def test_all_failed_cgpa_is_zero_not_missing():
+    summary = summarize("STU001", [semester_entry(result(1, 0.0))])
+    assert summary["cgpa"] == 0.0
+
+
+def test_result_without_sgpa_is_skipped():
+    assert semester_entry(result(1, None)) is None
+    assert summarize("STU001", [])["cgpa"] is None
+
+
+def test_cgpa_is_credit_weighted():
+    semesters = [semester_entry(result(1, 9.0, credits=(4, 2))), semester_entry(result(2, 6.0, credits=(3,)))]
+    assert summarize("STU001", semesters)["cgpa"] == round((9.0 * 6 + 6.0 * 3) / 9, 2)
+
+
+def test_falls_back_to_mean_without_credits():
+    semesters = [semester_entry(result(1, 9.0, credits=())), semester_entry(result(2, 6.0))]
+    assert summarize("STU001", semesters)["cgpa"] == 7.5
+
+
+def test_semesters_sorted_by_year_then_semester():
+    semesters = [
+        semester_entry(result(1, 7.0, academic_year="2024-25")),
+        semester_entry(result(2, 8.0, academic_year="2023-24")),
+        semester_entry(result(1, 9.0, academic_year="2023-24")),
+    ]
+    order = [(s["academic_year"], s["semester"]) for s in summarize("STU001", semesters)["semesters"]]
+    assert order == [("2023-24", 1), ("2023-24", 2), ("2024-25", 1)]
+
+
+def test_apply_result_replaces_the_same_semester():
+    summary = summarize("STU001", [semester_entry(result(1, 6.0)), semester_entry(result(2, 8.0))])
+    summary = apply_result("STU001", summary, result(1, 0.0))
+    assert summary["total_semesters"] == 2
+    assert summary["cgpa"] == 4.0
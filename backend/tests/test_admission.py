@@ -0,0 +1,94 @@
+import asyncio
+from app.utils.admission import ConcurrencyLimiter
+
+
+def test_acquire_within_limit():
+    async def run():
+        limiter = ConcurrencyLimiter("test", limit=2, max_queue=1)
+        return limiter, [await limiter.acquire(1), await limiter.acquire(1)]
+
+    limiter, acquired = asyncio.run(run())
+    assert acquired == [True, True]
+    assert limiter.active == 2
+
+
+def test_release_hands_slot_to_oldest_waiter():
+    async def run():
+        limiter = ConcurrencyLimiter("test", limit=1, max_queue=2)
+        await limiter.acquire(1)
+        first = asyncio.ensure_future(limiter.acquire(1))
+        second = asyncio.ensure_future(limiter.acquire(1))
+        await asyncio.sleep(0)
+        limiter.release()
+        assert await asyncio.wait_for(first, 1) is True
+        assert not second.done()
+        # The slot moved to the waiter instead of being freed
+        assert limiter.active == 1
+        assert limiter.queued == 1
+        second.cancel()
+
+    asyncio.run(run())
+
+
+def test_full_queue_rejects():
+    async def run():
+        limiter = ConcurrencyLimiter("test", limit=1, max_queue=1)
+        await limiter.acquire(1)
+        waiting = asyncio.ensure_future(limiter.acquire(1))
+        await asyncio.sleep(0)
+        rejected = await limiter.acquire(1)
+        waiting.cancel()
+        return limiter, rejected
+
+    limiter, rejected = asyncio.run(run())
+    assert rejected is False
+    assert limiter.rejected == {"queue_full": 1, "queue_timeout": 0}
+
+
+def test_queue_timeout_rejects_and_leaves_queue():
+    async def run():
+        limiter = ConcurrencyLimiter("test", limit=1, max_queue=1)
+        await limiter.acquire(1)
+        return limiter, await limiter.acquire(0.01)
+
+    limiter, acquired = asyncio.run(run())
+    assert acquired is False
+    assert limiter.rejected == {"queue_full": 0, "queue_timeout": 1}
+    assert limiter.queued == 0
+    assert limiter.active == 1
+
+
+def test_cancelled_waiter_leaves_queue():
+    async def run():
+        limiter = ConcurrencyLimiter("test", limit=1, max_queue=1)
+        await limiter.acquire(1)
+        waiting = asyncio.ensure_future(limiter.acquire(1))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        queued = limiter.queued
+        limiter.release()
+        return limiter, queued
+
+    limiter, queued = asyncio.run(run())
+    assert queued == 0
+    assert limiter.active == 0
+
+
+def test_cancelled_waiter_passes_on_a_handed_slot():
+    async def run():
+        limiter = ConcurrencyLimiter("test", limit=1, max_queue=2)
+        await limiter.acquire(1)
+        cancelled = asyncio.ensure_future(limiter.acquire(1))
+        await asyncio.sleep(0)
+        # Cancelled, and a slot handed over before the waiter gets to run
+        cancelled.cancel()
+        limiter.release()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        return limiter, cancelled
+
+    limiter, cancelled = asyncio.run(run())
+    assert cancelled.cancelled()
+    # The handed slot was released rather than leaked
+    assert limiter.active == 0
+    assert limiter.queued == 0
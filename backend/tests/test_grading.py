@@ -0,0 +1,70 @@
+import io
+import pandas as pd
+from app.utils.grading import compute_cohort_results
+
+SCALE = [(90, "O", 10.0), (80, "A+", 9.0), (70, "A", 8.0), (60, "B+", 7.0), (50, "B", 6.0), (40, "C", 5.0), (0, "F", 0.0)]
+
+
+def sheet(csv: str) -> pd.DataFrame:
+    return pd.read_csv(io.StringIO(csv), dtype={"student_id": str})
+
+
+def test_sgpa_is_credit_weighted():
+    cohort, skipped = compute_cohort_results(sheet(
+        "student_id,subject,marks,credits\n"
+        "S1,Math,95,4\n"
+        "S1,Physics,72,2\n"
+    ), SCALE)
+    assert skipped == []
+    assert cohort == [{
+        "student_id": "S1",
+        "subjects": [
+            {"subject": "Math", "grade": "O", "marks": 95.0, "credits": 4.0},
+            {"subject": "Physics", "grade": "A", "marks": 72.0, "credits": 2.0},
+        ],
+        "sgpa": round((10.0 * 4 + 8.0 * 2) / 6, 2)
+    }]
+
+
+def test_failing_every_subject_gives_zero_sgpa():
+    cohort, _ = compute_cohort_results(sheet("student_id,subject,marks,credits\nS1,Math,10,4\nS1,Physics,20,4\n"), SCALE)
+    assert cohort[0]["sgpa"] == 0.0
+
+
+def test_students_with_incomplete_rows_get_no_sgpa():
+    cohort, skipped = compute_cohort_results(sheet(
+        "student_id,subject,marks,credits\n"
+        "S1,Math,abc,4\n"
+        "S1,Physics,85,4\n"
+        "S2,Math,75,4\n"
+    ), SCALE)
+    assert {entry["student_id"]: entry["sgpa"] for entry in cohort} == {"S1": None, "S2": 8.0}
+    assert skipped == [{"row": 2, "student_id": "S1", "reason": "Missing or non-numeric marks"}]
+
+
+def test_skipped_rows_are_reported():
+    cohort, skipped = compute_cohort_results(sheet(
+        "student_id,subject,marks,credits\n"
+        ",Math,80,4\n"
+        "S1,,80,4\n"
+        "S1,Math,80,-1\n"
+        "S2,Math,40,4\n"
+        "S2,Math,60,4\n"
+    ), SCALE)
+    assert skipped == [
+        {"row": 2, "student_id": None, "reason": "Missing student_id"},
+        {"row": 3, "student_id": "S1", "reason": "Missing subject"},
+        {"row": 4, "student_id": "S1", "reason": "Negative credits"},
+        {"row": 5, "student_id": "S2", "reason": "Duplicate subject, a later row was used"},
+    ]
+    # The later duplicate wins, and a duplicate does not make the student incomplete
+    assert cohort == [{
+        "student_id": "S2",
+        "subjects": [{"subject": "Math", "grade": "B+", "marks": 60.0, "credits": 4.0}],
+        "sgpa": 7.0
+    }]
+
+
+def test_student_ids_keep_leading_zeros():
+    cohort, _ = compute_cohort_results(sheet("student_id,subject,marks,credits\n00123,Math,80,4\n"), SCALE)
+    assert cohort[0]["student_id"] == "00123"
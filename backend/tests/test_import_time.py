@@ -0,0 +1,29 @@
+import os
+import pytest
+import import_time_report
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def report():
+    """Import app.main once in a fresh interpreter, from the backend directory"""
+    cwd = os.getcwd()
+    os.chdir(BACKEND_DIR)
+    try:
+        return import_time_report.measure("app.main")
+    finally:
+        os.chdir(cwd)
+
+
+def test_heavy_modules_are_imported_lazily(report):
+    eager = [module for module in import_time_report.LAZY_MODULES if module in report["modules"]]
+    assert not eager, f"imported at startup: {', '.join(eager)}"
+
+
+def test_import_time_within_budget(report):
+    assert report["seconds"] <= import_time_report.MAX_SECONDS
+
+
+def test_peak_rss_within_budget(report):
+    assert report["rss_mb"] <= import_time_report.MAX_RSS_MB
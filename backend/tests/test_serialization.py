@@ -0,0 +1,36 @@
+import json
+import pytest
+from bson import ObjectId
+from app.models.result import ResultResponse
+from app.utils.serialization import encode_documents
+from benchmarks.bench_serialization import make_documents, response_model_path
+
+DOCUMENTS = make_documents(20)
+
+
+@pytest.mark.parametrize("model", list(DOCUMENTS), ids=lambda model: model.__name__)
+def test_matches_response_model_output(model):
+    docs = DOCUMENTS[model]
+    assert json.loads(encode_documents(docs, model)) == json.loads(response_model_path(docs, model))
+
+
+def test_extra_keys_dropped_and_missing_keys_defaulted():
+    doc = {
+        "_id": ObjectId(),
+        "student_id": "STU001",
+        "semester": 1,
+        "academic_year": "2023-24",
+        "subjects": [],
+        "uploaded_by": "ADMIN001",
+        "internal_note": "not part of the response"
+    }
+    [encoded] = json.loads(encode_documents([doc], ResultResponse))
+    assert "internal_note" not in encoded
+    assert encoded["_id"] == str(doc["_id"])
+    assert encoded["sgpa"] is None and encoded["file_url"] is None
+
+
+def test_field_selection():
+    docs = DOCUMENTS[ResultResponse][:2]
+    encoded = json.loads(encode_documents(docs, ResultResponse, fields=["sgpa", "_id"]))
+    assert encoded == [{"_id": str(doc["_id"]), "sgpa": doc["sgpa"]} for doc in docs]
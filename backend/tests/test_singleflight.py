@@ -0,0 +1,93 @@
+import asyncio
+from app.utils.singleflight import SingleFlight, query_key
+
+
+def test_concurrent_callers_share_one_call():
+    async def run():
+        group = SingleFlight("test-share")
+        release = asyncio.Event()
+        runs = []
+
+        async def fetch():
+            runs.append(1)
+            await release.wait()
+            return ["row"]
+
+        callers = [asyncio.ensure_future(group.do("key", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*callers)
+        return group, runs, results
+
+    group, runs, results = asyncio.run(run())
+    assert len(runs) == 1
+    assert all(result is results[0] for result in results)
+    assert (group.calls, group.executions) == (5, 1)
+
+
+def test_call_after_completion_runs_again():
+    async def run():
+        group = SingleFlight("test-again")
+        runs = []
+
+        async def fetch():
+            runs.append(1)
+            return len(runs)
+
+        return await group.do("key", fetch), await group.do("key", fetch)
+
+    assert asyncio.run(run()) == (1, 2)
+
+
+def test_different_keys_do_not_share():
+    async def run():
+        group = SingleFlight("test-keys")
+
+        async def fetch(value):
+            await asyncio.sleep(0)
+            return value
+
+        return await asyncio.gather(group.do("a", lambda: fetch("a")), group.do("b", lambda: fetch("b")))
+
+    assert asyncio.run(run()) == ["a", "b"]
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    async def run():
+        group = SingleFlight("test-cancel")
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(group.do("key", fetch))
+        second = asyncio.ensure_future(group.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return first, await second
+
+    first, second = asyncio.run(run())
+    assert first.cancelled()
+    assert second == "done"
+
+
+def test_errors_reach_every_caller():
+    async def run():
+        group = SingleFlight("test-error")
+
+        async def fetch():
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        return await asyncio.gather(group.do("key", fetch), group.do("key", fetch), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert [type(result) for result in results] == [ValueError, ValueError]
+
+
+def test_query_key_ignores_dict_order():
+    assert query_key({"a": 1, "b": 2}, "x") == query_key({"b": 2, "a": 1}, "x")
+    assert query_key({"a": 1}) != query_key({"a": 2})
@@ -108,8 +108,8 @@ async function loadDashboard() {
         
         
         // Load actual counts
-        const pyqs = await pyqAPI.getPYQs();
-        document.getElementById('totalPyqs').textContent = pyqs.length;
+        const pyqFacets = await pyqAPI.getFacets();
+        document.getElementById('totalPyqs').textContent = pyqFacets.total;
         
         document.getElementById('totalResults').textContent = '—';
 
@@ -309,10 +309,20 @@ async function handleTimetableSubmit(event) {
 }
 
 // PYQ Management
+// Pages loaded so far; "Load more" appends the next one
+let loadedPYQs = [];
+
 async function loadPYQs() {
+    loadedPYQs = [];
+    await loadMorePYQs();
+}
+
+async function loadMorePYQs() {
     try {
-        const pyqs = await pyqAPI.getPYQs();
-        displayPYQs(pyqs);
+        const page = Math.floor(loadedPYQs.length / PYQ_PAGE_SIZE) + 1;
+        const { items, total } = await pyqAPI.getPYQs({}, page);
+        loadedPYQs = loadedPYQs.concat(items);
+        displayPYQs(loadedPYQs, total);
     } catch (error) {
         console.error('Error loading PYQs:', error);
         const listDiv = document.getElementById('pyqList');
@@ -322,7 +332,7 @@ async function loadPYQs() {
     }
 }
 
-function displayPYQs(pyqs) {
+function displayPYQs(pyqs, total) {
     const listDiv = document.getElementById('pyqList');
     if (!listDiv) return;
     
@@ -355,7 +365,14 @@ function displayPYQs(pyqs) {
                 </div>
             </div>
         </div>
-    `).join('');
+    `).join('') + (pyqs.length < total ? `
+        <div class="text-center">
+            <button onclick="loadMorePYQs()" 
+                    class="bg-gray-200 text-gray-800 px-4 py-2 rounded hover:bg-gray-300">
+                Load more (${pyqs.length} of ${total})
+            </button>
+        </div>
+    ` : '');
 }
 
 async function handlePYQUpload(event) {
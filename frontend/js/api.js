@@ -59,6 +59,12 @@ async function apiRequest(endpoint, options = {}) {
             throw new Error(data.detail || 'Request failed');
         }
 
+        // Paginated lists report the number of matches in X-Total-Count
+        if (options.withTotal) {
+            const total = parseInt(response.headers.get('X-Total-Count'), 10);
+            return { items: data, total: isNaN(total) ? data.length : total };
+        }
+
         return data;
     } catch (error) {
         console.error('API Error:', error);
@@ -154,6 +160,12 @@ const attendanceAPI = {
         const formData = new FormData();
         formData.append('file', file);
         return await apiRequestFormData('/api/attendance/bulk-upload', formData);
+    },
+    markClass: async (subject, date, roster, absentees = []) => {
+        return await apiRequest('/api/attendance/mark-class', {
+            method: 'POST',
+            body: JSON.stringify({ subject, date, roster, absentees })
+        });
     }
 };
 
@@ -177,18 +189,27 @@ const timetableAPI = {
 };
 
 // PYQ API
+// PYQs fetched per "Load more" click
+const PYQ_PAGE_SIZE = 50;
+
 const pyqAPI = {
-    getPYQs: async (filters = {}) => {
+    // Returns one page: { items, total }
+    getPYQs: async (filters = {}, page = 1, pageSize = PYQ_PAGE_SIZE) => {
         const params = new URLSearchParams();
         if (filters.subject) params.append('subject', filters.subject);
         if (filters.semester) params.append('semester', filters.semester);
         if (filters.year) params.append('year', filters.year);
         if (filters.exam_type) params.append('exam_type', filters.exam_type);
-        return await apiRequest(`/api/pyq?${params}`);
+        params.append('page', page);
+        params.append('page_size', pageSize);
+        return await apiRequest(`/api/pyq?${params}`, { withTotal: true });
     },
     getSubjects: async () => {
         return await apiRequest('/api/pyq/subjects');
     },
+    getFacets: async () => {
+        return await apiRequest('/api/pyq/facets');
+    },
     upload: async (file, subject, semester, year, examType) => {
         const formData = new FormData();
         formData.append('file', file);
@@ -203,6 +224,22 @@ const pyqAPI = {
     }
 };
 
+// Dashboard API
+const dashboardAPI = {
+    get: async () => {
+        return await apiRequest('/api/dashboard');
+    }
+};
+
+// Events API
+const eventsAPI = {
+    // EventSource cannot send the token header, so it connects with a single-use ticket
+    streamUrl: async () => {
+        const { ticket } = await apiRequest('/api/events/ticket', { method: 'POST' });
+        return `${API_BASE_URL}/api/events/stream?ticket=${encodeURIComponent(ticket)}`;
+    }
+};
+
 // Results API
 const resultsAPI = {
     getResults: async (studentId = null, semester = null) => {
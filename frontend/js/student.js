@@ -36,8 +36,43 @@ document.addEventListener('DOMContentLoaded', () => {
     document.getElementById('filterPyqBtn')?.addEventListener('click', () => {
         loadPYQs();
     });
+    
+    // Refresh when new data is published instead of polling
+    subscribeToUpdates();
 });
 
+// Server-sent events: reload the affected tab when results, attendance or the timetable change
+async function subscribeToUpdates() {
+    if (!window.EventSource) return;
+    
+    let source;
+    try {
+        source = new EventSource(await eventsAPI.streamUrl());
+    } catch (error) {
+        console.error('Error opening event stream:', error);
+        return;
+    }
+    // Tickets are single-use, so every reconnect needs a new one
+    const reconnect = () => {
+        source.close();
+        setTimeout(subscribeToUpdates, 5000);
+    };
+    source.addEventListener('attendance', () => {
+        loadAttendance();
+        loadDashboard();
+    });
+    source.addEventListener('results', () => {
+        loadResults();
+        loadDashboard();
+    });
+    source.addEventListener('timetable', () => {
+        loadTimetable();
+    });
+    // Sent when the login expires; fetching a new ticket sends the user back to login
+    source.addEventListener('expired', reconnect);
+    source.onerror = reconnect;
+}
+
 function switchTab(tabName) {
     // Update tab buttons
     document.querySelectorAll('.tab-btn').forEach(btn => {
@@ -66,30 +101,30 @@ function switchTab(tabName) {
 // Dashboard
 async function loadDashboard() {
     try {
-        // Load overall attendance
-        const stats = await attendanceAPI.getStats();
+        // One request for every tile; sections that failed come back as null
+        const dashboard = await dashboardAPI.get();
+        
+        // Overall attendance
+        const overall = dashboard.attendance?.overall;
         document.getElementById('overallAttendance').textContent = 
-            stats.percentage ? `${stats.percentage.toFixed(1)}%` : '-';
+            overall?.percentage ? `${overall.percentage.toFixed(1)}%` : '-';
         
-        // Load CGPA
-        const cgpaData = await resultsAPI.getCGPA();
+        // CGPA
         document.getElementById('cgpa').textContent = 
-            cgpaData.cgpa ? cgpaData.cgpa.toFixed(2) : '-';
+            dashboard.cgpa?.cgpa ? dashboard.cgpa.cgpa.toFixed(2) : '-';
         
-        // Load PYQ count
-        const pyqs = await pyqAPI.getPYQs();
-        document.getElementById('totalPyqs').textContent = pyqs.length;
+        // PYQ count
+        document.getElementById('totalPyqs').textContent = dashboard.pyq ? dashboard.pyq.total : '-';
         
-        // Load subject-wise attendance chart
-        loadAttendanceChart();
+        // Subject-wise attendance chart
+        if (dashboard.attendance) loadAttendanceChart(dashboard.attendance);
     } catch (error) {
         console.error('Error loading dashboard:', error);
     }
 }
 
-async function loadAttendanceChart() {
+async function loadAttendanceChart(stats) {
     try {
-        const stats = await attendanceAPI.getSubjectWiseStats();
         
         if (attendanceChart) {
             attendanceChart.destroy();
@@ -247,45 +282,26 @@ async function loadTimetable() {
 }
 
 // PYQs
+// Pages loaded so far for the current filters; "Load more" appends the next one
+let loadedPYQs = [];
+let pyqFilters = {};
+
 async function loadPYQs() {
+    const subject = document.getElementById('pyqSubjectFilter')?.value || '';
+    const semester = document.getElementById('pyqSemesterFilter')?.value || '';
+    const year = document.getElementById('pyqYearFilter')?.value || '';
+    const examType = document.getElementById('pyqExamTypeFilter')?.value || '';
+    
+    pyqFilters = {
+        subject: subject || null,
+        semester: semester ? parseInt(semester) : null,
+        year: year ? parseInt(year) : null,
+        exam_type: examType || null
+    };
+    loadedPYQs = [];
+    
     try {
-        const subject = document.getElementById('pyqSubjectFilter')?.value || '';
-        const semester = document.getElementById('pyqSemesterFilter')?.value || '';
-        const year = document.getElementById('pyqYearFilter')?.value || '';
-        const examType = document.getElementById('pyqExamTypeFilter')?.value || '';
-        
-        const pyqs = await pyqAPI.getPYQs({
-            subject: subject || null,
-            semester: semester ? parseInt(semester) : null,
-            year: year ? parseInt(year) : null,
-            exam_type: examType || null
-        });
-        
-        const listDiv = document.getElementById('pyqList');
-        if (!listDiv) return;
-        
-        if (pyqs.length === 0) {
-            listDiv.innerHTML = '<div class="bg-white p-6 rounded-lg shadow"><p class="text-gray-500">No PYQs found</p></div>';
-            return;
-        }
-        
-        listDiv.innerHTML = pyqs.map(pyq => `
-            <div class="bg-white p-6 rounded-lg shadow">
-                <div class="flex justify-between items-start">
-                    <div>
-                        <h3 class="text-xl font-semibold text-gray-800">${pyq.subject}</h3>
-                        <p class="text-gray-600 mt-1">
-                            Semester ${pyq.semester} | Year ${pyq.year} | ${pyq.exam_type.charAt(0).toUpperCase() + pyq.exam_type.slice(1)}
-                        </p>
-                        <p class="text-sm text-gray-500 mt-1">Uploaded: ${new Date(pyq.uploaded_at).toLocaleDateString()}</p>
-                    </div>
-                    <a href="${API_BASE_URL}${pyq.file_url}" target="_blank" 
-                       class="bg-indigo-600 text-white px-4 py-2 rounded hover:bg-indigo-700">
-                        Download
-                    </a>
-                </div>
-            </div>
-        `).join('');
+        await loadMorePYQs();
         
         // Load subjects for filter
         const subjects = await pyqAPI.getSubjects();
@@ -301,6 +317,48 @@ async function loadPYQs() {
     }
 }
 
+async function loadMorePYQs() {
+    const page = Math.floor(loadedPYQs.length / PYQ_PAGE_SIZE) + 1;
+    const { items, total } = await pyqAPI.getPYQs(pyqFilters, page);
+    loadedPYQs = loadedPYQs.concat(items);
+    displayPYQs(loadedPYQs, total);
+}
+
+function displayPYQs(pyqs, total) {
+    const listDiv = document.getElementById('pyqList');
+    if (!listDiv) return;
+    
+    if (pyqs.length === 0) {
+        listDiv.innerHTML = '<div class="bg-white p-6 rounded-lg shadow"><p class="text-gray-500">No PYQs found</p></div>';
+        return;
+    }
+    
+    listDiv.innerHTML = pyqs.map(pyq => `
+        <div class="bg-white p-6 rounded-lg shadow">
+            <div class="flex justify-between items-start">
+                <div>
+                    <h3 class="text-xl font-semibold text-gray-800">${pyq.subject}</h3>
+                    <p class="text-gray-600 mt-1">
+                        Semester ${pyq.semester} | Year ${pyq.year} | ${pyq.exam_type.charAt(0).toUpperCase() + pyq.exam_type.slice(1)}
+                    </p>
+                    <p class="text-sm text-gray-500 mt-1">Uploaded: ${new Date(pyq.uploaded_at).toLocaleDateString()}</p>
+                </div>
+                <a href="${API_BASE_URL}${pyq.file_url}" target="_blank" 
+                   class="bg-indigo-600 text-white px-4 py-2 rounded hover:bg-indigo-700">
+                    Download
+                </a>
+            </div>
+        </div>
+    `).join('') + (pyqs.length < total ? `
+        <div class="text-center">
+            <button onclick="loadMorePYQs().catch(error => console.error('Error loading PYQs:', error))" 
+                    class="bg-gray-200 text-gray-800 px-4 py-2 rounded hover:bg-gray-300">
+                Load more (${pyqs.length} of ${total})
+            </button>
+        </div>
+    ` : '');
+}
+
 // Results
 async function loadResults() {
     try {